@@ -1,16 +1,52 @@
 import streamlit as st
+import io
 import json
 import os
 import re
+import shutil
+import tempfile
+from contextlib import contextmanager
 import matplotlib.pyplot as plt
 import matplotlib.font_manager as fm
 from modules.analyzer import WebAttackAnalyzer
+from modules.burst import BurstDetector
+from modules.cache import AnalysisCache
+from modules.cluster import cluster_logs
+from modules.ingest import iter_lines, iter_text_lines
+from modules.parser import sniff_log_format
+from modules.results import DetectionStore, page_ids
+from modules.rules import DEFAULT_RULES_PATH, RuleRegistry
 
 # OpenAI API 키 환경 변수에서 가져오기 (실제 사용 시 환경 변수 설정 필요)
 openai_api_key = os.environ.get("OPENAI_API_KEY", "")
 
-# 분석기 인스턴스 생성
-analyzer = WebAttackAnalyzer(openai_api_key)
+# 업로드 파일 병렬 탐지 작업자 수 (1이면 단일 프로세스로 탐지)
+detection_workers = int(os.environ.get("DETECTION_WORKERS", "1"))
+
+# 공격 유형별로 GPT에 전송할 최대 페이로드 클러스터 수
+max_clusters_per_type = int(os.environ.get("MAX_CLUSTERS_PER_TYPE", "5"))
+
+# GPT 분석 결과 디스크 캐시 경로 (반복되는 페이로드는 API를 다시 호출하지 않음)
+analysis_cache_path = os.environ.get("ANALYSIS_CACHE_PATH", "analysis_cache.db")
+
+# 탐지 정규식에 전달할 라인/필드 최대 길이 (0이면 제한 없음, 역추적이 많은 패턴의 최악 검사 시간 제한)
+max_scan_length = int(os.environ.get("MAX_SCAN_LENGTH", "0")) or None
+
+# 탐지 규칙 팩 파일 (JSON/YAML, 파일이 바뀌면 다음 분석부터 새 규칙 적용)
+rules_path = os.environ.get("RULES_PATH", DEFAULT_RULES_PATH)
+
+# 분석별 탐지 로그 저장소 디렉토리 (세션에는 저장소 파일 경로만 보관)
+detection_store_dir = os.environ.get("DETECTION_STORE_DIR", os.path.join(tempfile.gettempdir(), "ai-seclog-detections"))
+
+@st.cache_resource
+def get_analyzer(api_key, cache_path, max_line_length=None, rules_path=DEFAULT_RULES_PATH):
+    """분석기 인스턴스를 프로세스 전역에서 한 번만 생성하여 모든 세션과 재실행에서 공유
+    (OpenAI 클라이언트의 HTTP 연결 풀, 규칙 팩 레지스트리, 속도 제한기, 결과 캐시 포함)"""
+    return WebAttackAnalyzer(api_key, cache=AnalysisCache(cache_path), max_line_length=max_line_length,
+                             rules=RuleRegistry(rules_path))
+
+# 분석기 인스턴스 조회 (최초 실행 시에만 생성)
+analyzer = get_analyzer(openai_api_key, analysis_cache_path, max_scan_length, rules_path)
 
 # Streamlit 페이지 설정
 st.set_page_config(page_title="AI 기반 보안 로그 분석기", layout="wide")
@@ -72,26 +108,6 @@ risk_color_map = {
     "높음": "🔴 높음 (High)"
 }
 
-# 공격 유형 라벨 - 정규식 순서와 일치
-ATTACK_TYPES = [
-    "SQL 인젝션",
-    "XSS(크로스 사이트 스크립팅)",
-    "디렉토리 탐색",
-    "명령어 인젝션",
-    "악성 파일 업로드 시도",
-    "LFI/RFI(로컬/원격 파일 인클루전)",
-    "기본 웹 공격(비정상적 요청)",
-    "cmd.exe 실행 시도",
-    "경로 우회 시도",
-    "시스템 디렉토리 접근 시도",
-    "웹 취약점 스캐닝(root.exe)",
-    "버퍼 오버플로우 공격",
-    "OpenWebMail 취약점 탐색",
-    "허용되지 않은 HTTP 메서드",
-    "프록시 하이재킹 시도",
-    "FrontPage/SharePoint 취약점 탐색"
-]
-
 # 세션 상태 초기화
 if "page" not in st.session_state:
     st.session_state["page"] = "main"
@@ -99,56 +115,102 @@ if "page" not in st.session_state:
 if "analysis_result" not in st.session_state:
     st.session_state["analysis_result"] = None
     
-if "all_detected_attacks" not in st.session_state:
-    st.session_state["all_detected_attacks"] = {}
+if "detection_store" not in st.session_state:
+    st.session_state["detection_store"] = None  # 현재 분석의 탐지 로그 저장소 파일 경로
+
+if "analysis_pending" not in st.session_state:
+    st.session_state["analysis_pending"] = False
+
+if "detection_only" not in st.session_state:
+    st.session_state["detection_only"] = False
+
+if "type_analysis" not in st.session_state:
+    st.session_state["type_analysis"] = {}  # 공격 유형 -> GPT 분석 결과 (탐지 전용 모드에서 요청한 유형만)
+
+# 공격 패턴이 없을 때의 기본 응답
+NO_ATTACK_RESULT = {
+    "payload_info": "공격 패턴이 발견되지 않았습니다.",
+    "attack_type": "없음",
+    "risk_level": "낮음",
+    "mitigation": "모니터링을 계속하세요.",
+    "attack_description": "로그에서 알려진 공격 패턴이 발견되지 않았습니다.",
+    "risk_assessment": "현재 위험 수준은 낮습니다.",
+    "detailed_mitigation": "일반적인 보안 모니터링을 계속하고 정기적인 보안 업데이트를 유지하세요."
+}
 
-def analyze_logs(log_content):
-    """로그 분석 함수"""
+def error_result(e):
+    """분석 중 예외가 발생했을 때의 응답"""
+    return [{
+        "payload_info": f"오류: {str(e)}",
+        "attack_type": "오류 발생",
+        "risk_level": "알 수 없음",
+        "mitigation": "시스템 관리자에게 문의하세요.",
+        "attack_description": "로그 분석 중 오류가 발생했습니다.",
+        "risk_assessment": "오류로 인해 위험 평가를 수행할 수 없습니다.",
+        "detailed_mitigation": "시스템 로그를 확인하고 애플리케이션을 재시작해 보세요."
+    }]
+
+@contextmanager
+def open_detection_store():
+    """세션의 탐지 로그 저장소를 열고 블록이 끝나면 닫기 (없으면 None, 재실행마다 연결이 남지 않도록)"""
+    path = st.session_state.get("detection_store")
+    store = DetectionStore(path) if path and os.path.exists(path) else None
     try:
-        # 로그 문자열로부터 공격 패턴 탐색
-        attack_logs_by_type = {}  # 공격 유형별로 로그를 저장할 딕셔너리
-        detected_patterns = []  # 감지된 패턴 인덱스
-        
-        for line in log_content.split('\n'):
-            if not line.strip():  # 빈 줄 건너뛰기
-                continue
-                
-            # 모든 패턴을 순차적으로 검사
-            for i, pattern in enumerate(analyzer.COMPILED_PATTERNS):
-                if pattern.search(line):
-                    # 해당 인덱스의 공격 유형 가져오기
-                    attack_type = ATTACK_TYPES[i] if i < len(ATTACK_TYPES) else f"Unknown_{i}"
-                    
-                    # 공격 유형별로 로그 저장
-                    if attack_type not in attack_logs_by_type:
-                        attack_logs_by_type[attack_type] = []
-                    
-                    attack_logs_by_type[attack_type].append(line.strip())
-                    detected_patterns.append(i)  # 감지된 패턴 인덱스 저장
-                    break  # 하나의 패턴이라도 매칭되면 다음 라인으로
-        
-        # 모든 공격 로그 저장 (UI에서 표시용)
-        st.session_state["all_detected_attacks"] = attack_logs_by_type
-        
-        # 공격 패턴이 없으면 기본 응답 반환
-        if not attack_logs_by_type:
-            return {
-                "payload_info": "공격 패턴이 발견되지 않았습니다.",
-                "attack_type": "없음",
-                "risk_level": "낮음",
-                "mitigation": "모니터링을 계속하세요.",
-                "attack_description": "로그에서 알려진 공격 패턴이 발견되지 않았습니다.",
-                "risk_assessment": "현재 위험 수준은 낮습니다.",
-                "detailed_mitigation": "일반적인 보안 모니터링을 계속하고 정기적인 보안 업데이트를 유지하세요."
-            }
-        
-        # 공격 유형별로 대표 샘플 하나씩만 선택
+        yield store
+    finally:
+        if store is not None:
+            store.close()
+
+def detect_logs(log_content, log_path=None, multi_label=False):
+    """로그에서 공격 패턴을 탐지하여 디스크 저장소에 기록하고 공격 유형별 개수 반환 (로그 문자열 또는 로그 라인 스트림, 병렬 탐지 시 로그 파일 경로, multi_label이면 매칭된 모든 유형에 기록)"""
+    # 첫 줄로 로그 형식 판별 (audit_log는 여러 줄 레코드 단위로 탐지)
+    if log_path is not None:
+        source = iter_lines(log_path)
+    else:
+        source = iter_text_lines(log_content) if isinstance(log_content, str) else log_content
+    log_format, lines = sniff_log_format(source)
+    
+    # 로그로부터 공격 패턴 탐색 후 탐지된 로그를 바로 저장소에 기록 (레코드가 여러 줄인 audit_log는 바이트 범위로 나눌 수 없음)
+    store = DetectionStore.create(detection_store_dir)
+    try:
+        if log_path is not None and detection_workers > 1 and log_format != "audit":
+            # 병렬 탐지는 작업자가 파일을 바이트 범위로 다시 읽으므로 형식 판별에 사용한 파일 핸들은 먼저 닫음
+            source.close()
+            # IP 빈도 탐지는 순차 탐지와 같은 기본 설정 (빈 설정 = BurstDetector 기본값)
+            store.write_grouped(analyzer.group_attack_logs_parallel(log_path, workers=detection_workers,
+                                                                    multi_label=multi_label, burst_config={}))
+        else:
+            # 접근 로그는 IP별 요청/오류/고유 경로 빈도도 함께 검사 (업로드마다 새 윈도우 상태)
+            store.write(analyzer.iter_attack_logs(lines, log_format, burst_detector=BurstDetector(),
+                                                  multi_label=multi_label))
+        counts = store.counts()
+    except Exception:
+        store.delete()
+        raise
+    store.close()
+    
+    # 이전 분석의 저장소를 지우고 새 저장소 경로만 세션에 보관 (탐지할 때마다 버전을 올려 필터 결과를 다시 계산)
+    with open_detection_store() as previous:
+        if previous is not None:
+            previous.delete()
+    st.session_state["detection_store"] = store.path
+    st.session_state["detection_version"] = st.session_state.get("detection_version", 0) + 1
+    st.session_state.pop("detection_filter", None)
+    return counts
+
+def analyze_detected_attacks(store, attack_types, on_result=None):
+    """탐지된 공격 로그를 GPT로 분석하여 위험도 상위 5개 결과 반환 (on_result: 분석 항목이 완성될 때마다 호출)"""
+    try:
+        # 공격 유형별로 저장소의 로그를 순회하며 클러스터링하여 클러스터마다 대표 샘플 하나씩 선택
         sample_logs = []
-        for attack_type, logs in attack_logs_by_type.items():
-            sample_logs.append(logs[0])  # 각 유형의 첫 번째 로그만 선택
+        sample_counts = []
+        for attack_type in attack_types:
+            for cluster in cluster_logs(store.iter_lines(attack_type), max_clusters=max_clusters_per_type):
+                sample_logs.append(cluster.representative)
+                sample_counts.append(cluster.size)
         
-        # GPT 분석 실행 (선택된 샘플 로그만 전송)
-        results = analyzer.analyze_attack_logs(sample_logs)
+        # GPT 분석 실행 (클러스터 대표 로그와 클러스터 크기만 전송)
+        results = analyzer.analyze_attack_logs(sample_logs, counts=sample_counts, on_result=on_result)
         
         # 결과가 있으면 상위 5개를 선택, 없으면 기본 응답
         if results and len(results) > 0:
@@ -172,15 +234,14 @@ def analyze_logs(log_content):
             
     except Exception as e:
         st.error(f"분석 중 오류 발생: {str(e)}")
-        return [{
-            "payload_info": f"오류: {str(e)}",
-            "attack_type": "오류 발생",
-            "risk_level": "알 수 없음",
-            "mitigation": "시스템 관리자에게 문의하세요.",
-            "attack_description": "로그 분석 중 오류가 발생했습니다.",
-            "risk_assessment": "오류로 인해 위험 평가를 수행할 수 없습니다.",
-            "detailed_mitigation": "시스템 로그를 확인하고 애플리케이션을 재시작해 보세요."
-        }]
+        return error_result(e)
+
+def spool_upload(uploaded_file):
+    """업로드 파일을 청크 단위로 임시 파일에 저장하고 경로 반환"""
+    uploaded_file.seek(0)
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".log") as tmp_file:
+        shutil.copyfileobj(uploaded_file, tmp_file)
+    return tmp_file.name
 
 def main():
     """로그 입력 및 분석 페이지"""
@@ -195,9 +256,16 @@ def main():
 
     # 입력 방식 선택
     input_method = st.radio("로그 입력 방식 선택", ("파일 업로드", "직접 입력"))
+    
+    # 탐지 전용 모드: 정규식 탐지 결과만 즉시 표시하고 AI 분석은 공격 유형별로 필요할 때 실행
+    detection_only = st.checkbox("⚡ 탐지 결과만 빠르게 보기 (AI 분석은 공격 유형별로 필요할 때 실행)")
+    # 다중 라벨 탐지: 여러 규칙에 매칭된 로그를 가장 먼저 매칭된 유형 하나가 아닌 모든 유형에 집계
+    multi_label = st.checkbox("🏷️ 여러 공격 유형에 해당하는 로그를 모든 유형에 집계")
 
     user_input = ""
     uploaded_file = None
+    log_lines = None  # 업로드 파일의 로그 라인 스트림
+    log_path = None  # 병렬 탐지용 임시 파일 경로
 
     if input_method == "파일 업로드":
         uploaded_file = st.file_uploader("📂 JSON 또는 로그 파일을 업로드하세요", type=["json", "csv", "log", "txt"])
@@ -216,19 +284,41 @@ def main():
                     if file_ext == 'json':
                         # JSON 파일인 경우
                         user_input = json.dumps(json.load(uploaded_file), indent=2)
+                    elif detection_workers > 1:
+                        # 병렬 탐지: 업로드 파일을 임시 파일로 옮긴 뒤 바이트 범위별로 분할 처리
+                        log_path = spool_upload(uploaded_file)
                     else:
-                        # 텍스트 파일인 경우
-                        user_input = uploaded_file.getvalue().decode('utf-8', errors='ignore')
+                        # 텍스트 파일인 경우 전체를 디코딩하지 않고 청크 단위로 읽으며 분석
+                        log_lines = iter_lines(uploaded_file)
                 except Exception as e:
                     st.error(f"🚨 파일을 읽을 수 없습니다: {str(e)}")
                     return
 
-            if user_input.strip():
-                with st.spinner("🔍 AI가 로그를 분석 중입니다..."):
-                    result = analyze_logs(user_input)
-
-                # 분석 결과를 세션 상태에 저장
-                st.session_state["analysis_result"] = result
+            if log_lines is not None or log_path is not None or user_input.strip():
+                try:
+                    with st.spinner("🔍 로그에서 공격 패턴을 탐지 중입니다..."):
+                        attack_counts = detect_logs(log_lines if log_lines is not None else user_input, log_path,
+                                                    multi_label)
+                except Exception as e:
+                    st.error(f"분석 중 오류 발생: {str(e)}")
+                    attack_counts = None
+                    st.session_state["analysis_result"] = error_result(e)
+                finally:
+                    if log_path is not None:
+                        os.remove(log_path)
+
+                # GPT 분석은 결과 페이지에서 스트리밍으로 진행 (공격 패턴이 없으면 기본 응답)
+                st.session_state["analysis_pending"] = False
+                st.session_state["detection_only"] = False
+                st.session_state["type_analysis"] = {}
+                if attack_counts and detection_only:
+                    st.session_state["analysis_result"] = None
+                    st.session_state["detection_only"] = True
+                elif attack_counts:
+                    st.session_state["analysis_result"] = []
+                    st.session_state["analysis_pending"] = True
+                elif attack_counts is not None:
+                    st.session_state["analysis_result"] = NO_ATTACK_RESULT
 
                 # 결과 페이지로 이동
                 st.session_state["page"] = "result"
@@ -236,9 +326,27 @@ def main():
             else:
                 st.warning("⚠️ 로그를 입력하거나 파일을 업로드하세요.")
 
+    render_rule_status()
+
+
+def render_rule_status():
+    """탐지 규칙 팩 버전, 다시 불러오기 오류, 규칙별 정규식 실행/탐지 횟수 표시"""
+    pack = analyzer.rule_pack
+    if analyzer.rules.last_error:
+        st.warning(f"⚠️ {analyzer.rules.last_error}")
+    with st.expander(f"📏 탐지 규칙 현황 ({pack.name}, 버전 {pack.version}, 규칙 {len(pack.rules)}개)"):
+        st.caption("정규식 실행은 많은데 탐지가 0건인 규칙은 CPU만 사용하므로 정리 대상입니다.")
+        st.dataframe(
+            [{"규칙": stat["id"], "공격 유형": stat["type"], "위험도": stat["severity"],
+              "정규식 실행": stat["calls"], "탐지": stat["hits"]} for stat in pack.rule_stats()],
+            use_container_width=True,
+            hide_index=True,
+        )
+
 
+@st.cache_resource
 def get_font_path():
-    """운영체제에 맞는 한글 폰트 경로 자동 탐색"""
+    """운영체제에 맞는 한글 폰트 경로 자동 탐색 (프로세스당 한 번만 탐색)"""
     try:
         if os.name == "nt":  # Windows
             font_path = "C:/Windows/Fonts/malgun.ttf"  # 맑은 고딕
@@ -268,6 +376,271 @@ def get_font_path():
     return None  # 적절한 폰트를 찾지 못한 경우
 
 
+@st.cache_resource
+def get_font_properties():
+    """한글 폰트 속성 (폰트가 없으면 None, 프로세스당 한 번만 생성)"""
+    font_path = get_font_path()
+    return fm.FontProperties(fname=font_path) if font_path else None
+
+
+@st.cache_data(max_entries=64)
+def render_risk_chart(high, medium, low):
+    """
+    위험 등급별 위협 개수 막대 그래프를 PNG 바이트로 렌더링 (개수 조합별로 캐시)
+
+    Args:
+        high (int): 높은 위험 개수
+        medium (int): 중간 위험 개수
+        low (int): 낮은 위험 개수
+
+    Returns:
+        bytes: PNG 이미지
+    """
+    # 🔹 한글 폰트 설정 (한글 깨짐 방지)
+    font_prop = get_font_properties()
+
+    # 그래프 스타일 설정 - 다크 모드 (전역 스타일은 바꾸지 않음)
+    with plt.style.context('dark_background'):
+        # 그래프 그리기 - 높이를 정확히 설정하여 카드와 일치시킴
+        fig, ax = plt.subplots(figsize=(4, 2.8))  # 높이를 약간 늘려 190px에 맞춤
+        try:
+            fig.patch.set_facecolor('#121212')  # 배경색 설정
+            ax.set_facecolor('#1E1E1E')  # 차트 영역 배경색
+
+            # 데이터 - '알 수 없음' 제외하고 그래프 작성
+            plot_data = {"높음": high, "중간": medium, "낮음": low}
+
+            # 색상 매핑
+            colors = {'높음': 'red', '중간': 'yellow', '낮음': 'green'}
+
+            # 그래프 그리기
+            ax.bar(plot_data.keys(), plot_data.values(), color=[colors[k] for k in plot_data.keys()])
+
+            # 그리드 설정
+            ax.grid(color='#333333', linestyle='--', linewidth=0.5, alpha=0.7)
+
+            # 텍스트 색상 설정 - 모든 텍스트 하얀색으로
+            text_color = 'white'
+
+            # 한글 폰트 설정
+            if font_prop:
+                ax.set_title("위험 등급별 위협 개수", fontproperties=font_prop, fontsize=10, color=text_color)
+                ax.set_ylabel("위협 개수", fontproperties=font_prop, fontsize=8, color=text_color)
+                for label in ax.get_xticklabels():
+                    label.set_fontproperties(font_prop)
+            else:
+                # 폰트가 없는 경우 영문으로 대체
+                ax.set_title("Threats by Risk Level", fontsize=10, color=text_color)
+                ax.set_ylabel("Count", fontsize=8, color=text_color)
+            ax.tick_params(labelsize=8, colors=text_color)
+
+            # 테두리 색상 설정
+            for spine in ax.spines.values():
+                spine.set_color('#555555')
+
+            image = io.BytesIO()
+            fig.savefig(image, format="png", dpi=200, bbox_inches="tight")
+        finally:
+            plt.close(fig)  # pyplot에 등록된 그림을 해제해 세션이 길어져도 메모리가 늘지 않도록 함
+    return image.getvalue()
+
+
+def render_analysis_tabs(results, start=1):
+    """분석 결과 리스트를 결과별 탭으로 표시 (start: 첫 탭의 위협 번호)"""
+    tab_labels = [f"위협 #{i} ({result.get('attack_type', 'N/A')})" for i, result in enumerate(results, start)]
+    tabs = st.tabs(tab_labels)
+    
+    for i, (tab, result) in enumerate(zip(tabs, results)):
+        with tab:
+            st.markdown("### 🔎 분석 결과 요약")
+            st.markdown(f"**📌 페이로드 정보:** {result.get('payload_info', 'N/A')}")
+            st.markdown(f"**💀 공격 유형:** {result.get('attack_type', 'N/A')}")
+            st.markdown(f"**⚠️ 위험 등급:** {risk_color_map.get(result.get('risk_level', '알 수 없음'), '알 수 없음')}")
+            st.markdown(f"**🚨 권장 대응:** {result.get('mitigation', 'N/A')}")
+            
+            st.markdown("---")
+            st.markdown("### 📖 상세 설명")
+            st.markdown(f"**📝 공격 설명:** {result.get('attack_description', 'N/A')}")
+            st.markdown(f"**📊 위험 평가:** {result.get('risk_assessment', 'N/A')}")
+            
+            # 대응 방안 섹션을 확장자(expander)로 표시하여 더 많은 공간 확보
+            with st.expander("**🔧 상세 대응 방안**", expanded=True):
+                st.markdown(f"**즉시 조치사항:** {result.get('immediate_actions', '상세 대응 방안 참조')}")
+                st.markdown(f"**기술적 대응:** {result.get('technical_mitigation', result.get('detailed_mitigation', 'N/A'))}")
+                
+                # 코드 예시가 있는 경우 표시
+                if result.get('mitigation_examples'):
+                    st.markdown("**구현 예시:**")
+                    
+                    # 코드 블록 직접 HTML로 삽입
+                    code_html = f"""
+                    <pre style="background-color: #2B2B2B; color: #11F945; padding: 12px; border-radius: 5px; border-left: 5px solid #BB86FC;">
+                    <code style="color: #11F945; font-family: monospace;">{result.get('mitigation_examples').replace('<', '&lt;').replace('>', '&gt;')}</code>
+                    </pre>
+                    """
+                    st.markdown(code_html, unsafe_allow_html=True)
+                
+                # 보안 구성 예시가 있는 경우 표시
+                if result.get('security_config'):
+                    st.markdown("**보안 구성 예시:**")
+                    
+                    # 코드 블록 직접 HTML로 삽입
+                    config_html = f"""
+                    <pre style="background-color: #2B2B2B; color: #11F945; padding: 12px; border-radius: 5px; border-left: 5px solid #BB86FC;">
+                    <code style="color: #11F945; font-family: monospace;">{result.get('security_config').replace('<', '&lt;').replace('>', '&gt;')}</code>
+                    </pre>
+                    """
+                    st.markdown(config_html, unsafe_allow_html=True)
+                    
+                st.markdown(f"**장기적 대응:** {result.get('long_term_actions', '추가적인 보안 강화 방안을 검토하세요.')}")
+
+
+def streamed_results_view(container, on_count=None):
+    """
+    스트리밍 분석 항목을 결과 묶음(캐시 적중 로그 또는 배치)별 영역에 표시하는 on_result 콜백 생성
+    
+    항목이 도착하면 그 묶음의 영역만 다시 그리므로(이미 표시한 다른 묶음은 그대로) 전체 비용이 항목 수에 비례하고,
+    재시도로 묶음의 항목이 바뀌면 그 영역을 새 항목으로 교체합니다.
+    
+    Args:
+        container: 묶음별 영역을 도착 순서대로 추가할 Streamlit 컨테이너
+        on_count (Optional[Callable[[int], None]]): 표시 중인 전체 항목 수가 바뀔 때 호출할 함수
+    
+    Returns:
+        Callable[[int, List[dict]], None]: analyze_attack_logs의 on_result 콜백
+    """
+    slots = {}   # 묶음 위치 -> 영역
+    sizes = {}   # 묶음 위치 -> 표시 중인 항목 수
+    total = 0
+    
+    def on_result(position, items):
+        nonlocal total
+        if position not in slots:
+            with container:
+                slots[position] = st.empty()
+        total += len(items) - sizes.get(position, 0)
+        sizes[position] = len(items)
+        if items:
+            # 묶음의 항목은 위치부터 차례로 입력 로그에 대응하므로 위협 번호가 묶음 사이에서 겹치지 않음
+            with slots[position].container():
+                render_analysis_tabs(items, start=position + 1)
+        else:
+            slots[position].empty()
+        if on_count is not None:
+            on_count(total)
+    
+    return on_result
+
+
+def stream_analysis():
+    """탐지된 공격 로그의 GPT 분석을 실행하며 완성된 분석 항목을 도착 즉시 탭으로 표시"""
+    st.markdown("## 🧠 AI 분석 결과")
+    status = st.empty()
+    on_result = streamed_results_view(
+        st.container(), lambda count: status.markdown(f"🔍 AI가 로그를 분석 중입니다... ({count}개 완료)"))
+    
+    status.markdown("🔍 AI가 로그를 분석 중입니다...")
+    with open_detection_store() as store:
+        if store is not None:
+            results = analyze_detected_attacks(store, list(store.counts()), on_result=on_result)
+        else:
+            results = error_result("탐지 결과를 찾을 수 없습니다.")
+    
+    # 모든 배치가 끝나면 위험도 상위 결과로 교체하고 전체 결과 페이지 표시
+    st.session_state["analysis_result"] = results
+    st.session_state["analysis_pending"] = False
+    st.rerun()
+
+
+def render_detection_summary(store):
+    """전체 탐지된 공격 요약 출력 (저장소가 없으면 생략)"""
+    if store is None:
+        return
+    counts = store.counts()
+    total_attack_types = len(counts)
+    total_attacks = sum(counts.values())
+    
+    if total_attack_types > 0:
+        st.markdown(f"## 🔍 탐지 결과 요약")
+        st.markdown(f"총 {total_attack_types}개 유형의 공격 패턴에서 {total_attacks}개의 공격 시도가 발견되었습니다.")
+        
+        if st.checkbox("전체 탐지 결과 보기"):
+            render_detection_table(store, list(counts))
+
+
+def render_detection_table(store, attack_types):
+    """탐지된 로그를 검색/필터 조건으로 거른 뒤 현재 페이지만 저장소에서 읽어 표로 표시"""
+    col1, col2, col3, col4 = st.columns([2, 1, 1, 2])
+    with col1:
+        attack_type = st.selectbox("공격 유형", ["전체"] + attack_types, key="filter_type")
+    with col2:
+        ip = st.text_input("IP", key="filter_ip", placeholder="예: 10.0.")
+    with col3:
+        status = st.text_input("상태 코드", key="filter_status", placeholder="예: 404")
+    with col4:
+        query = st.text_input("검색", key="filter_query")
+    
+    # 조건이 바뀔 때만 다시 필터링하고, 세션에는 로그 ID 배열만 보관
+    params = (st.session_state.get("detection_version"), attack_type, ip.strip(), status.strip(), query.strip())
+    cached = st.session_state.get("detection_filter")
+    if cached is None or cached[0] != params:
+        ids = store.filter(None if attack_type == "전체" else attack_type, ip.strip(), status.strip(), query.strip())
+        cached = st.session_state["detection_filter"] = (params, ids)
+        st.session_state["page_number"] = 1  # 조건이 바뀌면 첫 페이지부터 표시
+    ids = cached[1]
+    
+    total = len(ids)
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        page_size = st.selectbox("페이지당 로그 수", [50, 100, 200, 500], index=1, key="page_size")
+    pages = max(1, (total + page_size - 1) // page_size)
+    with col2:
+        page = st.number_input("페이지", min_value=1, max_value=pages, step=1, key="page_number")
+    page = min(int(page), pages)
+    
+    # 현재 페이지의 로그만 클라이언트로 전송
+    rows = store.rows(page_ids(ids, page, page_size))
+    start = (page - 1) * page_size
+    st.caption(f"{total}개 중 {start + 1 if rows else 0}-{start + len(rows)}번째 로그 ({page}/{pages} 페이지)")
+    st.dataframe([{"번호": start + i, "공격 유형": name, "로그": log}
+                  for i, (name, log) in enumerate(rows, 1)],
+                 use_container_width=True, hide_index=True)
+
+
+def detection_page():
+    """탐지 전용 결과: 공격 유형별 개수와 샘플을 바로 표시하고, 요청한 유형만 GPT로 분석하여 유형별로 보관"""
+    with open_detection_store() as store:
+        counts = store.counts() if store is not None else {}
+        type_analysis = st.session_state["type_analysis"]
+        render_detection_summary(store)
+        
+        st.markdown("## 🧠 공격 유형별 AI 분석")
+        tabs = st.tabs([f"{attack_type} ({count}개)" for attack_type, count in counts.items()]) if counts else []
+        for tab, (attack_type, count) in zip(tabs, counts.items()):
+            with tab:
+                st.markdown(f"**탐지 건수:** {count}개")
+                for i, log in enumerate(store.sample(attack_type, 5), 1):
+                    st.text(f"{i}. {log}")
+                
+                if attack_type in type_analysis:
+                    render_analysis_tabs(type_analysis[attack_type])
+                elif st.button("🧠 이 유형 AI 분석", key=f"analyze_{attack_type}"):
+                    # 이 유형만 분석하며 완성된 항목을 바로 표시 (결과는 유형별로 보관하여 다시 요청하지 않음)
+                    placeholder = st.empty()
+                    on_result = streamed_results_view(placeholder.container())
+                    with st.spinner("🔍 AI가 로그를 분석 중입니다..."):
+                        type_analysis[attack_type] = analyze_detected_attacks(store, [attack_type], on_result=on_result)
+                    with placeholder.container():
+                        render_analysis_tabs(type_analysis[attack_type])
+    
+    # 돌아가기 버튼
+    col1, col2, col3 = st.columns([1, 1, 1])
+    with col2:
+        if st.button("🔙 메인 페이지로 돌아가기"):
+            st.session_state["page"] = "main"
+            st.rerun()
+
+
 def result_page():
     """분석 결과 페이지"""
     col1, col2, col3 = st.columns([1.5, 1, 1])  
@@ -277,6 +650,16 @@ def result_page():
         except:
             st.title("AI 기반 보안 로그 분석기")  # 이미지가 없는 경우 대체 텍스트
 
+    # 탐지 직후에는 GPT 분석 결과를 스트리밍으로 표시
+    if st.session_state.get("analysis_pending"):
+        stream_analysis()
+        return
+    
+    # 탐지 전용 모드는 AI 분석 없이 탐지 결과부터 표시
+    if st.session_state.get("detection_only"):
+        detection_page()
+        return
+
     results = st.session_state.get("analysis_result", None)
 
     if results and isinstance(results, list) and len(results) > 0:
@@ -305,52 +688,8 @@ def result_page():
 
         with col1:
             try:
-                # 🔹 한글 폰트 설정 (한글 깨짐 방지)
-                font_path = get_font_path()
-                
-                # 그래프 스타일 설정 - 다크 모드
-                plt.style.use('dark_background')
-                
-                # 그래프 그리기 - 높이를 정확히 설정하여 카드와 일치시킴
-                fig, ax = plt.subplots(figsize=(4, 2.8))  # 높이를 약간 늘려 190px에 맞춤
-                fig.patch.set_facecolor('#121212')  # 배경색 설정
-                ax.set_facecolor('#1E1E1E')  # 차트 영역 배경색
-                
-                # 데이터 필터링 - '알 수 없음' 제외하고 그래프 작성
-                plot_data = {k: v for k, v in risk_counts.items() if k != "알 수 없음"}
-                
-                # 색상 매핑
-                colors = {'높음': 'red', '중간': 'yellow', '낮음': 'green'}
-                
-                # 그래프 그리기
-                bars = ax.bar(plot_data.keys(), plot_data.values(), color=[colors[k] for k in plot_data.keys()])
-                
-                # 그리드 설정
-                ax.grid(color='#333333', linestyle='--', linewidth=0.5, alpha=0.7)
-                
-                # 텍스트 색상 설정 - 모든 텍스트 하얀색으로
-                text_color = 'white'
-                
-                # 한글 폰트 설정
-                if font_path:
-                    font_prop = fm.FontProperties(fname=font_path, size=9)
-                    ax.set_title("위험 등급별 위협 개수", fontproperties=font_prop, fontsize=10, color=text_color)
-                    ax.set_ylabel("위협 개수", fontproperties=font_prop, fontsize=8, color=text_color)
-                    plt.xticks(fontproperties=font_prop, fontsize=8, color=text_color)
-                else:
-                    # 폰트가 없는 경우 영문으로 대체
-                    ax.set_title("Threats by Risk Level", fontsize=10, color=text_color)
-                    ax.set_ylabel("Count", fontsize=8, color=text_color)
-                    plt.xticks(fontsize=8, color=text_color)
-                
-                plt.yticks(fontsize=8, color=text_color)
-                
-                # 테두리 색상 설정
-                for spine in ax.spines.values():
-                    spine.set_color('#555555')
-                
-                # 그래프 출력
-                st.pyplot(fig)
+                # 같은 위험 등급 개수면 캐시된 이미지를 그대로 사용 (재실행 시 그래프를 다시 그리지 않음)
+                st.image(render_risk_chart(risk_counts["높음"], risk_counts["중간"], risk_counts["낮음"]))
                 
             except Exception as e:
                 st.error(f"그래프 생성 중 오류 발생: {str(e)}")
@@ -415,21 +754,8 @@ def result_page():
             # 카드 컨테이너 종료
             st.markdown("</div>", unsafe_allow_html=True)
 
-    all_attacks = st.session_state.get("all_detected_attacks", {})
-    
-    # 전체 탐지된 공격 요약 출력
-    total_attack_types = len(all_attacks)
-    total_attacks = sum(len(logs) for logs in all_attacks.values())
-    
-    if total_attack_types > 0:
-        st.markdown(f"## 🔍 탐지 결과 요약")
-        st.markdown(f"총 {total_attack_types}개 유형의 공격 패턴에서 {total_attacks}개의 공격 시도가 발견되었습니다.")
-        
-        if st.checkbox("전체 탐지 결과 보기"):
-            for attack_type, logs in all_attacks.items():
-                with st.expander(f"{attack_type} ({len(logs)}개)"):
-                    for i, log in enumerate(logs, 1):
-                        st.text(f"{i}. {log}")
+    with open_detection_store() as store:
+        render_detection_summary(store)
 
     # AI 분석 결과
     if results:
@@ -439,53 +765,7 @@ def result_page():
             # 여러 결과가 있는 경우
             st.markdown(f"### 가장 위험한 상위 {len(results)}개 공격 패턴에 대한 분석")
             
-            # 탭 인터페이스를 사용하여 여러 결과 표시
-            tab_labels = [f"위협 #{i+1} ({result.get('attack_type', 'N/A')})" for i, result in enumerate(results)]
-            tabs = st.tabs(tab_labels)
-            
-            for i, (tab, result) in enumerate(zip(tabs, results)):
-                with tab:
-                    st.markdown("### 🔎 분석 결과 요약")
-                    st.markdown(f"**📌 페이로드 정보:** {result.get('payload_info', 'N/A')}")
-                    st.markdown(f"**💀 공격 유형:** {result.get('attack_type', 'N/A')}")
-                    st.markdown(f"**⚠️ 위험 등급:** {risk_color_map.get(result.get('risk_level', '알 수 없음'), '알 수 없음')}")
-                    st.markdown(f"**🚨 권장 대응:** {result.get('mitigation', 'N/A')}")
-                    
-                    st.markdown("---")
-                    st.markdown("### 📖 상세 설명")
-                    st.markdown(f"**📝 공격 설명:** {result.get('attack_description', 'N/A')}")
-                    st.markdown(f"**📊 위험 평가:** {result.get('risk_assessment', 'N/A')}")
-                    
-                    # 대응 방안 섹션을 확장자(expander)로 표시하여 더 많은 공간 확보
-                    with st.expander("**🔧 상세 대응 방안**", expanded=True):
-                        st.markdown(f"**즉시 조치사항:** {result.get('immediate_actions', '상세 대응 방안 참조')}")
-                        st.markdown(f"**기술적 대응:** {result.get('technical_mitigation', result.get('detailed_mitigation', 'N/A'))}")
-                        
-                        # 코드 예시가 있는 경우 표시
-                        if result.get('mitigation_examples'):
-                            st.markdown("**구현 예시:**")
-                            
-                            # 코드 블록 직접 HTML로 삽입
-                            code_html = f"""
-                            <pre style="background-color: #2B2B2B; color: #11F945; padding: 12px; border-radius: 5px; border-left: 5px solid #BB86FC;">
-                            <code style="color: #11F945; font-family: monospace;">{result.get('mitigation_examples').replace('<', '&lt;').replace('>', '&gt;')}</code>
-                            </pre>
-                            """
-                            st.markdown(code_html, unsafe_allow_html=True)
-                        
-                        # 보안 구성 예시가 있는 경우 표시
-                        if result.get('security_config'):
-                            st.markdown("**보안 구성 예시:**")
-                            
-                            # 코드 블록 직접 HTML로 삽입
-                            config_html = f"""
-                            <pre style="background-color: #2B2B2B; color: #11F945; padding: 12px; border-radius: 5px; border-left: 5px solid #BB86FC;">
-                            <code style="color: #11F945; font-family: monospace;">{result.get('security_config').replace('<', '&lt;').replace('>', '&gt;')}</code>
-                            </pre>
-                            """
-                            st.markdown(config_html, unsafe_allow_html=True)
-                            
-                        st.markdown(f"**장기적 대응:** {result.get('long_term_actions', '추가적인 보안 강화 방안을 검토하세요.')}")
+            render_analysis_tabs(results)
         elif isinstance(results, dict):
             # 단일 결과인 경우 (기존 코드)
             result = results
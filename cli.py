@@ -0,0 +1,318 @@
+"""
+AI-SecLog 명령줄 일괄 분석 도구 (Streamlit 없이 cron/로그 수집 서버에서 실행)
+
+사용 예:
+    python cli.py logfile/
+    python cli.py logfile/ --pattern "access_log*" --workers 4 --output analysis_results.json
+    OPENAI_API_KEY=... python cli.py logfile/ --analyze
+    python cli.py /var/log/httpd --follow --pattern "*_log"
+    python cli.py logfile/ --max-line-length 8192 --profile-patterns
+    python cli.py logfile/ --rules rules/custom.json
+    python cli.py logfile/ --multi-label
+"""
+import argparse
+import fnmatch
+import os
+import re
+import signal
+import sys
+import time
+from typing import List, Dict, Any, Optional
+
+from modules.analyzer import WebAttackAnalyzer
+from modules.burst import BurstDetector
+from modules.cache import AnalysisCache
+from modules.cluster import cluster_logs
+from modules.follow import LogFollower
+from modules.parallel import detect_files_parallel
+from modules.regexprof import PatternProfiler
+from modules.rules import DEFAULT_RULES_PATH, RulePack, RuleRegistry, load_rule_pack
+
+# 순환된 로그 파일 이름의 회전 번호 (access_log.3, access_log.3.gz)
+_ROTATION_PATTERN = re.compile(r'\.(\d+)(?:\.gz)?$')
+
+
+def _rotation_key(name: str):
+    """access_log, access_log.1, ..., access_log.12 순서로 정렬하기 위한 키"""
+    match = _ROTATION_PATTERN.search(name)
+    if match is None:
+        return name[:-3] if name.endswith('.gz') else name, 0
+    return name[:match.start()], int(match.group(1))
+
+
+def collect_log_files(directory: str, pattern: str = "access_log*") -> List[str]:
+    """
+    디렉토리에서 패턴에 맞는 로그 파일 목록 수집
+
+    Args:
+        directory (str): 로그 디렉토리 경로 (파일 경로를 주면 해당 파일만 사용)
+        pattern (str): 파일 이름 glob 패턴
+
+    Returns:
+        List[str]: 회전 번호 순서로 정렬된 로그 파일 경로 리스트
+    """
+    if os.path.isfile(directory):
+        return [directory]
+
+    names = [name for name in os.listdir(directory)
+             if fnmatch.fnmatch(name, pattern) and os.path.isfile(os.path.join(directory, name))]
+    return [os.path.join(directory, name) for name in sorted(names, key=_rotation_key)]
+
+
+def build_detection_results(attack_logs_by_type: Dict[str, List[str]],
+                            max_clusters_per_type: Optional[int] = None,
+                            rule_pack: Optional[RulePack] = None) -> List[Dict[str, Any]]:
+    """
+    공격 유형별 탐지 로그를 페이로드 클러스터 단위 결과로 변환 (GPT 분석 없이 저장할 때 사용)
+
+    Args:
+        attack_logs_by_type (Dict[str, List[str]]): 공격 유형별 로그 리스트
+        max_clusters_per_type (Optional[int]): 공격 유형별 최대 클러스터 수 (None이면 전체)
+        rule_pack (Optional[RulePack]): 탐지에 사용한 규칙 팩 (주어지면 규칙의 위험도를 severity로 기록)
+
+    Returns:
+        List[Dict[str, Any]]: 클러스터별 탐지 결과 리스트
+    """
+    results = []
+    for attack_type, logs in attack_logs_by_type.items():
+        severity = rule_pack.severity_of(attack_type) if rule_pack is not None else None
+        for cluster in cluster_logs(logs, max_clusters=max_clusters_per_type):
+            result = {
+                "attack_type": attack_type,
+                "payload_info": cluster.representative,
+                "payload_template": cluster.template,
+                "occurrences": cluster.size,
+            }
+            if severity is not None:
+                result["severity"] = severity
+            results.append(result)
+    return results
+
+
+def analyze_detected_logs(analyzer: WebAttackAnalyzer, attack_logs_by_type: Dict[str, List[str]],
+                          max_clusters_per_type: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    공격 유형별 클러스터 대표 로그만 GPT로 분석
+
+    Args:
+        analyzer (WebAttackAnalyzer): 분석기 인스턴스
+        attack_logs_by_type (Dict[str, List[str]]): 공격 유형별 로그 리스트
+        max_clusters_per_type (Optional[int]): 공격 유형별 최대 클러스터 수 (None이면 전체)
+
+    Returns:
+        List[Dict[str, Any]]: GPT 분석 결과 리스트
+    """
+    sample_logs = []
+    sample_counts = []
+    for logs in attack_logs_by_type.values():
+        for cluster in cluster_logs(logs, max_clusters=max_clusters_per_type):
+            sample_logs.append(cluster.representative)
+            sample_counts.append(cluster.size)
+    return analyzer.analyze_attack_logs(sample_logs, counts=sample_counts)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """명령줄 인자 파싱"""
+    parser = argparse.ArgumentParser(description="웹 로그 디렉토리의 공격 패턴을 일괄 탐지/분석합니다.")
+    parser.add_argument("path", help="로그 디렉토리 또는 로그 파일 경로 (.gz 압축 파일 지원)")
+    parser.add_argument("--pattern", default="access_log*", help="디렉토리에서 처리할 파일 이름 glob 패턴 (기본값: access_log*)")
+    parser.add_argument("--workers", type=int, default=None, help="동시에 처리할 파일 수 (기본값: CPU 코어 수)")
+    parser.add_argument("--output", default="analysis_results.json", help="결과 JSON 파일 경로")
+    parser.add_argument("--analyze", action="store_true", help="탐지된 로그를 GPT로 분석 (OPENAI_API_KEY 필요)")
+    parser.add_argument("--api-key", default=os.getenv("OPENAI_API_KEY", ""), help="OpenAI API 키 (기본값: OPENAI_API_KEY 환경변수)")
+    parser.add_argument("--max-clusters", type=int, default=int(os.getenv("MAX_CLUSTERS_PER_TYPE", "5")),
+                        help="공격 유형별 최대 클러스터 수 (기본값: MAX_CLUSTERS_PER_TYPE 환경변수 또는 5)")
+    parser.add_argument("--cache", default=os.getenv("ANALYSIS_CACHE_PATH", "analysis_cache.db"),
+                        help="GPT 분석 결과 캐시 파일 경로 (빈 문자열이면 캐시 사용 안 함)")
+    parser.add_argument("--input-budget", type=int, default=int(os.getenv("GPT_INPUT_TOKEN_BUDGET", "8000")),
+                        help="GPT 요청 하나의 최대 입력 토큰 수 (기본값: GPT_INPUT_TOKEN_BUDGET 환경변수 또는 8000)")
+    parser.add_argument("--output-budget", type=int, default=int(os.getenv("GPT_OUTPUT_TOKEN_BUDGET", "16000")),
+                        help="GPT 요청 하나의 최대 출력 토큰 수 (기본값: GPT_OUTPUT_TOKEN_BUDGET 환경변수 또는 16000)")
+    parser.add_argument("--no-burst", action="store_true", help="IP별 요청/오류/고유 경로 빈도 탐지를 사용하지 않음")
+    parser.add_argument("--burst-window", type=float, default=60.0, help="IP별 빈도 탐지 시간 윈도우(초)")
+    parser.add_argument("--max-requests", type=int, default=120, help="윈도우 내 IP별 최대 요청 수")
+    parser.add_argument("--max-errors", type=int, default=30, help="윈도우 내 IP별 최대 4xx/5xx 응답 수")
+    parser.add_argument("--max-paths", type=int, default=50, help="윈도우 내 IP별 최대 고유 경로 수")
+    parser.add_argument("--rules", default=os.getenv("RULES_PATH", DEFAULT_RULES_PATH),
+                        help="탐지 규칙 팩 파일 (JSON 또는 YAML, 기본값: RULES_PATH 환경변수 또는 rules/default.json)")
+    parser.add_argument("--max-line-length", type=int, default=int(os.getenv("MAX_SCAN_LENGTH", "0")),
+                        help="탐지 정규식에 전달할 라인/필드 최대 길이, 초과분은 잘라서 검사 "
+                             "(기본값: MAX_SCAN_LENGTH 환경변수 또는 0 = 제한 없음)")
+    parser.add_argument("--multi-label", action="store_true",
+                        help="라인에 매칭되는 모든 규칙의 유형으로 집계 (기본값은 가장 먼저 매칭된 규칙 하나, 일괄 처리 모드)")
+    parser.add_argument("--profile-patterns", action="store_true",
+                        help="패턴별 정규식 검사 시간, 매칭 수, 가장 오래 걸린 입력 길이를 보고")
+    parser.add_argument("--follow", action="store_true", help="로그 파일을 계속 추적하며 새로 추가된 줄만 탐지")
+    parser.add_argument("--interval", type=float, default=1.0, help="추적 모드 폴링 간격(초)")
+    parser.add_argument("--checkpoint", default=os.getenv("FOLLOW_CHECKPOINT_PATH", "follow_checkpoint.json"),
+                        help="추적 모드 체크포인트 파일 경로 (재시작 시 이어서 읽음)")
+    parser.add_argument("--from-start", action="store_true", help="체크포인트가 없는 파일을 처음부터 읽음 (기본값은 파일 끝부터)")
+    parser.add_argument("--analyze-interval", type=float, default=60.0,
+                        help="추적 모드에서 누적된 탐지 로그를 GPT로 분석하는 간격(초)")
+    return parser.parse_args(argv)
+
+
+def burst_config(args: argparse.Namespace) -> Optional[Dict[str, float]]:
+    """명령줄 인자로 BurstDetector 생성 인자 구성 (--no-burst면 None)"""
+    if args.no_burst:
+        return None
+    return {"window_seconds": args.burst_window, "max_requests": args.max_requests,
+            "max_errors": args.max_errors, "max_distinct_paths": args.max_paths}
+
+
+def follow_logs(args: argparse.Namespace, paths: List[str]) -> None:
+    """
+    로그 파일을 추적하며 새로 탐지된 로그를 출력하고, --analyze 시 일정 간격으로 모아서 GPT 분석
+
+    Args:
+        args (argparse.Namespace): 명령줄 인자
+        paths (List[str]): 추적할 로그 파일 경로 목록
+    """
+    # 규칙 팩 파일이 바뀌면 폴링 사이에 새 규칙으로 교체 (재시작 불필요)
+    rules = RuleRegistry(args.rules)
+    pack = rules.current()
+    follower = LogFollower(paths, pack.matcher(args.max_line_length or None), pack.types,
+                           checkpoint_path=args.checkpoint or None, from_start=args.from_start,
+                           burst_detector=BurstDetector.from_config(burst_config(args)), rules=rules)
+
+    analyzer = None
+    cache = None
+    if args.analyze:
+        cache = AnalysisCache(args.cache) if args.cache else None
+        analyzer = WebAttackAnalyzer(args.api_key, cache=cache, input_token_budget=args.input_budget,
+                                     output_token_budget=args.output_budget, rules=rules)
+
+    pending = {}  # GPT 분석 대기 중인 공격 유형별 로그
+    analyses = []  # 추적을 시작한 뒤의 전체 분석 결과 (간격마다 결과 파일을 전체 내용으로 다시 씀)
+    last_analyzed = time.monotonic()
+
+    def on_detect(attack_logs_by_type: Dict[str, List[str]]) -> None:
+        for attack_type, logs in attack_logs_by_type.items():
+            for line in logs:
+                print(f"[{attack_type}] {line}")
+            if analyzer is not None:
+                pending.setdefault(attack_type, []).extend(logs)
+
+    def analyze_pending() -> None:
+        nonlocal last_analyzed
+        last_analyzed = time.monotonic()
+        if analyzer is None or not pending:
+            return
+        analyses.extend(analyze_detected_logs(analyzer, pending, args.max_clusters))
+        pending.clear()
+        WebAttackAnalyzer.save_results(analyses, args.output)
+
+    def on_poll() -> None:
+        if time.monotonic() - last_analyzed >= args.analyze_interval:
+            analyze_pending()
+
+    # SIGINT/SIGTERM은 플래그만 세우고 현재 폴링과 분석을 마친 뒤 종료 (체크포인트와 남은 분석 보존)
+    stop_requested = False
+
+    def request_stop(signum, frame) -> None:
+        nonlocal stop_requested
+        stop_requested = True
+
+    previous_handlers = {signum: signal.signal(signum, request_stop)
+                         for signum in (signal.SIGINT, signal.SIGTERM)}
+
+    print(f"{len(paths)}개 파일 추적 중 (Ctrl+C로 종료)")
+    try:
+        follower.run(on_detect, interval=args.interval,
+                     should_stop=lambda: stop_requested, on_poll=on_poll)
+    finally:
+        for signum, handler in previous_handlers.items():
+            signal.signal(signum, handler)
+        analyze_pending()
+        if cache is not None:
+            cache.close()
+        print(rules.current().rule_report())
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    명령줄 일괄 분석 실행
+
+    Returns:
+        int: 종료 코드 (0: 성공, 1: 입력 오류)
+    """
+    args = parse_args(argv)
+
+    if not os.path.exists(args.path):
+        print(f"경로를 찾을 수 없습니다: {args.path}", file=sys.stderr)
+        return 1
+    if args.analyze and not args.api_key:
+        print("GPT 분석에는 OpenAI API 키가 필요합니다 (--api-key 또는 OPENAI_API_KEY).", file=sys.stderr)
+        return 1
+
+    try:
+        pack = load_rule_pack(args.rules)
+    except (OSError, ValueError) as e:
+        print(f"규칙 팩을 불러올 수 없습니다: {args.rules}: {e}", file=sys.stderr)
+        return 1
+
+    paths = collect_log_files(args.path, args.pattern)
+    if not paths:
+        print(f"처리할 로그 파일이 없습니다: {args.path} ({args.pattern})", file=sys.stderr)
+        return 1
+
+    if args.follow:
+        follow_logs(args, paths)
+        return 0
+
+    # 파일 단위로 동시에 탐지하고 파일 순서대로 공격 유형별 버킷에 병합
+    attack_logs_by_type = {}
+    attack_types = pack.types + BurstDetector.RULE_TYPES  # 빈도 규칙은 패턴 인덱스 뒤에 위치
+    overlaps = {}  # 다중 라벨: 여러 유형에 동시에 탐지된 라인의 유형 조합 -> 라인 수
+    started = time.perf_counter()
+    total_lines = 0
+    profiler = PatternProfiler(pack.patterns, pack.targets, args.max_line_length or None,
+                               pack.literals) if args.profile_patterns else None
+    for result in detect_files_parallel(paths, pack.patterns, workers=args.workers, targets=pack.targets,
+                                        burst_config=burst_config(args), max_length=args.max_line_length or None,
+                                        profile=args.profile_patterns, literals=pack.literals,
+                                        multi_label=args.multi_label):
+        total_lines += result.lines
+        if profiler is not None:
+            profiler.merge(result.profile)
+        for mask, line in result.masks or ():
+            types = pack.mask_types(mask)
+            for attack_type in types:
+                attack_logs_by_type.setdefault(attack_type, []).append(line)
+            if len(types) > 1:
+                overlaps[tuple(types)] = overlaps.get(tuple(types), 0) + 1
+        for index, line in result.detected:
+            attack_type = attack_types[index] if index < len(attack_types) else f"Unknown_{index}"
+            attack_logs_by_type.setdefault(attack_type, []).append(line)
+        print(f"{result.path}: {result.lines:,}줄, 탐지 {len(result.detected) + len(result.masks or ()):,}건, "
+              f"{result.elapsed:.2f}초 ({result.lines_per_sec:,.0f}줄/초)")
+    elapsed = time.perf_counter() - started
+
+    total_detected = sum(len(logs) for logs in attack_logs_by_type.values())
+    print(f"전체: 파일 {len(paths)}개, {total_lines:,}줄, 탐지 {total_detected:,}건, "
+          f"{elapsed:.2f}초 ({total_lines / elapsed if elapsed > 0 else 0:,.0f}줄/초)")
+    for attack_type, logs in attack_logs_by_type.items():
+        print(f"  {attack_type}: {len(logs):,}건")
+    if overlaps:
+        print(f"여러 유형에 동시에 탐지된 라인 {sum(overlaps.values()):,}개:")
+        for types, count in sorted(overlaps.items(), key=lambda item: item[1], reverse=True):
+            print(f"  {' + '.join(types)}: {count:,}줄")
+    if profiler is not None:
+        print(profiler.profile_report([rule.id for rule in pack.rules]))
+
+    if args.analyze:
+        cache = AnalysisCache(args.cache) if args.cache else None
+        analyzer = WebAttackAnalyzer(args.api_key, cache=cache, input_token_budget=args.input_budget,
+                                     output_token_budget=args.output_budget, rules=RuleRegistry(args.rules))
+        results = analyze_detected_logs(analyzer, attack_logs_by_type, args.max_clusters)
+        if cache is not None:
+            cache.close()
+    else:
+        results = build_detection_results(attack_logs_by_type, args.max_clusters, pack)
+
+    WebAttackAnalyzer.save_results(results, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
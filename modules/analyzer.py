@@ -1,80 +1,122 @@
-import re
 import json
-from openai import OpenAI
-from typing import List, Dict, Any
+import hashlib
+import random
+import time
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from openai import OpenAI, APIConnectionError, APITimeoutError
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Tuple, Union, Callable
+from modules.ingest import is_gzip_file, iter_lines, iter_text_lines
+from modules.parallel import detect_file_parallel
+from modules.ratelimit import RateLimiter
+from modules.cache import AnalysisCache
+from modules.parser import match_log_line, match_log_record, match_log_record_mask
+from modules.burst import BurstDetector
+from modules.audit import detect_audit_records, detect_audit_record_masks
+from modules.prompt import ANALYSIS_INSTRUCTIONS, estimate_tokens, truncate_log, pack_batches
+from modules.stream import AnalysisStreamParser
+from modules.rules import RulePack, RuleRegistry, load_rule_pack
+
+# 규칙 팩을 지정하지 않은 도구(명령줄, 벤치마크)가 사용하는 기본 규칙
+_DEFAULT_RULES = load_rule_pack()
 
 class WebAttackAnalyzer:
     """웹 로그에서 공격 패턴을 탐지하고 분석하는 클래스"""
     
-    # 공격 패턴 정규식 목록
-    ATTACK_PATTERNS = [
-    # SQL 인젝션 패턴
-    r"(?i)(\b(select|insert|update|delete|drop|alter|union|exec|declare|cast)\b.*\b(from|into|where|table|database)\b)|(\b(waitfor|delay|sleep)\b.*\d+)|('(''|[^'])*'(''|'|[^'])*')|(--[^\r\n]*)|(/\*[^*]*\*/)",
-    
-    # XSS 패턴
-    r"(?i)(<script[^>]*>.*</script>|<iframe[^>]*>.*</iframe>|javascript:|alert\(|onmouseover=|onclick=|onerror=)",
-    
-    # 디렉토리 탐색 패턴
-    r"(?i)((\.\./|\.\./\./|\.\.\\|\.\.\\\.\.\\|/etc/passwd|/etc/shadow|/proc/self/environ|/proc/\d+/fd/\d+))",
-    
-    # 명령어 인젝션 패턴
-    r"(?i)(\||;|`|\$\(|\$\{|&&|\|\||ping -c|wget |curl |nc |netcat |ncat |bash -|sh -|python -c|chmod |chown |killall |/bin/|/dev/)",
-    
-    # 파일 업로드 시도 패턴
-    r"(?i)(\.php|\.jsp|\.asp|\.aspx|\.exe|\.sh|\.pl|\.cgi|\.bat)(\s|$)",
-    
-    # LFI/RFI 패턴
-    r"(?i)((\?|&)(file|page|url|path|include|dir|location|folder|doc|document|site|view|content)=)",
-    
-    # 기본 웹 공격 패턴(비정상적 요청)
-    r"(?i)(\.htaccess|\.git/|\.svn/|\/config\.php|\?XDEBUG_SESSION_START=|acunetix|appscan)",
-    
-    # cmd.exe 실행 시도
-    r"cmd\.exe\?\/c\+",
-    
-    # 경로 우회 시도
-    r"\.\.(%[0-9a-fA-F]{1,4}c|%[0-9a-fA-F]{1,2}\/|%[0-9a-fA-F]{1,2}af|%c[0-9a-fA-F]{1,3})",
-    
-    # 시스템 디렉토리 접근 시도
-    r"\/winnt\/system32\/",
-    
-    # 웹 취약점 스캐닝 도구(root.exe)
-    r"\/(scripts|MSADC)\/root\.exe",
-    
-    # 버퍼 오버플로우 공격 패턴
-    r"\\x(90|04H)\\x(90|04H)\\x(90|04H){10,}",
+    # 기본 규칙 팩(rules/default.json)의 정규식, 공격 유형 라벨, 탐지 대상 필드 - 모두 규칙 순서와 일치
+    # 구조화된 접근 로그는 IP, 타임스탬프 등을 제외하고 규칙의 대상 필드에만 정규식을 적용
+    # (User-Agent의 "compatible; MSIE" 같은 세미콜론이 명령어 인젝션으로 오탐되지 않도록 함)
+    ATTACK_PATTERNS = _DEFAULT_RULES.patterns
+    ATTACK_TYPES = _DEFAULT_RULES.types
+    ATTACK_TARGETS = _DEFAULT_RULES.targets
     
-    # OpenWebMail 취약점 탐색
-    r"\/cgi-bin\/openwebmail\/openwebmail\.pl",
+    # GPT 분석에 사용할 모델 (필요에 따라 변경 가능)
+    MODEL = "gpt-4o-mini"
     
-    # 허용되지 않은 HTTP 메서드
-    r"OPTIONS \/ HTTP\/1\.[01]",
+    # GPT 분석 시스템 메시지
+    SYSTEM_PROMPT = "당신은 보안 전문가로서 웹 로그에서 발견된 공격 패턴을 상세하게 분석하고 구체적인 대응 방안을 제공하는 역할을 합니다. 각 공격에 대해 즉각적인 대응 조치부터 장기적인 보안 강화 방안까지 상세히 설명해주세요. 코드 예시와 구성 파일 예시도 함께 제공하세요."
     
-    # 프록시 하이재킹 시도
-    r"GET http:\/\/[a-zA-Z0-9.-]+\/ HTTP",
-    
-    # FrontPage/SharePoint 관련 취약점 탐색
-    r"\/(_vti_bin\/|_mem_bin\/)|\.\.%255c"
-]
-    
-    def __init__(self, openai_api_key: str):
+    def __init__(self, openai_api_key: str, client: Any = None, max_concurrency: int = 4,
+                 requests_per_minute: Optional[float] = 500, tokens_per_minute: Optional[float] = 200000,
+                 max_retries: int = 3, retry_base_delay: float = 1.0, cache: Optional[AnalysisCache] = None,
+                 input_token_budget: int = 8000, output_token_budget: int = 16000, output_tokens_per_log: int = 1200,
+                 max_log_tokens: int = 400, max_line_length: Optional[int] = None,
+                 rules: Optional[RuleRegistry] = None):
         """
         초기화 함수
         
         Args:
             openai_api_key (str): OpenAI API 키
+            client (Any): OpenAI 호환 클라이언트 (None이면 생성, 테스트용 스텁 주입 가능)
+            max_concurrency (int): 동시에 처리할 최대 GPT 요청 수
+            requests_per_minute (Optional[float]): 분당 최대 요청 수 (None이면 제한 없음)
+            tokens_per_minute (Optional[float]): 분당 최대 토큰 수 (None이면 제한 없음)
+            max_retries (int): 429/5xx/연결 오류 시 최대 재시도 횟수
+            retry_base_delay (float): 지수 백오프 기본 대기 시간(초)
+            cache (Optional[AnalysisCache]): 분석 결과 디스크 캐시 (None이면 캐시 사용 안 함)
+            input_token_budget (int): 요청 하나의 최대 입력 토큰 수 (시스템 메시지 포함)
+            output_token_budget (int): 요청 하나의 최대 출력 토큰 수 (max_tokens로 전달)
+            output_tokens_per_log (int): 로그 하나의 분석 결과에 필요한 예상 출력 토큰 수
+            max_log_tokens (int): 로그 하나의 최대 토큰 수 (초과 시 가운데를 생략하여 전송)
+            max_line_length (Optional[int]): 탐지 정규식에 전달할 라인/필드 최대 길이 (None이면 제한 없음)
+            rules (Optional[RuleRegistry]): 탐지 규칙 팩 레지스트리 (None이면 rules/default.json을 감시)
         """
-        self.client = OpenAI(api_key=openai_api_key)
+        # 재시도는 분석기에서 직접 처리하므로 클라이언트 자체 재시도는 비활성화
+        self.client = client if client is not None else OpenAI(api_key=openai_api_key, max_retries=0)
+        self.max_concurrency = max(1, max_concurrency)
+        self.rate_limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.cache = cache
+        self.input_token_budget = input_token_budget
+        self.output_token_budget = output_token_budget
+        self.output_tokens_per_log = max(1, output_tokens_per_log)
+        self.max_log_tokens = max_log_tokens
+        
+        # 고정 지침은 시스템 메시지에 한 번만 넣어 모든 요청이 같은 접두부를 공유하도록 구성
+        self.system_message = self.SYSTEM_PROMPT + "\n\n" + ANALYSIS_INSTRUCTIONS
+        self.system_tokens = estimate_tokens(self.system_message)
         
-        # 각 패턴을 개별적으로 컴파일
-        self.COMPILED_PATTERNS = [re.compile(pattern) for pattern in self.ATTACK_PATTERNS]
+        # 프롬프트 템플릿이 바뀌면 기존 캐시 항목을 사용하지 않도록 템플릿 해시를 캐시 키에 포함
+        template = self.system_message + "\x00" + self._create_analysis_prompt([])
+        self.prompt_hash = hashlib.sha256(template.encode('utf-8')).hexdigest()
+        
+        # 탐지 규칙 팩 (파일이 바뀌면 다음 분석부터 새 규칙 적용)
+        self.max_line_length = max_line_length
+        self.rules = rules if rules is not None else RuleRegistry()
+    
+    @property
+    def rule_pack(self) -> RulePack:
+        """현재 규칙 팩 (분석 하나는 시작할 때 받은 팩을 끝까지 사용)"""
+        return self.rules.current()
+    
+    @property
+    def matcher(self):
+        """현재 규칙 팩의 매칭 엔진 (필수 리터럴 사전 검사 + 순차 확인, 팩마다 한 번만 컴파일하여 공유)"""
+        return self.rule_pack.matcher(self.max_line_length)
+    
+    def match_attack(self, line: str, log_format: str = "access") -> Optional[int]:
+        """
+        로그 라인에서 가장 먼저 매칭되는 공격 패턴 인덱스 탐색
+        
+        Apache 접근 로그 형식이면 파싱 후 규칙의 대상 필드에만 정규식을 적용하고,
+        그 외 형식은 라인 전체를 검사합니다.
+        
+        Args:
+            line (str): 검사할 로그 라인
+            log_format (str): 로그 형식 ("access", "agent", "referer")
+            
+        Returns:
+            Optional[int]: 현재 규칙 팩 기준 규칙 인덱스 (탐지되지 않으면 None)
+        """
+        return match_log_line(self.matcher, line, log_format)
     
-    def filter_attack_logs(self, log_content: str) -> List[str]:
+    def filter_attack_logs(self, log_content: Union[str, Iterable[str]]) -> List[str]:
         """
         로그 내용에서 공격 패턴이 포함된 로그만 필터링
         
         Args:
-            log_content (str): 웹 로그 내용
+            log_content (Union[str, Iterable[str]]): 웹 로그 내용 또는 로그 라인 스트림
             
         Returns:
             List[str]: 공격 패턴이 탐지된 로그 리스트
@@ -82,31 +124,166 @@ class WebAttackAnalyzer:
         attack_logs = []
         
         try:
-            # 로그를 줄 단위로 분할
-            lines = log_content.split('\n')
+            # 로그를 줄 단위로 순회 (전체 라인 리스트를 만들지 않음)
+            lines = iter_text_lines(log_content) if isinstance(log_content, str) else log_content
             
             for line in lines:
                 line = line.strip()
                 if not line:  # 빈 줄 건너뛰기
                     continue
                     
-                # 모든 패턴을 순차적으로 검사
-                for pattern in self.COMPILED_PATTERNS:
-                    if pattern.search(line):
-                        attack_logs.append(line)
-                        break  # 하나의 패턴이라도 매칭되면 추가하고 다음 라인으로
+                # 하나의 패턴이라도 매칭되면 추가하고 다음 라인으로
+                if self.match_attack(line) is not None:
+                    attack_logs.append(line)
         except Exception as e:
             print(f"로그 내용 처리 오류: {e}")
         
         return attack_logs
     
-    def analyze_attack_logs(self, attack_logs: List[str], max_logs_per_batch: int = 5) -> List[Dict[str, Any]]:
+    def iter_attack_masks(self, log_content: Union[str, Iterable[str]],
+                          log_format: str = "access") -> Iterator[Tuple[int, str]]:
+        """
+        로그 내용에서 매칭되는 모든 규칙을 비트마스크로 탐지하여 (규칙 비트마스크, 로그)를 탐지 순서대로 반환
+        
+        비트 i는 현재 규칙 팩의 i번째 규칙이며, 라벨은 rule_pack.mask_types로 변환합니다.
+        
+        Args:
+            log_content (Union[str, Iterable[str]]): 웹 로그 내용 또는 로그 라인 스트림
+            log_format (str): 로그 형식 ("access", "agent", "referer", "audit")
+            
+        Yields:
+            Tuple[int, str]: (규칙 비트마스크, 로그) (탐지된 로그만)
+        """
+        matcher = self.rule_pack.matcher(self.max_line_length)
+        lines = iter_text_lines(log_content) if isinstance(log_content, str) else log_content
+        if log_format == "audit":
+            yield from detect_audit_record_masks(matcher, lines)
+            return
+        
+        for line in lines:
+            if not line.strip():  # 빈 줄 건너뛰기
+                continue
+            mask, _ = match_log_record_mask(matcher, line, log_format)
+            if mask:
+                yield mask, line.strip()
+    
+    def iter_attack_logs(self, log_content: Union[str, Iterable[str]], log_format: str = "access",
+                         burst_detector: Optional[BurstDetector] = None,
+                         multi_label: bool = False) -> Iterator[Tuple[str, str]]:
+        """
+        로그 내용에서 공격 패턴을 탐지하여 (공격 유형, 로그)를 탐지 순서대로 반환 (결과를 메모리에 모으지 않음)
+        
+        audit_log 형식은 "====" 구분선 사이의 여러 줄을 레코드 하나로 조립하여 레코드 단위로 탐지합니다.
+        burst_detector가 주어지면 접근 로그 레코드를 IP별 시간 윈도우로 집계하여
+        요청/오류/고유 경로 수 임계값을 넘긴 요청도 해당 규칙 유형으로 분류합니다.
+        
+        Args:
+            log_content (Union[str, Iterable[str]]): 웹 로그 내용 또는 로그 라인 스트림
+            log_format (str): 로그 형식 ("access", "agent", "referer", "audit")
+            burst_detector (Optional[BurstDetector]): IP별 요청 빈도 탐지기 (None이면 사용 안 함)
+            multi_label (bool): 매칭되는 모든 규칙의 유형으로 반환 (False면 가장 먼저 매칭된 유형 하나)
+            
+        Yields:
+            Tuple[str, str]: (공격 유형, 로그) (multi_label이면 한 로그가 여러 유형으로 반환될 수 있음)
+        """
+        # 규칙 팩이 도중에 다시 로드되어도 이 분석은 시작할 때의 규칙으로 끝까지 진행
+        pack = self.rule_pack
+        matcher = pack.matcher(self.max_line_length)
+        lines = iter_text_lines(log_content) if isinstance(log_content, str) else log_content
+        if log_format == "audit":
+            if multi_label:
+                for mask, line in detect_audit_record_masks(matcher, lines):
+                    for attack_type in pack.mask_types(mask):
+                        yield attack_type, line
+                return
+            for index, line in detect_audit_records(matcher, lines):
+                yield pack.attack_type(index), line
+            return
+        
+        for line in lines:
+            if not line.strip():  # 빈 줄 건너뛰기
+                continue
+            
+            if multi_label:
+                # 일괄 사전 검사로 구한 후보 규칙을 모두 확인하여 매칭된 규칙 전체를 비트마스크로 구함
+                mask, record = match_log_record_mask(matcher, line, log_format)
+                for attack_type in pack.mask_types(mask):
+                    yield attack_type, line.strip()
+            else:
+                # 가장 먼저 매칭되는 패턴 인덱스 탐색 (사전 검사 후 순차 확인)
+                index, record = match_log_record(matcher, line, log_format)
+                if index is not None:
+                    yield pack.attack_type(index), line.strip()
+            
+            # IP별 시간 윈도우 임계값 검사 (파싱된 접근 로그 레코드만)
+            if burst_detector is not None and record is not None and log_format == "access":
+                for rule in burst_detector.observe(record):
+                    yield burst_detector.rule_type(rule), line.strip()
+    
+    def group_attack_logs(self, log_content: Union[str, Iterable[str]], log_format: str = "access",
+                          burst_detector: Optional[BurstDetector] = None,
+                          multi_label: bool = False) -> Dict[str, List[str]]:
+        """
+        로그 내용에서 공격 패턴을 탐지하여 공격 유형별로 분류 (iter_attack_logs 결과를 유형별로 모음)
+        
+        Args:
+            log_content (Union[str, Iterable[str]]): 웹 로그 내용 또는 로그 라인 스트림
+            log_format (str): 로그 형식 ("access", "agent", "referer", "audit")
+            burst_detector (Optional[BurstDetector]): IP별 요청 빈도 탐지기 (None이면 사용 안 함)
+            multi_label (bool): 매칭되는 모든 규칙의 유형에 로그 추가 (False면 가장 먼저 매칭된 유형에만)
+            
+        Returns:
+            Dict[str, List[str]]: 공격 유형별 로그 리스트
+        """
+        attack_logs_by_type = {}
+        for attack_type, line in self.iter_attack_logs(log_content, log_format, burst_detector, multi_label):
+            attack_logs_by_type.setdefault(attack_type, []).append(line)
+        return attack_logs_by_type
+    
+    def group_attack_logs_parallel(self, log_path: str, workers: Optional[int] = None,
+                                   multi_label: bool = False,
+                                   burst_config: Optional[Dict[str, float]] = None) -> Dict[str, List[str]]:
         """
-        필터링된 공격 로그를 GPT를 통해 분석
+        로그 파일을 여러 프로세스에서 병렬로 탐지하여 공격 유형별로 분류
+        
+        Args:
+            log_path (str): 접근 로그 파일 경로 (gzip 파일은 바이트 범위로 나눌 수 없어 압축을 풀며 순차 탐지)
+            workers (Optional[int]): 작업자 프로세스 수 (None이면 CPU 코어 수)
+            multi_label (bool): 매칭되는 모든 규칙의 유형에 로그 추가
+            burst_config (Optional[Dict[str, float]]): BurstDetector 생성 인자 (None이면 IP 빈도 탐지 안 함,
+                탐지기는 부모 프로세스에서 하나만 실행되어 순차 탐지와 같은 결과)
+            
+        Returns:
+            Dict[str, List[str]]: 공격 유형별 로그 리스트 (group_attack_logs와 동일한 결과)
+        """
+        if is_gzip_file(log_path):
+            # 압축 파일은 바이트 범위로 나눌 수 없으므로 압축을 풀며 순차 탐지
+            return self.group_attack_logs(iter_lines(log_path), burst_detector=BurstDetector.from_config(burst_config),
+                                          multi_label=multi_label)
+        pack = self.rule_pack
+        return detect_file_parallel(log_path, pack.patterns, pack.types, workers=workers, targets=pack.targets,
+                                    max_length=self.max_line_length, literals=pack.literals, multi_label=multi_label,
+                                    burst_config=burst_config)
+    
+    def analyze_attack_logs(self, attack_logs: List[str], max_logs_per_batch: Optional[int] = None,
+                            counts: Optional[List[int]] = None,
+                            on_result: Optional[Callable[[int, List[Dict[str, Any]]], None]] = None) -> List[Dict[str, Any]]:
+        """
+        필터링된 공격 로그를 GPT를 통해 분석 (배치를 동시에 요청하고 입력 순서대로 결과 반환)
+        
+        캐시가 설정된 경우 캐시에 있는 로그는 API를 호출하지 않고, 캐시에 없는 로그만 배치로 전송합니다.
+        배치는 입력/출력 토큰 예산을 채우는 만큼 로그를 담으며, 너무 긴 로그는 앞뒤만 남겨 전송합니다.
+        on_result가 주어지면 응답을 스트리밍으로 받아 분석 항목이 완성될 때마다 도착 순서대로
+        on_result(위치, 항목 리스트)를 호출합니다. 위치는 결과 묶음(캐시 적중 로그 또는 배치)의 첫 로그 인덱스이고,
+        항목 리스트는 그 묶음에서 지금까지 완성된 항목 전체이므로 같은 위치의 이전 항목을 교체하면 됩니다.
+        (재시도가 시작되면 빈 리스트, 배치가 끝나면 최종 결과로 다시 호출. 캐시 적중 결과는 즉시 전달하며,
+        콜백은 항상 이 메서드를 호출한 스레드에서 실행)
         
         Args:
             attack_logs (List[str]): 공격이 탐지된 로그 리스트
-            max_logs_per_batch (int): 한 번에 분석할 최대 로그 수
+            max_logs_per_batch (Optional[int]): 한 번에 분석할 최대 로그 수 (None이면 토큰 예산으로만 결정)
+            counts (Optional[List[int]]): 로그별 유사 로그 수 (클러스터 대표 로그인 경우 프롬프트에 표시)
+            on_result (Optional[Callable[[int, List[Dict[str, Any]]], None]]): 결과 묶음별 진행 콜백 (None이면 스트리밍 사용 안 함)
             
         Returns:
             List[Dict[str, Any]]: 분석 결과 리스트 (JSON 형식)
@@ -117,96 +294,198 @@ class WebAttackAnalyzer:
         if not attack_logs:
             return results
         
-        # 배치로 나누어 처리
-        for i in range(0, len(attack_logs), max_logs_per_batch):
-            batch_logs = attack_logs[i:i+max_logs_per_batch]
+        # 로그별 결과 슬롯 (입력 순서 유지)
+        slots = [None] * len(attack_logs)
+        
+        # 캐시 조회: 적중한 로그는 API 호출 생략, 같은 서명의 미적중 로그는 한 번만 전송
+        pending = {}  # 캐시 키(캐시 미사용 시 로그 인덱스) -> 해당 키를 가진 로그 인덱스 리스트
+        miss_logs = []
+        miss_counts = []
+        for i, log in enumerate(attack_logs):
+            key = self.cache.make_key(log, self.MODEL, self.prompt_hash) if self.cache is not None else i
+            if key in pending:
+                pending[key].append(i)
+                continue
             
-            prompt = self._create_analysis_prompt(batch_logs)
+            cached = self.cache.get(key) if self.cache is not None else None
+            if cached is not None:
+                slots[i] = [cached]
+                if on_result is not None:
+                    on_result(i, [cached])
+            else:
+                pending[key] = [i]
+                miss_logs.append(log)
+                miss_counts.append(counts[i] if counts else 1)
+        
+        miss_keys = list(pending)
+        
+        # 미적중 로그만 토큰 예산에 맞춰 배치로 나누어 처리 (출력 예산이 배치당 로그 수의 상한)
+        sent_logs = [truncate_log(log, self.max_log_tokens) for log in miss_logs]
+        log_tokens = [estimate_tokens(self._create_analysis_prompt([log], [count])) for log, count in zip(sent_logs, miss_counts)]
+        max_logs = self.output_token_budget // self.output_tokens_per_log
+        if max_logs_per_batch:
+            max_logs = min(max_logs, max_logs_per_batch)
+        batch_ranges = pack_batches(log_tokens, self.input_token_budget - self.system_tokens, max(1, max_logs))
+        batches = [sent_logs[start:end] for start, end in batch_ranges]
+        batch_counts = [miss_counts[start:end] for start, end in batch_ranges]
+        
+        if batches:
+            # 동시 요청 수를 제한하여 병렬 처리 (결과는 배치 순서대로 병합)
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(batches))) as executor:
+                if on_result is None:
+                    batch_outputs = list(executor.map(self._analyze_batch, batches, batch_counts))
+                else:
+                    # 작업자 스레드가 완성한 항목을 배치 첫 로그의 위치와 함께 큐로 받아 호출 스레드에서 콜백 실행
+                    arrived = queue.Queue()
+                    futures = []
+                    for (start, _), batch, batch_count in zip(batch_ranges, batches, batch_counts):
+                        position = pending[miss_keys[start]][0]
+                        emit = lambda items, position=position: arrived.put((position, items))
+                        futures.append(executor.submit(self._analyze_batch, batch, batch_count, emit))
+                    while True:
+                        try:
+                            on_result(*arrived.get(timeout=0.05))
+                        except queue.Empty:
+                            # 작업자는 항목을 모두 넣은 뒤 종료하므로 모두 끝났고 큐가 비었으면 완료
+                            if all(future.done() for future in futures):
+                                break
+                    batch_outputs = [future.result() for future in futures]
+                
+                for (start, end), batch_results in zip(batch_ranges, batch_outputs):
+                    batch_keys = miss_keys[start:end]
+                    
+                    # 로그 수와 분석 결과 수가 일치하면 로그별로 결과를 나누어 캐시에 저장
+                    aligned = len(batch_results) == len(batch_keys) and not any("error" in r for r in batch_results)
+                    if aligned:
+                        for key, result in zip(batch_keys, batch_results):
+                            for index in pending[key]:
+                                slots[index] = [result]
+                            if self.cache is not None:
+                                self.cache.put(key, result)
+                    else:
+                        # 대응 관계를 알 수 없으면 배치 결과 전체를 배치 첫 로그 위치에 배치
+                        slots[pending[batch_keys[0]][0]] = batch_results
+        
+        for slot in slots:
+            if slot:
+                results.extend(slot)
+        
+        return results
+    
+    def _is_retryable(self, error: Exception) -> bool:
+        """재시도 가능한 오류인지 확인 (429, 5xx, 연결/타임아웃 오류)"""
+        if isinstance(error, (APIConnectionError, APITimeoutError)):
+            return True
+        status_code = getattr(error, "status_code", None)
+        return status_code is not None and (status_code == 429 or status_code >= 500)
+    
+    def _retry_delay(self, error: Exception, attempt: int) -> float:
+        """재시도 대기 시간 계산 (Retry-After 헤더 우선, 없으면 지수 백오프 + 지터)"""
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None) or {}
+        try:
+            retry_after = float(headers.get("retry-after"))
+            if retry_after >= 0:
+                return retry_after
+        except (TypeError, ValueError):
+            pass
+        delay = self.retry_base_delay * (2 ** attempt)
+        return delay + random.uniform(0, delay / 2)
+    
+    def _analyze_batch(self, batch_logs: List[str], batch_counts: Optional[List[int]] = None,
+                       emit: Optional[Callable[[List[Dict[str, Any]]], None]] = None) -> List[Dict[str, Any]]:
+        """
+        로그 배치 하나를 GPT로 분석 (속도 제한 및 재시도 포함)
+        
+        Args:
+            batch_logs (List[str]): 분석할 로그 배치
+            batch_counts (Optional[List[int]]): 로그별 유사 로그 수
+            emit (Optional[Callable[[List[Dict[str, Any]]], None]]): 스트리밍 중 지금까지 완성된 항목 전체를 전달할 함수
+                (재시도 시작 시 빈 리스트, 종료 시 최종 결과로 다시 호출. None이면 스트리밍 사용 안 함)
             
+        Returns:
+            List[Dict[str, Any]]: 배치 분석 결과 리스트
+        """
+        prompt = self._create_analysis_prompt(batch_logs, batch_counts)
+        # 분당 토큰 제한에는 입력과 예상 출력 토큰을 함께 반영
+        estimated_tokens = (self.system_tokens + estimate_tokens(prompt) +
+                            min(self.output_token_budget, len(batch_logs) * self.output_tokens_per_log))
+        
+        streamed = []  # 현재 시도에서 전달한 항목 (재시도하면 새 응답의 항목으로 처음부터 교체)
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire(estimated_tokens)
             try:
                 response = self.client.chat.completions.create(
-                    model="gpt-4o-mini",  # 모델은 필요에 따라 변경 가능
+                    model=self.MODEL,
                     messages=[
-                        {"role": "system", "content": "당신은 보안 전문가로서 웹 로그에서 발견된 공격 패턴을 상세하게 분석하고 구체적인 대응 방안을 제공하는 역할을 합니다. 각 공격에 대해 즉각적인 대응 조치부터 장기적인 보안 강화 방안까지 상세히 설명해주세요. 코드 예시와 구성 파일 예시도 함께 제공하세요."},
+                        {"role": "system", "content": self.system_message},
                         {"role": "user", "content": prompt}
                     ],
                     response_format={"type": "json_object"},
-                    temperature=0.2  # 일관된 응답을 위해 낮은 temperature 사용
+                    max_tokens=self.output_token_budget,
+                    temperature=0.2,  # 일관된 응답을 위해 낮은 temperature 사용
+                    stream=emit is not None
                 )
                 
+                if emit is None:
+                    content = response.choices[0].message.content
+                else:
+                    # 스트리밍 응답: 분석 항목이 닫히는 즉시 전달
+                    parser = AnalysisStreamParser()
+                    for chunk in response:
+                        delta = chunk.choices[0].delta.content if chunk.choices else None
+                        if not delta:
+                            continue
+                        for item in parser.feed(delta):
+                            streamed.append(item)
+                            emit(list(streamed))
+                    content = parser.text
+                
                 # JSON 응답 파싱
-                analysis_result = json.loads(response.choices[0].message.content)
+                analysis_result = json.loads(content)
                 
                 if isinstance(analysis_result, dict) and "analyses" in analysis_result:
-                    results.extend(analysis_result["analyses"])
+                    results = list(analysis_result["analyses"])
                 else:
-                    results.append({"error": "응답 형식이 잘못되었습니다", "raw_response": analysis_result})
+                    results = [{"error": "응답 형식이 잘못되었습니다", "raw_response": analysis_result}]
                 
             except Exception as e:
+                if attempt < self.max_retries and self._is_retryable(e):
+                    delay = self._retry_delay(e, attempt)
+                    print(f"GPT API 호출 재시도 ({attempt + 1}/{self.max_retries}, {delay:.1f}초 후): {e}")
+                    # 실패한 시도에서 전달한 항목은 표시하지 않도록 비움
+                    if streamed:
+                        streamed = []
+                        emit([])
+                    time.sleep(delay)
+                    continue
                 print(f"GPT API 호출 오류: {e}")
-                results.append({"error": str(e), "logs": batch_logs})
-        
-        return results
+                results = [{"error": str(e), "logs": batch_logs}]
+            
+            # 스트리밍 중 전달한 항목이 최종 결과와 다르면(형식 오류, 실패 등) 최종 결과로 교체
+            if emit is not None and results != streamed:
+                emit(results)
+            return results
     
-    def _create_analysis_prompt(self, logs: List[str]) -> str:
+    def _create_analysis_prompt(self, logs: List[str], counts: Optional[List[int]] = None) -> str:
         """
-        GPT에 전송할 프롬프트 생성
+        GPT에 전송할 사용자 메시지 생성 (분석 지침은 시스템 메시지에 포함)
         
         Args:
             logs (List[str]): 분석할 로그 리스트
+            counts (Optional[List[int]]): 로그별 유사 로그 수 (2 이상이면 로그 뒤에 표시)
             
         Returns:
-            str: 완성된 프롬프트
+            str: 분석할 로그 목록
         """
-        prompt = """다음 웹 로그에서 발견된 보안 공격 패턴을 상세히 분석해주세요. 
-각 로그에 대해 다음 정보를 포함하는 JSON 형식으로 응답해주세요:
-
-1. payload_info: HTTP 요청 정보 요약 (공격 패턴이 무엇인지 명확히 표시)
-2. attack_type: 공격의 유형 (SQL 인젝션, XSS, 디렉토리 탐색 등)
-3. risk_level: "낮음", "중간", "높음" 중 하나
-4. mitigation: 이 공격을 방어하기 위한 간단한 권장 조치 요약
-5. attack_description: 공격 유형에 대한 상세 설명과 공격 목적, 원리, 영향 등
-6. risk_assessment: 위험도 평가 상세 설명 (취약점이 악용될 경우 어떤 위험이 있는지)
-7. immediate_actions: 즉시 취해야 할 비상 대응 조치 (3-5개 구체적인 단계 설명)
-8. technical_mitigation: 기술적 대응 방안 (웹 애플리케이션 수정, 보안 설정 등 구체적인 방법)
-9. mitigation_examples: 이 공격을 방어하기 위한 코드 예시나 명령어 (실제 구현에 도움되는 예시)
-10. security_config: 서버, WAF, 방화벽 등 보안 구성 예시 (구체적인 설정 방법)
-11. long_term_actions: 장기적인 보안 강화 방안 (정책, 프로세스, 모니터링 등)
-
-구체적인 예시와 함께 실제 시스템에 바로 적용할 수 있는 대응 방안을 제시해주세요.
-대응 방안은 예제 코드와 설정 코드를 포함하여 실무자가 바로 활용할 수 있도록 자세히 작성해주세요.
-
-응답은 다음 JSON 형식을 따라주세요:
-```
-{
-  "analyses": [
-    {
-      "payload_info": "HTTP 요청 정보",
-      "attack_type": "XSS",
-      "risk_level": "중간",
-      "mitigation": "해당 페이로드 차단",
-      "attack_description": "XSS란...",
-      "risk_assessment": "위험도는...",
-      "immediate_actions": "1. 해당 IP 차단, 2. 세션 종료, 3. 로그 분석...",
-      "technical_mitigation": "입력값 검증 및 이스케이핑 처리...",
-      "mitigation_examples": "# 입력 검증 예시 코드\ndef validate_input(input_str):\n    ...",
-      "security_config": "# WAF 규칙 예시\nSecRule REQUEST_COOKIES|REQUEST_COOKIES_NAMES|...",
-      "long_term_actions": "1. 보안 인식 교육 강화, 2. 정기적인 취약점 스캔..."
-    },
-    ...
-  ]
-}
-```
-
-분석할 로그:
-"""
-        
+        lines = ["분석할 로그:", ""]
         for i, log in enumerate(logs, 1):
-            prompt += f"\n{i}. {log}"
-        
-        return prompt
+            suffix = f" (동일 유형 페이로드 {counts[i - 1]}건)" if counts and counts[i - 1] > 1 else ""
+            lines.append(f"{i}. {log}{suffix}")
+        return "\n".join(lines)
     
-    def save_results(self, results: List[Dict[str, Any]], output_file_path: str) -> None:
+    @staticmethod
+    def save_results(results: List[Dict[str, Any]], output_file_path: str) -> None:
         """
         분석 결과를 JSON 파일로 저장
         
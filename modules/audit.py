@@ -0,0 +1,223 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from modules.parser import parse_access_line
+
+# 레코드 구분선 ("====...") 과 요청/응답 구분선 ("----...")
+_RECORD_SEPARATOR = "===="
+_SECTION_SEPARATOR = "----"
+
+# 레코드 하나에 보관할 최대 줄 수와 줄당 최대 길이 (비정상적으로 큰 레코드에서도 메모리 상한 유지)
+DEFAULT_MAX_RECORD_LINES = 256
+DEFAULT_MAX_LINE_LENGTH = 8192
+
+
+def is_record_separator(line: str) -> bool:
+    """audit_log 레코드 구분선 여부"""
+    return line.startswith(_RECORD_SEPARATOR)
+
+
+def last_record_start(data: bytes) -> int:
+    """
+    바이트 데이터에서 마지막 레코드 구분선 줄이 시작하는 위치 찾기
+
+    Args:
+        data (bytes): 줄 시작 위치에서 시작하는 audit_log 데이터
+
+    Returns:
+        int: 마지막 구분선 줄의 시작 위치 (없으면 -1)
+    """
+    separator = _RECORD_SEPARATOR.encode()
+    position = data.rfind(b"\n" + separator)
+    if position != -1:
+        return position + 1
+    return 0 if data.startswith(separator) else -1
+
+
+class AuditRecord:
+    """audit_log 레코드 하나 (Request 요약, 요청 라인, 요청 헤더/본문)"""
+
+    __slots__ = ("summary", "handler", "request_line", "headers", "body", "truncated")
+
+    def __init__(self):
+        self.summary = ""        # "Request:" 줄의 접근 로그 형식 요약
+        self.handler = ""
+        self.request_line = ""   # 원본 요청 라인 ("GET / HTTP/1.1")
+        self.headers: Dict[str, str] = {}  # 요청 헤더 (소문자 이름 -> 값)
+        self.body: List[str] = []          # 요청 본문 줄
+        self.truncated = False             # 줄 수/길이 제한으로 일부가 잘렸는지 여부
+
+    @property
+    def request(self) -> str:
+        """요청 라인 (원본 요청 라인이 없으면 요약 줄의 요청 부분)"""
+        if self.request_line:
+            return self.request_line
+        record = parse_access_line(self.summary)
+        return record.request if record is not None else ""
+
+    def fields(self) -> Dict[str, str]:
+        """
+        탐지 대상 필드 텍스트 (접근 로그 LogRecord.fields와 같은 필드명)
+
+        Returns:
+            Dict[str, str]: 필드명 -> 텍스트 ("request"는 요청 라인과 본문, "user_agent", "referer")
+        """
+        request = "\n".join([self.request] + self.body) if self.body else self.request
+        return {
+            "request": request,
+            "user_agent": self.headers.get("user-agent", ""),
+            "referer": self.headers.get("referer", ""),
+        }
+
+    def to_line(self) -> str:
+        """탐지 결과와 GPT 분석에 사용할 한 줄 표현 (요약 줄은 접근 로그 형식)"""
+        return self.summary or self.request
+
+    def __repr__(self) -> str:
+        return f"AuditRecord({self.to_line()!r})"
+
+
+class AuditRecordAssembler:
+    """줄을 하나씩 받아 "====" 구분선 기준으로 audit_log 레코드를 조립 (레코드 하나 분량의 메모리만 사용)"""
+
+    def __init__(self, max_lines: int = DEFAULT_MAX_RECORD_LINES, max_line_length: int = DEFAULT_MAX_LINE_LENGTH):
+        """
+        초기화 함수
+
+        Args:
+            max_lines (int): 레코드당 보관할 최대 줄 수 (초과분은 버리고 truncated 표시)
+            max_line_length (int): 줄당 보관할 최대 길이
+        """
+        self.max_lines = max_lines
+        self.max_line_length = max_line_length
+        self._record: Optional[AuditRecord] = None
+        self._section = "meta"  # meta -> request -> headers -> body -> response
+        self._kept = 0
+
+    def _take(self) -> Optional[AuditRecord]:
+        """조립 중인 레코드를 반환하고 초기화 (내용이 없는 레코드는 None)"""
+        record, self._record = self._record, None
+        if record is not None and (record.summary or record.request_line):
+            return record
+        return None
+
+    def feed(self, line: str) -> Optional[AuditRecord]:
+        """
+        한 줄 추가
+
+        Args:
+            line (str): audit_log 라인
+
+        Returns:
+            Optional[AuditRecord]: 구분선으로 완료된 이전 레코드 (없으면 None)
+        """
+        line = line.rstrip('\r\n')
+
+        if is_record_separator(line):
+            completed = self._take()
+            self._record = AuditRecord()
+            self._section = "meta"
+            self._kept = 0
+            return completed
+
+        record = self._record
+        if record is None:
+            # 첫 구분선 이전의 내용 (중간부터 읽기 시작한 경우)
+            record = self._record = AuditRecord()
+
+        if self._kept >= self.max_lines:
+            record.truncated = True
+            return None
+        if len(line) > self.max_line_length:
+            line = line[:self.max_line_length]
+            record.truncated = True
+        self._kept += 1
+
+        section = self._section
+        if section == "meta":
+            if line.startswith("Request: "):
+                record.summary = line[len("Request: "):]
+            elif line.startswith("Handler: "):
+                record.handler = line[len("Handler: "):]
+            elif line.startswith(_SECTION_SEPARATOR):
+                self._section = "request"
+        elif section == "request":
+            record.request_line = line
+            self._section = "headers"
+        elif section == "headers":
+            if not line:
+                self._section = "body"
+            else:
+                name, _, value = line.partition(':')
+                record.headers[name.strip().lower()] = value.strip()
+        elif section == "body":
+            if line.startswith("HTTP/"):
+                self._section = "response"  # 응답 부분은 탐지 대상이 아님
+            elif line:
+                record.body.append(line)
+        return None
+
+    def finish(self) -> Optional[AuditRecord]:
+        """입력이 끝났을 때 조립 중인 마지막 레코드 반환"""
+        return self._take()
+
+
+def iter_audit_records(lines: Iterable[str], max_lines: int = DEFAULT_MAX_RECORD_LINES,
+                       max_line_length: int = DEFAULT_MAX_LINE_LENGTH) -> Iterator[AuditRecord]:
+    """
+    audit_log 라인 스트림을 레코드 단위로 재조립
+
+    Args:
+        lines (Iterable[str]): 로그 라인 스트림
+        max_lines (int): 레코드당 보관할 최대 줄 수
+        max_line_length (int): 줄당 보관할 최대 길이
+
+    Yields:
+        AuditRecord: 조립된 레코드
+    """
+    assembler = AuditRecordAssembler(max_lines, max_line_length)
+    for line in lines:
+        record = assembler.feed(line)
+        if record is not None:
+            yield record
+    record = assembler.finish()
+    if record is not None:
+        yield record
+
+
+def match_audit_record(matcher, record: AuditRecord) -> Optional[int]:
+    """레코드의 대상 필드에 패턴 적용 (가장 먼저 매칭된 패턴 인덱스, 없으면 None)"""
+    return matcher.first_match_fields(record.fields())
+
+
+def detect_audit_records(matcher, lines: Iterable[str]) -> Iterator[Tuple[int, str]]:
+    """
+    audit_log 레코드 단위로 공격 패턴 탐지 (레코드당 최대 1건)
+
+    Args:
+        matcher (PatternMatcher): 대상 필드(targets)가 설정된 매칭 엔진
+        lines (Iterable[str]): audit_log 라인 스트림
+
+    Yields:
+        Tuple[int, str]: (패턴 인덱스, 레코드 한 줄 표현)
+    """
+    for record in iter_audit_records(lines):
+        index = match_audit_record(matcher, record)
+        if index is not None:
+            yield index, record.to_line()
+
+
+def detect_audit_record_masks(matcher, lines: Iterable[str]) -> Iterator[Tuple[int, str]]:
+    """
+    audit_log 레코드 단위로 매칭되는 모든 공격 패턴 탐지 (다중 라벨)
+
+    Args:
+        matcher (PatternMatcher): 대상 필드(targets)가 설정된 매칭 엔진
+        lines (Iterable[str]): audit_log 라인 스트림
+
+    Yields:
+        Tuple[int, str]: (매칭된 패턴 비트마스크, 레코드 한 줄 표현) (탐지된 레코드만)
+    """
+    for record in iter_audit_records(lines):
+        mask = matcher.match_mask_fields(record.fields())
+        if mask:
+            yield mask, record.to_line()
@@ -0,0 +1,577 @@
+"""
+탐지 엔진 성능 측정 스크립트
+
+사용법:
+    python -m modules.benchmark matcher
+    python -m modules.benchmark prefilter [로그 파일 경로]
+    python -m modules.benchmark ingest
+    python -m modules.benchmark parallel
+    python -m modules.benchmark cluster
+    python -m modules.benchmark startup
+    python -m modules.benchmark parser
+    python -m modules.benchmark columnar
+    python -m modules.benchmark follow
+    python -m modules.benchmark audit
+    python -m modules.benchmark burst
+    python -m modules.benchmark sketch
+    python -m modules.benchmark regex
+    python -m modules.benchmark multilabel
+    python -m modules.benchmark dedup [로그 파일 경로]
+"""
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from typing import List, Optional
+
+import numpy as np
+
+from modules.analyzer import WebAttackAnalyzer
+from modules.matcher import PatternMatcher, get_matcher
+from modules.ingest import iter_lines
+from modules.parallel import detect_file_parallel
+from modules.cluster import cluster_logs
+from modules.parser import LogRecord, parse_access_line, match_log_line, match_log_record_mask
+from modules.follow import LogFollower
+from modules.results import DetectionStore
+from modules.audit import detect_audit_records
+from modules.burst import BurstDetector
+from modules.regexprof import PatternProfiler, adversarial_inputs, fuzz_patterns
+from modules import json as attack_stats
+
+LOG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "logfile")
+
+
+def load_log_lines(log_dir: str = LOG_DIR) -> List[str]:
+    """
+    로그 디렉토리(또는 단일 파일)를 app.py와 동일한 방식으로 줄 단위 분할
+
+    Args:
+        log_dir (str): 로그 디렉토리 또는 파일 경로
+
+    Returns:
+        List[str]: 전체 로그 라인 리스트
+    """
+    if os.path.isfile(log_dir):
+        paths = [log_dir]
+    else:
+        paths = [os.path.join(log_dir, name) for name in sorted(os.listdir(log_dir))]
+
+    lines = []
+    for path in paths:
+        if os.path.isfile(path):
+            with open(path, 'rb') as file:
+                lines.extend(file.read().decode('utf-8', errors='ignore').split('\n'))
+    return lines
+
+
+def sequential_first_match(compiled_patterns, line: str) -> Optional[int]:
+    """기존 방식: 모든 패턴을 순서대로 검사하여 첫 번째 매칭 인덱스 반환"""
+    for i, pattern in enumerate(compiled_patterns):
+        if pattern.search(line):
+            return i
+    return None
+
+
+def _lines_per_sec(func, lines: List[str], repeat: int) -> float:
+    """주어진 매칭 함수의 초당 처리 라인 수 측정 (repeat회 중 최고 기록)"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for line in lines:
+            func(line)
+        best = min(best, time.perf_counter() - start)
+    return len(lines) / best
+
+
+def bench_matcher(repeat: int = 3) -> None:
+    """PatternMatcher와 기존 순차 검사의 처리량 비교 (결과 동등성은 tests/test_matcher.py에서 검사)"""
+    lines = load_log_lines()
+    matcher = PatternMatcher(WebAttackAnalyzer.ATTACK_PATTERNS)
+
+    before = _lines_per_sec(lambda line: sequential_first_match(matcher.compiled, line), lines, repeat)
+    after = _lines_per_sec(matcher.first_match, lines, repeat)
+    print(f"순차 검사:      {before:,.0f} lines/sec")
+    print(f"PatternMatcher: {after:,.0f} lines/sec ({after / before:.2f}x)")
+
+
+def bench_prefilter(path: str = os.path.join(LOG_DIR, "access_log.6")) -> None:
+    """필수 리터럴 사전 검사로 생략된 정규식 호출 수 보고"""
+    lines = load_log_lines(path)
+    matcher = PatternMatcher(WebAttackAnalyzer.ATTACK_PATTERNS)
+
+    for i, literals in enumerate(matcher.literals):
+        shown = ", ".join(sorted(repr(text) for text, _ in literals)) if literals else "(없음: 항상 검사)"
+        print(f"  패턴 {i:2d}: {shown}")
+
+    for line in lines:
+        matcher.first_match(line)
+    print(f"{os.path.basename(path)}: {matcher.skip_report()}")
+
+    before = _lines_per_sec(lambda line: sequential_first_match(matcher.compiled, line), lines, 3)
+    after = _lines_per_sec(matcher.first_match, lines, 3)
+    print(f"순차 검사:      {before:,.0f} lines/sec")
+    print(f"PatternMatcher: {after:,.0f} lines/sec ({after / before:.2f}x)")
+
+
+def _write_repeated_logs(path: str, size_mb: int) -> None:
+    """logfile/ 전체 내용을 반복하여 지정한 크기의 테스트 로그 파일 생성"""
+    content = "\n".join(load_log_lines()).encode('utf-8') + b"\n"
+    with open(path, 'wb') as file:
+        for _ in range(max(1, size_mb * 1024 * 1024 // len(content))):
+            file.write(content)
+
+
+def _peak_memory(func) -> float:
+    """함수 실행 중 Python 힙 최대 사용량(MB) 측정"""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    finally:
+        tracemalloc.stop()
+
+
+def bench_ingest(sizes=(4, 16, 32)) -> None:
+    """전체 디코딩 + split 방식과 스트리밍 수집 방식의 최대 메모리 비교"""
+    matcher = PatternMatcher(WebAttackAnalyzer.ATTACK_PATTERNS)
+
+    def detect(lines):
+        return sum(1 for line in lines if line.strip() and matcher.first_match(line) is not None)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "access_log")
+        for size_mb in sizes:
+            _write_repeated_logs(path, size_mb)
+
+            def whole_file():
+                with open(path, 'rb') as file:
+                    detect(file.read().decode('utf-8', errors='ignore').split('\n'))
+
+            def streaming():
+                detect(iter_lines(path))
+
+            print(f"{size_mb:3d}MB 입력: 전체 디코딩 {_peak_memory(whole_file):7.1f}MB, "
+                  f"스트리밍 {_peak_memory(streaming):5.1f}MB")
+
+
+def bench_parallel(workers_list=(1, 2, 4, 8), repeat: int = 20) -> None:
+    """logfile/access_log* 연결 파일에 대한 작업자 수별 병렬 탐지 처리량 측정 (결과 동등성은 tests/test_parallel.py에서 검사)"""
+    analyzer = WebAttackAnalyzer("benchmark")
+    names = sorted(name for name in os.listdir(LOG_DIR) if name.startswith("access_log"))
+    content = b"".join(open(os.path.join(LOG_DIR, name), 'rb').read().rstrip(b"\n") + b"\n" for name in names)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "access_log.all")
+        with open(path, 'wb') as file:
+            for _ in range(repeat):
+                file.write(content)
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+        print(f"입력: access_log* {len(names)}개 x {repeat}회 = {size_mb:.1f}MB (CPU {os.cpu_count()}개)")
+
+        start = time.perf_counter()
+        analyzer.group_attack_logs(iter_lines(path))
+        baseline = time.perf_counter() - start
+        print(f"단일 프로세스: {size_mb / baseline:6.2f} MB/s")
+
+        for workers in workers_list:
+            start = time.perf_counter()
+            detect_file_parallel(path, analyzer.ATTACK_PATTERNS, analyzer.ATTACK_TYPES,
+                                 workers=workers, range_size=1024 * 1024)
+            elapsed = time.perf_counter() - start
+            print(f"작업자 {workers}개:     {size_mb / elapsed:6.2f} MB/s ({baseline / elapsed:.2f}x)")
+
+
+def bench_cluster(sizes=(100000, 400000, 1000000)) -> None:
+    """탐지된 공격 로그의 페이로드 클러스터링 처리량과 클러스터 수 측정"""
+    analyzer = WebAttackAnalyzer("benchmark")
+    detected = analyzer.filter_attack_logs(load_log_lines())
+    print(f"logfile/ 탐지 로그 {len(detected):,}개 -> 템플릿 {len(cluster_logs(detected, similarity=None)):,}개, "
+          f"근사 중복 병합 후 클러스터 {len(cluster_logs(detected)):,}개")
+
+    for size in sizes:
+        logs = (detected * (size // len(detected) + 1))[:size]
+        start = time.perf_counter()
+        clusters = cluster_logs(logs)
+        elapsed = time.perf_counter() - start
+        print(f"{size:>9,}개 라인: {elapsed:6.2f}초 ({size / elapsed:,.0f} lines/sec), 클러스터 {len(clusters):,}개")
+
+
+def bench_startup(reruns: int = 20) -> None:
+    """분석기 생성 비용과 Streamlit 재실행 지연 시간 측정 (캐시 미사용 vs 프로세스 전역 캐시)"""
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+    def cold_analyzer():
+        # 기존 방식: 재실행마다 OpenAI 클라이언트 생성 + 16개 정규식 컴파일
+        re.purge()
+        analyzer = WebAttackAnalyzer(os.environ["OPENAI_API_KEY"])
+        PatternMatcher(analyzer.ATTACK_PATTERNS)
+
+    start = time.perf_counter()
+    for _ in range(reruns):
+        cold_analyzer()
+    cold = (time.perf_counter() - start) / reruns * 1000
+
+    get_matcher(WebAttackAnalyzer.ATTACK_PATTERNS)
+    start = time.perf_counter()
+    for _ in range(reruns):
+        get_matcher(WebAttackAnalyzer.ATTACK_PATTERNS)
+    cached = (time.perf_counter() - start) / reruns * 1000
+    print(f"분석기 생성: 매 재실행 {cold:.2f}ms, 공유 인스턴스 조회 {cached:.4f}ms")
+
+    try:
+        from streamlit.testing.v1 import AppTest
+    except ImportError:
+        print("streamlit이 설치되어 있지 않아 재실행 지연 측정을 생략합니다.")
+        return
+
+    app_path = os.path.join(os.path.dirname(LOG_DIR), "app.py")
+    app_test = AppTest.from_file(app_path, default_timeout=60)
+    start = time.perf_counter()
+    app_test.run()
+    first = (time.perf_counter() - start) * 1000
+
+    timings = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        app_test.run()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    print(f"app.py 최초 실행 {first:.1f}ms, 재실행 중앙값 {timings[len(timings) // 2]:.1f}ms "
+          f"(최소 {timings[0]:.1f}ms, 최대 {timings[-1]:.1f}ms)")
+
+
+def bench_parser(repeat: int = 3) -> None:
+    """접근 로그 파싱 속도, 레코드당 메모리, 필드 단위 탐지 처리량 측정"""
+    lines = [line for line in load_log_lines() if parse_access_line(line) is not None]
+    print(f"파싱 가능한 접근 로그 {len(lines):,}개")
+
+    rate = _lines_per_sec(parse_access_line, lines, repeat)
+    print(f"파싱 속도: {rate:,.0f} records/sec")
+
+    # 원본 라인을 새 문자열 객체로 보관할 때와 레코드로 보관할 때의 메모리 비교
+    tracemalloc.start()
+    raw = [line.encode('utf-8').decode('utf-8') for line in lines]
+    raw_size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    records = [parse_access_line(line) for line in lines]
+    record_size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"메모리: 원본 문자열 {raw_size / len(raw):.0f} bytes/line, 레코드 {record_size / len(records):.0f} bytes/record")
+
+    analyzer = WebAttackAnalyzer("benchmark")
+    matcher = analyzer.matcher
+    whole = _lines_per_sec(matcher.first_match, lines, repeat)
+    fields = _lines_per_sec(lambda line: match_log_line(matcher, line), lines, repeat)
+    print(f"탐지: 전체 라인 {whole:,.0f} lines/sec, 파싱 + 필드 단위 {fields:,.0f} lines/sec")
+
+
+def _synthetic_stat_logs(count: int):
+    """modules/json.py 통계 함수용 합성 로그 생성 (공격/정상 요청 혼합, IPv4/IPv6 혼합)"""
+    rng = random.Random(1)
+    requests = [pattern for patterns in attack_stats.ATTACK_PATTERNS.values() for pattern in patterns]
+    requests += ["GET / HTTP/1.1", "GET /index.html HTTP/1.1", "POST /login HTTP/1.1"]
+    return [{
+        "time": f"{rng.randrange(24):02d}:{rng.randrange(60):02d}:{rng.randrange(60):02d}",
+        "ip": f"10.{rng.randrange(4)}.{rng.randrange(256)}.{rng.randrange(256)}" if rng.random() < 0.95 else f"fe80::{rng.randrange(64):x}",
+        "url": f"/page{rng.randrange(500)}.php",
+        "request": rng.choice(requests),
+    } for _ in range(count)]
+
+
+def bench_columnar(check_rows: int = 200000, rows: int = 10000000) -> None:
+    """Counter 기반 집계와 NumPy 열 기반 집계의 처리 시간 비교 (결과 동등성은 tests/test_json.py에서 검사)"""
+    logs = _synthetic_stat_logs(check_rows)
+
+    # Counter 기반 (analyze_attack_logs의 집계 부분과 동일)
+    start = time.perf_counter()
+    attack_counts, time_distribution, source_ips, target_urls = Counter(), Counter(), Counter(), Counter()
+    for log in logs:
+        attack = attack_stats.classify_request(log["request"])
+        if attack is not None:
+            attack_counts[attack] += 1
+            time_distribution[log["time"][:2] + ":00-" + log["time"][:2] + ":59"] += 1
+            source_ips[log["ip"]] += 1
+            target_urls[log["url"]] += 1
+    attack_stats.build_result(attack_counts, time_distribution, source_ips, target_urls)
+    counter_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    columns = attack_stats.LogColumns.from_dicts(logs)
+    build_time = time.perf_counter() - start
+    start = time.perf_counter()
+    attack_stats.build_result(*attack_stats.aggregate_columns(columns))
+    columnar_time = time.perf_counter() - start
+
+    print(f"{check_rows:,}행: Counter {counter_time:.2f}초, "
+          f"열 변환 {build_time:.2f}초 + 열 집계 {columnar_time:.3f}초")
+
+    # 대용량: 이미 열로 저장된 레코드를 반복하여 집계 시간만 측정
+    repeat = rows // len(columns)
+    large = attack_stats.LogColumns()
+    large.urls, large.requests, large.extra_ips = columns.urls, columns.requests, columns.extra_ips
+    large.hours = np.tile(columns.hours, repeat)
+    large.ips = np.tile(columns.ips, repeat)
+    large.url_codes = np.tile(columns.url_codes, repeat)
+    large.request_codes = np.tile(columns.request_codes, repeat)
+    start = time.perf_counter()
+    attack_stats.build_result(*attack_stats.aggregate_columns(large))
+    print(f"{len(large):,}행 열 집계: {time.perf_counter() - start:.2f}초")
+
+
+def _ip_string(value: int) -> str:
+    """정수를 172.x.x.x 대역의 IPv4 문자열로 변환"""
+    return f"172.{value >> 16 & 255}.{value >> 8 & 255}.{value & 255}"
+
+
+def bench_sketch(rows: int = 1000000, distinct_ips: int = 500000, capacity: int = 1000, parts: int = 4) -> None:
+    """정확한 Counter 집계와 스케치 집계(파일별 부분 결과 병합)의 메모리 사용량 및 상위 항목 오차 비교"""
+    rng = random.Random(2)
+    requests = [pattern for patterns in attack_stats.ATTACK_PATTERNS.values() for pattern in patterns]
+    # 소수의 공격자/대상이 대부분을 차지하고 나머지는 고유 IP가 매우 많은 분포
+    logs = [{
+        "time": f"{rng.randrange(24):02d}:00:00",
+        "ip": f"10.0.0.{rng.randrange(20)}" if rng.random() < 0.3 else _ip_string(rng.randrange(distinct_ips)),
+        "url": f"/hot{rng.randrange(10)}.php" if rng.random() < 0.3 else f"/page{rng.randrange(200000)}.php",
+        "request": rng.choice(requests),
+    } for _ in range(rows)]
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    source_ips, target_urls = Counter(), Counter()
+    for log in logs:
+        if attack_stats.classify_request(log["request"]) is not None:
+            source_ips[log["ip"]] += 1
+            target_urls[log["url"]] += 1
+    exact_time = time.perf_counter() - start
+    exact_memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = (len(logs) + parts - 1) // parts
+    partials = []
+    for i in range(parts):
+        partial = attack_stats.SketchStats(capacity)
+        for log in logs[i * size:(i + 1) * size]:
+            partial.add(log)
+        partials.append(partial)
+    stats = partials[0]
+    for partial in partials[1:]:
+        stats = stats.merge(partial)
+    sketch_time = time.perf_counter() - start
+    sketch_memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    estimation = stats.estimation()
+    print(f"{rows:,}행, 고유 IP {len(source_ips):,}개 (추정 {estimation['distinct_source_ips']:,}개, "
+          f"±{estimation['distinct_source_ips_relative_error']:.2%}), 고유 URL {len(target_urls):,}개")
+    print(f"정확한 Counter: {exact_memory / (1024 * 1024):.1f}MB, {exact_time:.2f}초")
+    print(f"스케치 {parts}개 병합: {sketch_memory / (1024 * 1024):.2f}MB, {sketch_time:.2f}초")
+    for name, exact, sketch in (("IP", source_ips, stats.source_ips), ("URL", target_urls, stats.target_urls)):
+        errors = [exact[key] - count for key, count in sketch.most_common(5)]
+        top_match = [key for key, _ in sketch.most_common(5)] == [key for key, _ in exact.most_common(5)]
+        print(f"상위 5개 {name}: 순위 일치 {top_match}, 최대 과소 추정 {max(errors)} (보장 상한 {sketch.error_bound()})")
+
+
+def bench_follow(sizes=(4, 64), batch_lines: int = 100, polls: int = 20) -> None:
+    """추적 모드에서 기존 파일 크기와 무관하게 새로 추가된 줄만 처리하는지 폴링 지연 시간으로 확인"""
+    new_lines = ("\n".join(load_log_lines(os.path.join(LOG_DIR, "access_log.6"))[:batch_lines]) + "\n").encode('utf-8')
+    matcher = get_matcher(WebAttackAnalyzer.ATTACK_PATTERNS, WebAttackAnalyzer.ATTACK_TARGETS)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size_mb in sizes:
+            path = os.path.join(tmp_dir, "access_log")
+            _write_repeated_logs(path, size_mb)
+            follower = LogFollower([path], matcher, WebAttackAnalyzer.ATTACK_TYPES,
+                                   checkpoint_path=os.path.join(tmp_dir, "checkpoint.json"))
+
+            idle = []
+            busy = []
+            for _ in range(polls):
+                start = time.perf_counter()
+                follower.poll()
+                idle.append(time.perf_counter() - start)
+
+                with open(path, 'ab') as file:
+                    file.write(new_lines)
+                start = time.perf_counter()
+                follower.poll()
+                busy.append(time.perf_counter() - start)
+            follower.close()
+            os.remove(os.path.join(tmp_dir, "checkpoint.json"))
+
+            print(f"기존 {size_mb}MB 파일: 변경 없는 폴링 {sorted(idle)[polls // 2] * 1000:.2f}ms, "
+                  f"{batch_lines}줄 추가 후 폴링 {sorted(busy)[polls // 2] * 1000:.2f}ms (중앙값)")
+
+
+def bench_audit(path: str = os.path.join(LOG_DIR, "audit_log"), repeat: int = 200) -> None:
+    """audit_log를 줄 단위로 탐지할 때와 레코드 단위로 탐지할 때의 탐지 건수, GPT 전송 건수, 처리 시간 비교"""
+    lines = load_log_lines(path) * repeat
+    matcher = get_matcher(WebAttackAnalyzer.ATTACK_PATTERNS, WebAttackAnalyzer.ATTACK_TARGETS)
+
+    start = time.perf_counter()
+    by_line = [line.strip() for line in lines if line.strip() and match_log_line(matcher, line) is not None]
+    line_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    by_record = [line for _, line in detect_audit_records(matcher, lines)]
+    record_time = time.perf_counter() - start
+
+    for label, detected, elapsed in (("줄 단위", by_line, line_time), ("레코드 단위", by_record, record_time)):
+        print(f"{label}: 탐지 {len(detected) // repeat:,}건, 클러스터 {len(cluster_logs(detected)):,}개, "
+              f"{len(lines) / elapsed:,.0f}줄/초")
+
+    tracemalloc.start()
+    for _ in detect_audit_records(matcher, iter_lines(path)):
+        pass
+    print(f"레코드 단위 스트리밍 최대 메모리: {tracemalloc.get_traced_memory()[1] / 1024:.0f}KB")
+    tracemalloc.stop()
+
+
+def bench_burst(distinct_ips: int = 2000000, max_ips: int = 100000) -> None:
+    """IP별 빈도 탐지기의 처리량과 고유 IP 수가 상한을 넘을 때의 메모리 사용량 측정"""
+    records = list(iter_records_from_logs())
+    detector = BurstDetector()
+    start = time.perf_counter()
+    flagged = sum(len(detector.observe(record)) for record in records)
+    elapsed = time.perf_counter() - start
+    print(f"logfile/access_log*: {len(records):,}건, 규칙 위반 {flagged}건, {len(records) / elapsed:,.0f}건/초")
+
+    # 고유 IP가 매우 많은 경우: 상태 보관 IP 수가 max_ips로 제한되는지 확인
+    detector = BurstDetector(max_ips=max_ips)
+    record = LogRecord(path="/index.html", status=404)
+    tracemalloc.start()
+    start = time.perf_counter()
+    for i in range(distinct_ips):
+        record.ip = f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" if i < 1 << 24 else str(i)
+        record.timestamp = 1125000000 + i // 1000
+        detector.observe(record)
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"고유 IP {distinct_ips:,}개: 보관 IP {detector.tracked_ips():,}개, 제거 {detector.stats['evicted']:,}개, "
+          f"최대 메모리 {peak / (1024 * 1024):.1f}MB, {distinct_ips / elapsed:,.0f}건/초")
+
+
+def bench_regex(guard_length: int = 8192, attack_length: int = 32768) -> None:
+    """패턴별 역추적 퍼즈 측정, 실제 로그의 패턴별 검사 비용, 길이 제한(max_length)의 최악 검사 시간 제한 효과"""
+    patterns = WebAttackAnalyzer.ATTACK_PATTERNS
+    labels = WebAttackAnalyzer.ATTACK_TYPES
+    fuzzed = fuzz_patterns(patterns)
+    for i, result in enumerate(fuzzed):
+        growth = f"{result['growth']:.2f}" if result["growth"] is not None else "-"
+        warning = " ⚠️ 제곱 이상 증가" if result["growth"] is not None and result["growth"] >= 1.5 else ""
+        timings = ", ".join(f"{length:,}자 {seconds * 1000:.2f}ms"
+                            for length, seconds in zip(result["lengths"], result["seconds"]))
+        print(f"  [{i:2d}] {labels[i]}: {result['input']} - {timings}, 증가율 {growth}{warning}")
+
+    # 실제 로그의 패턴별 검사 비용
+    profiler = PatternProfiler(patterns, WebAttackAnalyzer.ATTACK_TARGETS)
+    for record_line in load_log_lines():
+        match_log_line(profiler, record_line)
+    print(profiler.profile_report(labels))
+
+    # 가장 느린 패턴의 최악 입력을 요청 라인에 넣은 접근 로그 한 줄: 길이 제한 유무에 따른 검사 시간
+    # (사전 검사를 통과하도록 패턴의 필수 리터럴 하나를 앞에 붙임)
+    worst = max(range(len(patterns)), key=lambda i: fuzzed[i]["seconds"][-1])
+    payload = dict(adversarial_inputs(patterns[worst], attack_length))[fuzzed[worst]["input"]]
+    required = sorted(text for text, _ in profiler.literals[worst] or [])
+    prefix = required[0] + " " if required else ""
+    line = f'10.0.0.1 - - [01/Jan/2024:00:00:00 +0000] "GET /?q={prefix}{payload} HTTP/1.1" 400 0'
+    for max_length in (None, guard_length):
+        matcher = PatternMatcher(patterns, WebAttackAnalyzer.ATTACK_TARGETS, max_length)
+        start = time.perf_counter()
+        match_log_line(matcher, line)
+        limit = f"{max_length:,}자" if max_length else "없음"
+        print(f"{len(line):,}자 공격 라인, 길이 제한 {limit}: {(time.perf_counter() - start) * 1000:,.1f}ms")
+
+
+def bench_multilabel(repeat: int = 3) -> None:
+    """다중 라벨 탐지(match_mask)와 가장 먼저 매칭된 패턴만 찾는 탐지의 처리량 비교 (결과 동등성은 tests/test_matcher.py에서 검사)"""
+    lines = load_log_lines()
+    # 판정 캐시 없이 일괄 사전 검사 자체의 처리량 비교 (반복 측정 시 캐시가 결과를 대신하지 않도록)
+    matcher = PatternMatcher(WebAttackAnalyzer.ATTACK_PATTERNS, WebAttackAnalyzer.ATTACK_TARGETS, memo_size=0)
+
+    multi = sum(1 for line in lines if bin(match_log_record_mask(matcher, line)[0]).count("1") > 1)
+    print(f"{len(lines):,}개 라인 중 여러 규칙에 매칭된 라인 {multi:,}개")
+
+    first = _lines_per_sec(lambda line: match_log_line(matcher, line), lines, repeat)
+    every = _lines_per_sec(lambda line: match_log_record_mask(matcher, line), lines, repeat)
+    print(f"가장 먼저 매칭된 규칙: {first:,.0f} lines/sec")
+    print(f"매칭된 모든 규칙:     {every:,.0f} lines/sec ({every / first:.2f}x)")
+
+
+def bench_dedup(path: str = os.path.join(LOG_DIR, "access_log.6"), repeat: int = 5, copies: int = 50) -> None:
+    """같은 요청의 판정 재사용(판정 캐시)과 탐지 로그 저장소의 페이로드 중복 제거 효과 측정"""
+    lines = [line for line in load_log_lines(path) if line.strip()]
+    patterns, targets = WebAttackAnalyzer.ATTACK_PATTERNS, WebAttackAnalyzer.ATTACK_TARGETS
+
+    # 판정 캐시 유무별 처리량 (반복마다 새 매칭 엔진으로 빈 캐시에서 시작)
+    for memo_size in (0, 4096):
+        best = float("inf")
+        for _ in range(repeat):
+            matcher = PatternMatcher(patterns, targets, memo_size=memo_size)
+            start = time.perf_counter()
+            for line in lines:
+                match_log_line(matcher, line)
+            best = min(best, time.perf_counter() - start)
+        label = f"판정 캐시 {memo_size:,}개" if memo_size else "판정 캐시 없음"
+        print(f"{label}: {len(lines) / best:,.0f} lines/sec, {matcher.skip_report()}")
+
+    # 탐지 로그 저장소: 원본 라인 크기 대비 파일 크기 (같은 탐지 로그를 copies번 반복 기록)
+    detected = list(WebAttackAnalyzer("benchmark").iter_attack_logs(lines)) * copies
+    with tempfile.TemporaryDirectory() as tmp:
+        store = DetectionStore(os.path.join(tmp, "detections.db"))
+        start = time.perf_counter()
+        store.write(detected)
+        elapsed = time.perf_counter() - start
+        payloads = store._conn.execute("SELECT COUNT(*) FROM payloads").fetchone()[0]
+        store.close()
+        size = os.path.getsize(store.path)
+    raw = sum(len(line.encode("utf-8")) for _, line in detected)
+    print(f"탐지 로그 {len(detected):,}건 (고유 페이로드 {payloads:,}개): 원본 {raw / 1024 / 1024:.1f}MB -> "
+          f"저장소 {size / 1024 / 1024:.1f}MB, 기록 {elapsed:.2f}초")
+
+
+def iter_records_from_logs():
+    """logfile/access_log* 파일의 접근 로그 레코드를 파일 순서대로 순회"""
+    for name in sorted(os.listdir(LOG_DIR)):
+        if name.startswith("access_log"):
+            for line in iter_lines(os.path.join(LOG_DIR, name)):
+                record = parse_access_line(line)
+                if record is not None:
+                    yield record
+
+
+BENCHMARKS = {
+    "matcher": bench_matcher,
+    "prefilter": bench_prefilter,
+    "ingest": bench_ingest,
+    "parallel": bench_parallel,
+    "cluster": bench_cluster,
+    "startup": bench_startup,
+    "parser": bench_parser,
+    "columnar": bench_columnar,
+    "follow": bench_follow,
+    "audit": bench_audit,
+    "burst": bench_burst,
+    "sketch": bench_sketch,
+    "regex": bench_regex,
+    "multilabel": bench_multilabel,
+    "dedup": bench_dedup,
+}
+
+
+if __name__ == "__main__":
+    name = sys.argv[1] if len(sys.argv) > 1 else None
+    for bench_name, bench in BENCHMARKS.items():
+        if name is None or name == bench_name:
+            print(f"== {bench_name} ==")
+            bench(*sys.argv[2:])
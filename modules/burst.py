@@ -0,0 +1,152 @@
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from modules.parser import LogRecord
+
+
+class _Ring:
+    """최근 값을 최대 capacity개까지만 보관하는 링 버퍼 (값이 적은 IP는 그만큼만 메모리 사용)"""
+
+    __slots__ = ("values", "head", "capacity")
+
+    def __init__(self, capacity: int):
+        self.values: List[int] = []
+        self.head = 0  # 가득 찬 뒤 다음에 덮어쓸 위치 (= 가장 오래된 값의 위치)
+        self.capacity = capacity
+
+    def push(self, value: int) -> Optional[int]:
+        """
+        값 추가
+
+        Returns:
+            Optional[int]: 버퍼가 가득 찬 경우 남아 있는 가장 오래된 값 (아니면 None)
+        """
+        values = self.values
+        if len(values) < self.capacity:
+            values.append(value)
+            return values[0] if len(values) == self.capacity else None
+        values[self.head] = value
+        self.head = (self.head + 1) % self.capacity
+        return values[self.head]
+
+
+class _IPWindow:
+    """IP 하나의 슬라이딩 윈도우 상태 (규칙별로 임계값 + 1개까지만 보관하는 링 버퍼)"""
+
+    __slots__ = ("requests", "errors", "paths", "flagged_until")
+
+    def __init__(self, max_requests: int):
+        self.requests = _Ring(max_requests + 1)           # 최근 요청 시각
+        self.errors: Optional[_Ring] = None               # 최근 4xx/5xx 응답 시각 (첫 오류 응답 시 생성)
+        self.paths: Dict[int, int] = {}                   # 경로 해시 -> 마지막 요청 시각 (오래된 순)
+        self.flagged_until: Optional[List[int]] = None    # 규칙별 재탐지 억제 종료 시각 (첫 위반 시 생성)
+
+
+class BurstDetector:
+    """IP별 요청 수, 오류 응답 수, 고유 경로 수를 시간 윈도우로 집계하여 임계값 초과 IP를 탐지"""
+
+    # 규칙 라벨 - observe가 반환하는 규칙 인덱스 순서와 일치
+    RULE_TYPES = [
+        "요청 폭주(IP별 요청 빈도 초과)",
+        "오류 응답 폭주(스캐닝/무차별 대입 의심)",
+        "경로 스캐닝(IP별 고유 경로 수 초과)",
+    ]
+
+    def __init__(self, window_seconds: float = 60.0, max_requests: int = 120, max_errors: int = 30,
+                 max_distinct_paths: int = 50, max_ips: int = 100000):
+        """
+        초기화 함수
+
+        Args:
+            window_seconds (float): 슬라이딩 윈도우 길이(초)
+            max_requests (int): 윈도우 내 IP별 최대 요청 수
+            max_errors (int): 윈도우 내 IP별 최대 4xx/5xx 응답 수
+            max_distinct_paths (int): 윈도우 내 IP별 최대 고유 경로 수
+            max_ips (int): 상태를 보관할 최대 IP 수 (초과 시 가장 오래 관찰되지 않은 IP부터 제거)
+        """
+        self.window_seconds = window_seconds
+        self.max_requests = max_requests
+        self.max_errors = max_errors
+        self.max_distinct_paths = max_distinct_paths
+        self.max_ips = max_ips
+        self.stats = {"records": 0, "flagged": 0, "evicted": 0}
+
+        self._windows: "OrderedDict[str, _IPWindow]" = OrderedDict()
+
+    def _flag(self, window: _IPWindow, rule: int, timestamp: int, flagged: List[int]) -> None:
+        """규칙 위반 기록 (같은 IP/규칙은 윈도우 길이 동안 한 번만 보고)"""
+        if window.flagged_until is None:
+            window.flagged_until = [0] * len(self.RULE_TYPES)
+        if timestamp >= window.flagged_until[rule]:
+            window.flagged_until[rule] = timestamp + self.window_seconds
+            flagged.append(rule)
+
+    def observe(self, record: LogRecord) -> List[int]:
+        """
+        접근 로그 레코드 하나를 반영하고 이번 요청으로 임계값을 넘은 규칙 반환
+
+        Args:
+            record (LogRecord): 파싱된 접근 로그 레코드 (timestamp는 UTC epoch 초)
+
+        Returns:
+            List[int]: RULE_TYPES 기준 규칙 인덱스 리스트 (없으면 빈 리스트)
+        """
+        self.stats["records"] += 1
+        if not record.ip or not record.timestamp:
+            return []
+
+        window = self._windows.get(record.ip)
+        if window is None:
+            window = self._windows[record.ip] = _IPWindow(self.max_requests)
+            if len(self._windows) > self.max_ips:
+                self._windows.popitem(last=False)
+                self.stats["evicted"] += 1
+        else:
+            self._windows.move_to_end(record.ip)
+
+        timestamp = record.timestamp
+        horizon = timestamp - self.window_seconds
+        flagged = []
+
+        # 링 버퍼가 가득 찼는데 가장 오래된 항목이 윈도우 안에 있으면 임계값 초과
+        oldest = window.requests.push(timestamp)
+        if oldest is not None and oldest > horizon:
+            self._flag(window, 0, timestamp, flagged)
+
+        if record.status >= 400:
+            if window.errors is None:
+                window.errors = _Ring(self.max_errors + 1)
+            oldest = window.errors.push(timestamp)
+            if oldest is not None and oldest > horizon:
+                self._flag(window, 1, timestamp, flagged)
+
+        # 고유 경로: 윈도우를 벗어난 경로를 제거한 뒤 개수 확인 (최대 max_distinct_paths + 1개 보관)
+        paths = window.paths
+        key = hash(record.path)
+        paths.pop(key, None)  # 다시 삽입하여 가장 최근 위치로 이동
+        paths[key] = timestamp
+        while paths:
+            oldest = next(iter(paths))
+            if paths[oldest] > horizon:
+                break
+            del paths[oldest]
+        if len(paths) > self.max_distinct_paths:
+            self._flag(window, 2, timestamp, flagged)
+            del paths[next(iter(paths))]
+
+        if flagged:
+            self.stats["flagged"] += len(flagged)
+        return flagged
+
+    def tracked_ips(self) -> int:
+        """현재 상태를 보관 중인 IP 수"""
+        return len(self._windows)
+
+    def rule_type(self, rule: int) -> str:
+        """규칙 인덱스에 해당하는 라벨 반환"""
+        return self.RULE_TYPES[rule]
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, float]]) -> Optional["BurstDetector"]:
+        """설정 딕셔너리로 생성 (None이면 탐지 비활성화)"""
+        return cls(**config) if config is not None else None
@@ -0,0 +1,138 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from modules.cluster import normalize_payload
+
+
+def log_signature(line: str) -> str:
+    """
+    캐시 키로 사용할 로그 서명 생성 (같은 페이로드 템플릿의 로그는 같은 서명)
+
+    Args:
+        line (str): 로그 라인
+
+    Returns:
+        str: 정규화된 로그 서명
+    """
+    return normalize_payload(line)
+
+
+class AnalysisCache:
+    """GPT 분석 결과를 로그 서명 기준으로 저장하는 SQLite 기반 디스크 캐시 (TTL + LRU 제거)"""
+
+    def __init__(self, path: str, ttl_seconds: Optional[float] = 7 * 24 * 3600, max_entries: int = 10000):
+        """
+        초기화 함수
+
+        Args:
+            path (str): SQLite 데이터베이스 파일 경로 (":memory:" 사용 가능)
+            ttl_seconds (Optional[float]): 항목 유효 기간(초, None이면 만료 없음)
+            max_entries (int): 최대 저장 항목 수 (초과 시 가장 오래 사용되지 않은 항목부터 제거)
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0}
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS analysis_cache ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_analysis_cache_accessed ON analysis_cache (accessed_at)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(log_line: str, model: str, prompt_hash: str) -> str:
+        """
+        로그 서명, 모델명, 프롬프트 템플릿 해시로 캐시 키 생성
+
+        Args:
+            log_line (str): 로그 라인
+            model (str): GPT 모델명
+            prompt_hash (str): 프롬프트 템플릿 해시
+
+        Returns:
+            str: SHA-256 캐시 키
+        """
+        raw = "\x00".join([log_signature(log_line), model, prompt_hash])
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        캐시 항목 조회 (만료된 항목은 삭제 후 None 반환)
+
+        Args:
+            key (str): 캐시 키
+
+        Returns:
+            Optional[Dict[str, Any]]: 캐시된 분석 결과
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM analysis_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+
+            value, created_at = row
+            if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM analysis_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                self.stats["expired"] += 1
+                self.stats["misses"] += 1
+                return None
+
+            self._conn.execute("UPDATE analysis_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.stats["hits"] += 1
+
+        return json.loads(value)
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        """
+        캐시 항목 저장 후 최대 항목 수를 넘으면 LRU 제거
+
+        Args:
+            key (str): 캐시 키
+            value (Dict[str, Any]): 분석 결과
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO analysis_cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now, now)
+            )
+
+            count = self._conn.execute("SELECT COUNT(*) FROM analysis_cache").fetchone()[0]
+            if count > self.max_entries:
+                removed = self._conn.execute(
+                    "DELETE FROM analysis_cache WHERE key IN ("
+                    " SELECT key FROM analysis_cache ORDER BY accessed_at ASC LIMIT ?)",
+                    (count - self.max_entries,)
+                ).rowcount
+                self.stats["evictions"] += removed
+
+            self._conn.commit()
+
+    def hit_rate(self) -> float:
+        """캐시 적중률 (0.0 ~ 1.0)"""
+        total = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / total if total else 0.0
+
+    def close(self) -> None:
+        """데이터베이스 연결 종료"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,192 @@
+import re
+import zlib
+from collections import Counter
+from typing import Iterable, List, Dict, Optional, FrozenSet, Tuple
+from urllib.parse import unquote_plus
+
+import numpy as np
+
+# Apache 로그의 요청 부분 ("GET /path HTTP/1.1")
+_REQUEST_PATTERN = re.compile(r'"([A-Z]+ [^"]*)"')
+
+# 요청 부분을 찾지 못한 경우 제거할 접두부 (IP, 식별자, 사용자, [타임스탬프])
+_PREFIX_PATTERN = re.compile(r'^\S+ \S+ \S+ \[[^\]]*\] ')
+
+# 요청 부분 뒤에 오는 상태 코드와 바이트 수
+_STATUS_BYTES_PATTERN = re.compile(r' \d{3} (\d+|-)')
+
+# IPv4 주소, 긴 16진수 값, 숫자 ID
+_IP_PATTERN = re.compile(r'\b\d{1,3}(\.\d{1,3}){3}\b')
+_HEX_PATTERN = re.compile(r'\b(0x)?[0-9a-fA-F]{8,}\b')
+_NUMBER_PATTERN = re.compile(r'\d+')
+
+# 템플릿 토큰 (자리표시자, 단어, 기호 한 글자)
+_TOKEN_PATTERN = re.compile(r'<[A-Z]+>|\w+|[^\w\s]')
+
+# 근사 중복으로 합칠 템플릿 간 최소 유사도 (토큰 바이그램 집합의 자카드 유사도)
+DEFAULT_SIMILARITY = 0.6
+
+# MinHash 서명 길이와 LSH 밴드당 행 수 (16개 밴드: 유사도 0.6인 쌍이 후보가 될 확률 약 98%, 0.3이면 35%)
+_NUM_HASHES = 48
+_BAND_ROWS = 3
+
+# 템플릿 하나당 유사도를 직접 비교할 최대 후보 클러스터 수와 버킷당 보관할 최대 클러스터 수
+# (공통 토큰으로 버킷이 붐벼도 전체 처리 시간을 템플릿 수에 선형으로 유지)
+_MAX_CANDIDATES = 4
+_MAX_BUCKET_SIZE = 8
+
+# MinHash 해시 함수 (a * x + b) mod p 의 계수 (실행마다 같은 결과가 나오도록 고정 시드)
+_MINHASH_PRIME = np.uint64((1 << 32) + 15)
+_MINHASH_A, _MINHASH_B = np.random.default_rng(7).integers(1, 1 << 31, size=(2, _NUM_HASHES, 1), dtype=np.uint64)
+
+# 서명의 연속된 _BAND_ROWS개 값을 bytes 키 하나로 보는 dtype
+_BAND_DTYPE = np.dtype((np.void, 8 * _BAND_ROWS))
+
+
+def normalize_payload(line: str) -> str:
+    """
+    로그 라인을 페이로드 템플릿으로 정규화
+
+    IP, 타임스탬프, 상태 코드, 바이트 수를 제거하고 요청을 URL 디코딩한 뒤
+    숫자 ID와 긴 16진수 값을 자리표시자로 치환합니다.
+
+    Args:
+        line (str): 로그 라인
+
+    Returns:
+        str: 정규화된 페이로드 템플릿
+    """
+    line = line.strip()
+    match = _REQUEST_PATTERN.search(line)
+    if match:
+        payload = match.group(1)
+    else:
+        payload = _STATUS_BYTES_PATTERN.sub('', _PREFIX_PATTERN.sub('', line))
+
+    payload = unquote_plus(payload, errors='replace')
+    payload = _IP_PATTERN.sub('<IP>', payload)
+    payload = _HEX_PATTERN.sub('<HEX>', payload)
+    return _NUMBER_PATTERN.sub('<N>', payload)
+
+
+class PayloadCluster:
+    """같은(또는 거의 같은) 페이로드 템플릿으로 정규화되는 로그 묶음"""
+
+    __slots__ = ("template", "representative", "size", "variants")
+
+    def __init__(self, template: str, representative: str):
+        self.template = template              # 클러스터에서 가장 많이 관찰된 템플릿
+        self.representative = representative  # 그 템플릿으로 처음 관찰된 원본 로그
+        self.size = 0
+        self.variants = 1                     # 합쳐진 서로 다른 템플릿 수
+
+    def to_dict(self) -> Dict[str, object]:
+        """JSON 직렬화용 딕셔너리 변환"""
+        return {"template": self.template, "representative": self.representative,
+                "size": self.size, "variants": self.variants}
+
+
+def template_shingles(template: str) -> FrozenSet[str]:
+    """
+    템플릿의 토큰 바이그램 집합 (토큰이 하나뿐이면 그 토큰)
+
+    Args:
+        template (str): 정규화된 페이로드 템플릿
+
+    Returns:
+        FrozenSet[str]: 인접한 두 토큰을 이어 붙인 문자열 집합
+    """
+    tokens = _TOKEN_PATTERN.findall(template)
+    if len(tokens) < 2:
+        return frozenset(tokens)
+    return frozenset(f"{first}\x00{second}" for first, second in zip(tokens, tokens[1:]))
+
+
+def _band_keys(shingles: FrozenSet[str]) -> List[bytes]:
+    """MinHash 서명을 _BAND_ROWS개씩 나눈 밴드별 LSH 버킷 키"""
+    hashes = np.fromiter((zlib.crc32(shingle.encode("utf-8", "surrogatepass")) for shingle in shingles),
+                         dtype=np.uint64, count=len(shingles))
+    signature = ((_MINHASH_A * hashes + _MINHASH_B) % _MINHASH_PRIME).min(axis=1)
+    return signature.view(_BAND_DTYPE).tolist()
+
+
+def merge_similar_clusters(clusters: List[PayloadCluster],
+                           similarity: float = DEFAULT_SIMILARITY) -> List[PayloadCluster]:
+    """
+    토큰 하나 정도만 다른 근사 중복 템플릿의 클러스터를 합침 (MinHash + LSH)
+
+    큰 클러스터부터 LSH 버킷이 겹치는 기존 클러스터의 대표 템플릿과 자카드 유사도를 직접 비교해
+    similarity 이상이면 그 클러스터에 합치고, 아니면 새 클러스터로 버킷에 등록합니다.
+    템플릿당 비교 횟수가 _MAX_CANDIDATES로 제한되므로 템플릿 수에 선형입니다.
+
+    Args:
+        clusters (List[PayloadCluster]): 크기 내림차순 템플릿 클러스터 리스트
+        similarity (float): 합칠 최소 자카드 유사도 (0~1)
+
+    Returns:
+        List[PayloadCluster]: 합쳐진 클러스터 리스트 (크기 내림차순, 크기가 같으면 입력 순서)
+    """
+    merged: List[PayloadCluster] = []
+    leader_shingles: List[FrozenSet[str]] = []
+    buckets: List[Dict[bytes, Tuple[int, ...]]] = [{} for _ in range(_NUM_HASHES // _BAND_ROWS)]
+
+    for cluster in clusters:
+        shingles = template_shingles(cluster.template)
+        keys = _band_keys(shingles) if shingles else []
+        # 겹치는 밴드가 많은 후보일수록 유사도가 높으므로 그 순서로 직접 비교
+        candidates = [index for band, key in zip(buckets, keys) for index in band.get(key, ())]
+        if len(candidates) > _MAX_CANDIDATES:
+            hits = Counter(candidates)
+            candidates = sorted(hits, key=hits.__getitem__, reverse=True)[:_MAX_CANDIDATES]
+        target = None
+        for index in dict.fromkeys(candidates):
+            other = leader_shingles[index]
+            if len(shingles & other) >= similarity * len(shingles | other):
+                target = index
+                break
+
+        if target is None:
+            for band, key in zip(buckets, keys):
+                # 정수 튜플은 순환 GC 추적 대상이 아니므로 버킷이 많아도 GC 비용이 늘지 않음
+                bucket = band.get(key, ())
+                if len(bucket) < _MAX_BUCKET_SIZE:
+                    band[key] = bucket + (len(merged),)
+            merged.append(cluster)
+            leader_shingles.append(shingles)
+        else:
+            leader = merged[target]
+            leader.size += cluster.size
+            leader.variants += cluster.variants
+
+    return sorted(merged, key=lambda cluster: cluster.size, reverse=True)
+
+
+def cluster_logs(logs: Iterable[str], max_clusters: Optional[int] = None,
+                 similarity: Optional[float] = DEFAULT_SIMILARITY) -> List[PayloadCluster]:
+    """
+    로그를 페이로드 템플릿 기준으로 묶음 (입력 크기에 선형, 클러스터별 대표 로그 1개만 보관)
+
+    정규화된 템플릿이 정확히 같은 로그를 먼저 묶은 뒤, 인용 값이나 함수 인자처럼
+    토큰 일부만 다른 템플릿을 merge_similar_clusters로 한 클러스터로 합칩니다.
+
+    Args:
+        logs (Iterable[str]): 로그 라인 스트림
+        max_clusters (Optional[int]): 반환할 최대 클러스터 수 (None이면 전체)
+        similarity (Optional[float]): 근사 중복으로 합칠 최소 유사도 (None이면 템플릿이 같은 로그만 묶음)
+
+    Returns:
+        List[PayloadCluster]: 크기 내림차순 클러스터 리스트 (크기가 같으면 처음 관찰된 순서)
+    """
+    clusters = {}
+    for line in logs:
+        template = normalize_payload(line)
+        cluster = clusters.get(template)
+        if cluster is None:
+            cluster = clusters[template] = PayloadCluster(template, line.strip())
+        cluster.size += 1
+
+    # sorted는 안정 정렬이므로 같은 크기에서는 처음 관찰된 순서 유지
+    ordered = sorted(clusters.values(), key=lambda cluster: cluster.size, reverse=True)
+    if similarity is not None:
+        ordered = merge_similar_clusters(ordered, similarity)
+    return ordered[:max_clusters] if max_clusters is not None else ordered
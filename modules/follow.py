@@ -0,0 +1,347 @@
+import json
+import os
+import time
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple
+
+from modules.audit import AuditRecordAssembler, last_record_start, match_audit_record
+from modules.burst import BurstDetector
+from modules.matcher import PatternMatcher
+from modules.parser import detect_log_format, match_log_record
+from modules.rules import RuleRegistry
+
+
+class CheckpointStore:
+    """파일별 (inode, 바이트 오프셋) 체크포인트를 JSON 파일에 저장 (재시작 시 이어서 읽기)"""
+
+    def __init__(self, path: Optional[str]):
+        """
+        초기화 함수
+
+        Args:
+            path (Optional[str]): 체크포인트 JSON 파일 경로 (None이면 메모리에만 보관)
+        """
+        self.path = path
+        self.offsets: Dict[str, Dict[str, int]] = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as file:
+                    self.offsets = json.load(file)
+            except (OSError, ValueError) as e:
+                print(f"체크포인트 로드 오류: {e}")
+
+    def get(self, log_path: str) -> Optional[Tuple[int, int]]:
+        """저장된 (inode, 오프셋) 조회"""
+        entry = self.offsets.get(os.path.abspath(log_path))
+        return (entry["inode"], entry["offset"]) if entry else None
+
+    def set(self, log_path: str, inode: int, offset: int) -> None:
+        """(inode, 오프셋) 갱신 (save 호출 전까지 디스크에 기록하지 않음)"""
+        self.offsets[os.path.abspath(log_path)] = {"inode": inode, "offset": offset}
+
+    def save(self) -> None:
+        """임시 파일에 쓴 뒤 교체하여 중간에 종료되어도 체크포인트가 깨지지 않도록 저장"""
+        if not self.path:
+            return
+        temp_path = self.path + ".tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as file:
+                json.dump(self.offsets, file, indent=2)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"체크포인트 저장 오류: {e}")
+
+
+class FileFollower:
+    """로그 파일 하나를 tail -F처럼 추적 (logrotate로 파일이 교체되거나 잘려도 이어서 읽음)"""
+
+    def __init__(self, path: str, checkpoints: CheckpointStore, from_start: bool = False,
+                 read_size: int = 1024 * 1024):
+        """
+        초기화 함수
+
+        Args:
+            path (str): 추적할 로그 파일 경로
+            checkpoints (CheckpointStore): 체크포인트 저장소
+            from_start (bool): 체크포인트가 없을 때 파일 처음부터 읽을지 여부 (기본값은 파일 끝부터)
+            read_size (int): 한 번에 읽을 최대 바이트 수
+        """
+        self.path = path
+        self.log_format = detect_log_format(path)
+        self.checkpoints = checkpoints
+        self.read_size = read_size
+
+        self._file: Optional[BinaryIO] = None
+        self._inode = 0
+        self._offset = 0       # 완전한 줄까지 처리한 바이트 오프셋
+        self._pending = b""    # 아직 개행 문자가 오지 않은 마지막 줄 조각
+        # audit_log는 조립 중인 레코드의 구분선 위치까지만 체크포인트에 저장 (재시작 시 레코드를 처음부터 다시 조립)
+        self._record_start: Optional[int] = 0 if self.log_format == "audit" else None
+        self._rotated: Optional[BinaryIO] = None  # 재시작 전에 교체된 이전 파일 (남은 부분을 먼저 읽음)
+
+        self._open(from_start)
+
+    def _open(self, from_start: bool, resume: bool = True) -> None:
+        """체크포인트를 기준으로 파일을 열고 읽기 위치 결정 (resume=False면 체크포인트 무시)"""
+        try:
+            self._file = open(self.path, 'rb')
+        except OSError:
+            self._file = None
+            return
+
+        stat = os.fstat(self._file.fileno())
+        self._inode = stat.st_ino
+        saved = self.checkpoints.get(self.path) if resume else None
+
+        if saved is not None and saved[0] == self._inode and saved[1] <= stat.st_size:
+            self._offset = saved[1]
+        elif saved is not None and saved[0] != self._inode:
+            # 중단된 동안 파일이 교체됨: 같은 inode의 이전 파일(access_log.1 등)이 남아 있으면 나머지를 먼저 읽음
+            self._rotated = self._find_rotated(saved[0], saved[1])
+            self._offset = 0
+        else:
+            self._offset = 0 if from_start or saved is not None else stat.st_size
+
+        self._file.seek(self._offset)
+        if self._record_start is not None:
+            self._record_start = self._offset
+        self.checkpoints.set(self.path, self._inode, self._offset)
+
+    def _find_rotated(self, inode: int, offset: int) -> Optional[BinaryIO]:
+        """같은 디렉토리에서 지정한 inode를 가진 교체된 파일을 찾아 오프셋 위치로 열기"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        prefix = os.path.basename(self.path)
+        for name in os.listdir(directory):
+            candidate = os.path.join(directory, name)
+            if not name.startswith(prefix) or candidate == os.path.abspath(self.path):
+                continue
+            try:
+                if os.stat(candidate).st_ino == inode:
+                    file = open(candidate, 'rb')
+                    file.seek(offset)
+                    return file
+            except OSError:
+                continue
+        return None
+
+    def _drain(self, file: BinaryIO) -> bytes:
+        """파일의 현재 위치부터 끝까지 읽기 (최대 read_size 단위)"""
+        parts = []
+        while True:
+            chunk = file.read(self.read_size)
+            if not chunk:
+                return b"".join(parts)
+            parts.append(chunk)
+
+    def _split(self, data: bytes, base: Optional[int] = None) -> List[str]:
+        """
+        읽은 바이트를 완전한 줄 단위로 나누고 마지막 줄 조각은 다음 읽기까지 보관
+
+        Args:
+            data (bytes): 새로 읽은 바이트
+            base (Optional[int]): 현재 파일에서 data가 시작하는 오프셋 (주어지면 audit_log 레코드 시작 위치 갱신)
+        """
+        data = self._pending + data
+        end = data.rfind(b"\n")
+        if end == -1:
+            self._pending = data
+            return []
+        if base is not None and self._record_start is not None:
+            start = last_record_start(data[:end])
+            if start != -1:
+                self._record_start = base - len(self._pending) + start
+        self._pending = data[end + 1:]
+        # 개행 문자 경계에서 나누므로 UTF-8 멀티바이트 문자가 잘리지 않음
+        return data[:end].decode('utf-8', errors='ignore').split('\n')
+
+    def _read_current(self) -> List[str]:
+        """현재 파일에서 새로 추가된 완전한 줄 읽기"""
+        base = self._file.tell()
+        return self._split(self._drain(self._file), base)
+
+    def _flush_pending(self) -> List[str]:
+        """교체된 파일의 개행 없는 마지막 줄 반환 (이후 내용이 더 추가되지 않으므로)"""
+        pending, self._pending = self._pending, b""
+        return [pending.decode('utf-8', errors='ignore')] if pending else []
+
+    def read_new_lines(self) -> List[str]:
+        """
+        마지막 읽기 이후 추가된 완전한 줄 읽기 (파일 교체/잘림 감지 포함)
+
+        Returns:
+            List[str]: 새로 추가된 로그 라인 리스트
+        """
+        lines = []
+
+        if self._rotated is not None:
+            lines.extend(self._split(self._drain(self._rotated)))
+            lines.extend(self._flush_pending())
+            self._rotated.close()
+            self._rotated = None
+
+        if self._file is None:
+            self._open(from_start=True)
+            if self._file is None:
+                return lines
+
+        lines.extend(self._read_current())
+
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            stat = None  # 교체 직후 새 파일이 아직 생성되지 않음
+
+        if stat is not None and stat.st_ino != self._inode:
+            # logrotate로 파일이 교체됨: 이전 파일을 끝까지 읽은 뒤 새 파일을 처음부터 읽음
+            lines.extend(self._split(self._drain(self._file)))
+            lines.extend(self._flush_pending())
+            self._file.close()
+            self._open(from_start=True, resume=False)
+            if self._file is not None:
+                lines.extend(self._read_current())
+        elif stat is not None and stat.st_size < self._file.tell():
+            # copytruncate 방식으로 파일이 잘림: 처음부터 다시 읽음
+            self._file.seek(0)
+            self._pending = b""
+            if self._record_start is not None:
+                self._record_start = 0
+            lines.extend(self._read_current())
+
+        if self._file is not None:
+            self._offset = self._file.tell() - len(self._pending)
+            self.checkpoints.set(self.path, self._inode, self.checkpoint_offset)
+        return lines
+
+    @property
+    def checkpoint_offset(self) -> int:
+        """체크포인트에 저장할 오프셋 (audit_log는 조립 중인 레코드의 시작 위치, 그 외는 완전한 줄까지)"""
+        if self._record_start is not None:
+            return min(self._record_start, self._offset)
+        return self._offset
+
+    def close(self) -> None:
+        """열린 파일 닫기"""
+        for file in (self._file, self._rotated):
+            if file is not None:
+                file.close()
+        self._file = self._rotated = None
+
+
+class LogFollower:
+    """여러 로그 파일을 추적하며 새로 추가된 줄에서만 공격 패턴을 탐지"""
+
+    def __init__(self, paths: List[str], matcher: PatternMatcher, attack_types: List[str],
+                 checkpoint_path: Optional[str] = None, from_start: bool = False,
+                 burst_detector: Optional[BurstDetector] = None, rules: Optional[RuleRegistry] = None):
+        """
+        초기화 함수
+
+        Args:
+            paths (List[str]): 추적할 로그 파일 경로 목록 (access_log, error_log, audit_log 등)
+            matcher (PatternMatcher): 공격 패턴 매칭 엔진
+            attack_types (List[str]): 패턴 인덱스에 대응하는 공격 유형 라벨 (빈도 규칙 라벨은 그 뒤에 이어서 조회)
+            checkpoint_path (Optional[str]): 체크포인트 JSON 파일 경로 (None이면 저장하지 않음)
+            from_start (bool): 체크포인트가 없는 파일을 처음부터 읽을지 여부
+            burst_detector (Optional[BurstDetector]): 접근 로그의 IP별 요청 빈도 탐지기 (None이면 사용 안 함)
+            rules (Optional[RuleRegistry]): 규칙 팩 레지스트리 (주어지면 파일이 바뀔 때 폴링 사이에 매칭 엔진과 라벨 교체)
+        """
+        self.matcher = matcher
+        self.rules = rules
+        self._pack = None  # 현재 매칭 엔진을 만든 규칙 팩 (rules가 있으면 첫 폴링에서 설정)
+        self.burst_detector = burst_detector
+        self.attack_types = attack_types
+        self.checkpoints = CheckpointStore(checkpoint_path)
+        self.followers = [FileFollower(path, self.checkpoints, from_start) for path in paths]
+        self.checkpoints.save()
+
+        # audit_log는 다음 "====" 구분선이 도착해야 레코드가 완성되므로 폴링 사이에 조립 상태 유지
+        self.assemblers = {follower.path: AuditRecordAssembler()
+                           for follower in self.followers if follower.log_format == "audit"}
+
+    def _detect_lines(self, follower: FileFollower, lines: List[str]) -> List[Tuple[int, str]]:
+        """새로 읽은 줄에서 탐지 (audit_log는 완성된 레코드 단위)"""
+        detected = []
+        assembler = self.assemblers.get(follower.path)
+        for line in lines:
+            if assembler is not None:
+                record = assembler.feed(line)
+                index = match_audit_record(self.matcher, record) if record is not None else None
+                if index is not None:
+                    detected.append((index, record.to_line()))
+                continue
+            if not line.strip():
+                continue
+            index, record = match_log_record(self.matcher, line, follower.log_format)
+            if index is not None:
+                detected.append((index, line.strip()))
+            if self.burst_detector is not None and record is not None and follower.log_format == "access":
+                # 빈도 규칙은 패턴 인덱스 뒤에 위치
+                for rule in self.burst_detector.observe(record):
+                    detected.append((len(self.matcher.patterns) + rule, line.strip()))
+        return detected
+
+    def _attack_type(self, index: int) -> str:
+        """패턴 인덱스(빈도 규칙은 패턴 수 + 규칙 인덱스)에 해당하는 라벨 반환"""
+        if index < len(self.attack_types):
+            return self.attack_types[index]
+        rule = index - len(self.matcher.patterns)
+        if self.burst_detector is not None and 0 <= rule < len(self.burst_detector.RULE_TYPES):
+            return self.burst_detector.rule_type(rule)
+        return f"Unknown_{index}"
+
+    def poll(self) -> Dict[str, List[str]]:
+        """
+        모든 파일에서 새로 추가된 줄을 읽어 탐지하고 체크포인트 저장
+
+        Returns:
+            Dict[str, List[str]]: 이번 폴링에서 새로 탐지된 공격 유형별 로그 리스트
+        """
+        attack_logs_by_type = {}
+        changed = False
+
+        if self.rules is not None:
+            pack = self.rules.current()
+            if pack is not self._pack:
+                # 폴링 사이에만 교체하므로 한 번의 폴링은 같은 규칙으로 탐지
+                self._pack = pack
+                self.matcher = pack.matcher(self.matcher.max_length)
+                self.attack_types = pack.types
+
+        for follower in self.followers:
+            lines = follower.read_new_lines()
+            changed = changed or bool(lines)
+            for index, line in self._detect_lines(follower, lines):
+                attack_type = self._attack_type(index)
+                attack_logs_by_type.setdefault(attack_type, []).append(line)
+
+        if changed:
+            self.checkpoints.save()
+        return attack_logs_by_type
+
+    def run(self, on_detect: Callable[[Dict[str, List[str]]], Any], interval: float = 1.0,
+            should_stop: Optional[Callable[[], bool]] = None,
+            on_poll: Optional[Callable[[], Any]] = None) -> None:
+        """
+        일정 간격으로 폴링하며 새로 탐지된 로그를 콜백으로 전달 (중단될 때까지 반복)
+
+        Args:
+            on_detect (Callable): 새 탐지 결과(공격 유형별 로그 리스트)를 받는 콜백
+            interval (float): 폴링 간격(초)
+            should_stop (Optional[Callable[[], bool]]): True를 반환하면 종료 (매 폴링 전에 확인)
+            on_poll (Optional[Callable[[], Any]]): 탐지 여부와 관계없이 매 폴링 후 호출되는 콜백 (주기적인 작업용)
+        """
+        try:
+            while should_stop is None or not should_stop():
+                detected = self.poll()
+                if detected:
+                    on_detect(detected)
+                if on_poll is not None:
+                    on_poll()
+                time.sleep(interval)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """모든 파일을 닫고 체크포인트 저장"""
+        for follower in self.followers:
+            follower.close()
+        self.checkpoints.save()
@@ -0,0 +1,104 @@
+import codecs
+import gzip
+import os
+from typing import Iterable, Iterator, Union, BinaryIO
+
+# 한 번에 읽어 디코딩할 바이트 수
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+# gzip 파일 시그니처
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+def iter_text_lines(text: str) -> Iterator[str]:
+    """
+    문자열을 줄 단위로 순회 (split('\\n')과 동일한 결과, 전체 리스트를 만들지 않음)
+
+    Args:
+        text (str): 로그 문자열
+
+    Yields:
+        str: 개행 문자를 제외한 로그 라인
+    """
+    start = 0
+    while True:
+        end = text.find('\n', start)
+        if end == -1:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 1
+
+
+def iter_chunk_lines(chunks: Iterable[bytes], encoding: str = 'utf-8', errors: str = 'ignore') -> Iterator[str]:
+    """
+    바이트 청크를 점진적으로 디코딩하여 줄 단위로 순회
+
+    Args:
+        chunks (Iterable[bytes]): 바이트 청크 스트림
+        encoding (str): 문자 인코딩
+        errors (str): 디코딩 오류 처리 방식
+
+    Yields:
+        str: 개행 문자를 제외한 로그 라인
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors=errors)
+    pending = ""
+
+    for chunk in chunks:
+        text = pending + decoder.decode(chunk)
+        lines = text.split('\n')
+        pending = lines.pop()  # 마지막 조각은 다음 청크와 이어질 수 있음
+        yield from lines
+
+    yield pending + decoder.decode(b"", final=True)
+
+
+def _iter_chunks(file: BinaryIO, chunk_size: int) -> Iterator[bytes]:
+    """파일 객체에서 chunk_size 단위로 바이트 읽기"""
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def is_gzip_file(path: Union[str, os.PathLike]) -> bool:
+    """gzip 시그니처로 시작하는 파일인지 확인 (확장자와 무관, 업로드 후 임시 파일로 옮긴 경우 포함)"""
+    with open(path, 'rb') as file:
+        return file.read(len(_GZIP_MAGIC)) == _GZIP_MAGIC
+
+
+def _maybe_decompress(file: BinaryIO) -> BinaryIO:
+    """gzip 시그니처로 시작하는 파일이면 압축 해제 스트림으로 감싸서 반환"""
+    if not (hasattr(file, 'seekable') and file.seekable()):
+        return file
+    position = file.tell()
+    magic = file.read(len(_GZIP_MAGIC))
+    file.seek(position)
+    return gzip.GzipFile(fileobj=file, mode='rb') if magic == _GZIP_MAGIC else file
+
+
+def iter_lines(source: Union[str, os.PathLike, BinaryIO], encoding: str = 'utf-8', errors: str = 'ignore',
+               chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """
+    파일 경로 또는 업로드 파일 객체를 일정한 메모리로 줄 단위 순회 (gzip 압축 파일은 자동으로 압축 해제)
+
+    Args:
+        source: 로그 파일 경로 또는 바이너리 파일 객체 (Streamlit UploadedFile 등)
+        encoding (str): 문자 인코딩
+        errors (str): 디코딩 오류 처리 방식
+        chunk_size (int): 한 번에 읽을 바이트 수
+
+    Yields:
+        str: 개행 문자를 제외한 로그 라인
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as file:
+            yield from iter_chunk_lines(_iter_chunks(_maybe_decompress(file), chunk_size), encoding, errors)
+        return
+
+    # 재실행 시 이미 읽힌 업로드 파일도 처음부터 읽도록 위치 초기화
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    yield from iter_chunk_lines(_iter_chunks(_maybe_decompress(source), chunk_size), encoding, errors)
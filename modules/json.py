@@ -1,37 +1,55 @@
 import json
+import socket
 from collections import Counter
 
+import numpy as np
+
+from modules.sketch import HyperLogLog, MisraGries
+
+# 공격 유형별 탐지 문자열
+ATTACK_PATTERNS = {
+    "SQL Injection": ["' OR 1=1 --", "UNION SELECT", "SELECT * FROM"],
+    "XSS": ["<script>", "onerror=alert(1)", "javascript:"],
+    "Brute Force": ["failed login", "invalid password", "401 Unauthorized"],
+    "Directory Traversal": ["../etc/passwd", "../../windows/system32"],
+    "RFI/LFI": ["http://malicious.com/shell.php", "../../../../../var/log"]
+}
+
+SEVERITY_LEVELS = {"SQL Injection": "높음", "XSS": "중간", "Brute Force": "낮음", "Directory Traversal": "높음", "RFI/LFI": "중간"}
+
+def classify_request(request):
+    """요청 문자열에 해당하는 공격 유형 반환 (없으면 None)"""
+    for attack, patterns in ATTACK_PATTERNS.items():
+        if any(pattern in request for pattern in patterns):
+            return attack
+    return None
+
 def analyze_attack_logs(logs, output_file):
-    attack_patterns = {
-        "SQL Injection": ["' OR 1=1 --", "UNION SELECT", "SELECT * FROM"],
-        "XSS": ["<script>", "onerror=alert(1)", "javascript:"],
-        "Brute Force": ["failed login", "invalid password", "401 Unauthorized"],
-        "Directory Traversal": ["../etc/passwd", "../../windows/system32"],
-        "RFI/LFI": ["http://malicious.com/shell.php", "../../../../../var/log"]
-    }
-    
     attack_counts = Counter()
     time_distribution = Counter()
     source_ips = Counter()
     target_urls = Counter()
-    severity_levels = {"SQL Injection": "높음", "XSS": "중간", "Brute Force": "낮음", "Directory Traversal": "높음", "RFI/LFI": "중간"}
     
     for log in logs:
-        for attack, patterns in attack_patterns.items():
-            if any(pattern in log["request"] for pattern in patterns):
-                attack_counts[attack] += 1
-                time_distribution[log["time"][:2] + ":00-" + log["time"][:2] + ":59"] += 1
-                source_ips[log["ip"]] += 1
-                target_urls[log["url"]] += 1
-                break
+        attack = classify_request(log["request"])
+        if attack is not None:
+            attack_counts[attack] += 1
+            time_distribution[log["time"][:2] + ":00-" + log["time"][:2] + ":59"] += 1
+            source_ips[log["ip"]] += 1
+            target_urls[log["url"]] += 1
     
+    result = build_result(attack_counts, time_distribution, source_ips, target_urls)
+    return save_result(result, output_file)
+
+def build_result(attack_counts, time_distribution, source_ips, target_urls):
+    """집계 Counter로부터 분석 결과 JSON 구조 생성 (Counter의 삽입 순서가 출력 순서와 동점 처리 기준)"""
     total_attacks = sum(attack_counts.values())
     attack_types = [{
         "type": attack,
         "count": count,
         "percentage": round((count / total_attacks) * 100, 2),
-        "severity": severity_levels[attack],
-        "examples": attack_patterns[attack]
+        "severity": SEVERITY_LEVELS[attack],
+        "examples": ATTACK_PATTERNS[attack]
     } for attack, count in attack_counts.items()]
     
     severity_distribution = Counter({sev: 0 for sev in ["높음", "중간", "낮음"]})
@@ -66,17 +84,252 @@ def analyze_attack_logs(logs, output_file):
         "security_recommendations": security_recommendations
     }
     
+    return result
+
+def save_result(result, output_file):
+    """분석 결과를 JSON 파일로 저장"""
     with open(output_file, "w", encoding="utf-8") as f:
         json.dump(result, f, indent=4, ensure_ascii=False)
     
     return f"분석 결과가 {output_file} 파일에 저장되었습니다."
 
-# 예제 로그 데이터
-logs = [
-    {"time": "12:34:56", "ip": "192.168.1.1", "url": "/login.php", "request": "' OR 1=1 --"},
-    {"time": "13:22:10", "ip": "10.0.0.2", "url": "/search.php", "request": "<script>alert(1)</script>"},
-    {"time": "14:55:32", "ip": "172.16.0.3", "url": "/admin.php", "request": "../../etc/passwd"},
-]
+# IPv4가 아닌 주소는 32비트 범위 밖의 코드로 매핑하여 별도 테이블에 보관 (실제 IPv4 주소와 겹치지 않음)
+_EXTRA_IP_BASE = 1 << 32
 
-output_file = "attack_analysis.json"
-print(analyze_attack_logs(logs, output_file))
+class LogColumns:
+    """통계 집계용 열(column) 저장소: 시간대는 uint8, IP는 int64(IPv4는 주소 값), URL/요청은 범주형 코드"""
+    
+    def __init__(self):
+        self.hours = np.zeros(0, dtype=np.uint8)
+        self.ips = np.zeros(0, dtype=np.int64)
+        self.url_codes = np.zeros(0, dtype=np.int32)
+        self.request_codes = np.zeros(0, dtype=np.int32)
+        self.urls = []        # URL 코드 -> URL
+        self.requests = []    # 요청 코드 -> 요청 문자열
+        self.extra_ips = []   # IPv4가 아닌 주소 (코드 = _EXTRA_IP_BASE + 인덱스)
+    
+    def __len__(self):
+        return len(self.hours)
+    
+    @staticmethod
+    def _encoder(vocabulary):
+        """문자열 -> 범주형 코드 변환 함수 생성 (처음 보는 값은 vocabulary에 추가)"""
+        codes = {}
+        def encode(value):
+            code = codes.get(value)
+            if code is None:
+                code = codes[value] = len(vocabulary)
+                vocabulary.append(value)
+            return code
+        return encode
+    
+    def _ip_encoder(self):
+        """IP 문자열 -> int64 코드 변환 함수 생성"""
+        codes = {}
+        def encode(ip):
+            code = codes.get(ip)
+            if code is None:
+                code = codes[ip] = encode_new(ip)
+            return code
+        def encode_new(ip):
+            # 표준 점 표기 IPv4만 주소 값으로 저장 ("1.2.3.04" 같은 표기는 문자열이 달라지므로 별도 테이블)
+            if ip.count(".") == 3:
+                try:
+                    packed = socket.inet_aton(ip)
+                    if socket.inet_ntoa(packed) == ip:
+                        return int.from_bytes(packed, "big")
+                except OSError:
+                    pass
+            self.extra_ips.append(ip)
+            return _EXTRA_IP_BASE + len(self.extra_ips) - 1
+        return encode
+    
+    @classmethod
+    def from_dicts(cls, logs):
+        """time/ip/url/request 딕셔너리 리스트로부터 열 저장소 생성"""
+        columns = cls()
+        encode_ip = columns._ip_encoder()
+        encode_url = cls._encoder(columns.urls)
+        encode_request = cls._encoder(columns.requests)
+        
+        hours, ips, url_codes, request_codes = [], [], [], []
+        for log in logs:
+            hours.append(int(log["time"][:2]))
+            ips.append(encode_ip(log["ip"]))
+            url_codes.append(encode_url(log["url"]))
+            request_codes.append(encode_request(log["request"]))
+        
+        columns.hours = np.array(hours, dtype=np.uint8)
+        columns.ips = np.array(ips, dtype=np.int64)
+        columns.url_codes = np.array(url_codes, dtype=np.int32)
+        columns.request_codes = np.array(request_codes, dtype=np.int32)
+        return columns
+    
+    @classmethod
+    def from_records(cls, records):
+        """modules.parser.LogRecord 스트림으로부터 열 저장소 생성"""
+        columns = cls()
+        encode_ip = columns._ip_encoder()
+        encode_url = cls._encoder(columns.urls)
+        encode_request = cls._encoder(columns.requests)
+        
+        local_times, ips, url_codes, request_codes = [], [], [], []
+        for record in records:
+            local_times.append(record.timestamp + record.tz_offset)
+            ips.append(encode_ip(record.ip))
+            url_codes.append(encode_url(record.path))
+            request_codes.append(encode_request(record.request))
+        
+        columns.hours = ((np.array(local_times, dtype=np.int64) // 3600) % 24).astype(np.uint8)
+        columns.ips = np.array(ips, dtype=np.int64)
+        columns.url_codes = np.array(url_codes, dtype=np.int32)
+        columns.request_codes = np.array(request_codes, dtype=np.int32)
+        return columns
+    
+    def ip_string(self, value):
+        """IP 코드를 문자열로 변환"""
+        value = int(value)
+        if value >= _EXTRA_IP_BASE:
+            return self.extra_ips[value - _EXTRA_IP_BASE]
+        return socket.inet_ntoa(value.to_bytes(4, "big"))
+
+def _ordered_counts(values):
+    """
+    값별 개수를 (개수 내림차순, 최초 등장 순서) 기준으로 정렬하여 반환
+    
+    Counter의 삽입 순서 및 most_common()의 동점 처리 순서와 동일합니다.
+    """
+    keys, first_index, counts = np.unique(values, return_index=True, return_counts=True)
+    appearance = np.argsort(first_index, kind="stable")
+    ranked = np.lexsort((first_index, -counts))
+    return keys, counts, appearance, ranked
+
+def aggregate_columns(columns, top_n=5):
+    """
+    열 저장소에서 공격 통계를 벡터 연산으로 집계
+    
+    Returns:
+        Tuple[Counter, Counter, Counter, Counter]: analyze_attack_logs와 동일한 순서의
+        (attack_counts, time_distribution, 상위 source_ips, 상위 target_urls)
+    """
+    attack_names = list(ATTACK_PATTERNS)
+    
+    # 고유 요청마다 한 번씩만 분류한 뒤 코드 배열로 전파
+    request_types = np.array([
+        attack_names.index(attack) if attack is not None else -1
+        for attack in map(classify_request, columns.requests)
+    ], dtype=np.int8)
+    types = request_types[columns.request_codes]
+    mask = types >= 0
+    
+    attack_counts = Counter()
+    keys, counts, appearance, _ = _ordered_counts(types[mask])
+    for i in appearance:
+        attack_counts[attack_names[keys[i]]] = int(counts[i])
+    
+    time_distribution = Counter()
+    keys, counts, appearance, _ = _ordered_counts(columns.hours[mask])
+    for i in appearance:
+        hour = int(keys[i])
+        time_distribution[f"{hour:02d}:00-{hour:02d}:59"] = int(counts[i])
+    
+    source_ips = Counter()
+    keys, counts, _, ranked = _ordered_counts(columns.ips[mask])
+    for i in ranked[:top_n]:
+        source_ips[columns.ip_string(keys[i])] = int(counts[i])
+    
+    target_urls = Counter()
+    keys, counts, _, ranked = _ordered_counts(columns.url_codes[mask])
+    for i in ranked[:top_n]:
+        target_urls[columns.urls[keys[i]]] = int(counts[i])
+    
+    return attack_counts, time_distribution, source_ips, target_urls
+
+def analyze_attack_logs_columnar(logs, output_file):
+    """
+    analyze_attack_logs의 NumPy 열 기반 버전 (같은 visualization_data 구조의 결과 생성)
+    
+    Args:
+        logs: time/ip/url/request 딕셔너리 리스트 또는 LogColumns
+        output_file (str): 결과 JSON 파일 경로
+    """
+    columns = logs if isinstance(logs, LogColumns) else LogColumns.from_dicts(logs)
+    result = build_result(*aggregate_columns(columns))
+    return save_result(result, output_file)
+
+class SketchStats:
+    """
+    analyze_attack_logs의 근사 집계 버전: IP/URL Counter 대신 고정 크기 스케치 사용
+    
+    상위 IP/URL은 Misra-Gries, 고유 IP 수는 HyperLogLog로 추정하므로 고유 값이 아무리 많아도
+    메모리가 capacity와 precision으로 제한됩니다. 파일별/작업자별 결과는 merge()로 합칠 수 있습니다.
+    """
+    
+    def __init__(self, capacity=1000, precision=14):
+        self.attack_counts = Counter()        # 공격 유형 수만큼만 증가
+        self.time_distribution = Counter()    # 최대 24개
+        self.source_ips = MisraGries(capacity)
+        self.target_urls = MisraGries(capacity)
+        self.distinct_ips = HyperLogLog(precision)
+    
+    def add(self, log):
+        """time/ip/url/request 딕셔너리 하나 반영"""
+        attack = classify_request(log["request"])
+        if attack is not None:
+            self.attack_counts[attack] += 1
+            self.time_distribution[log["time"][:2] + ":00-" + log["time"][:2] + ":59"] += 1
+            self.source_ips.add(log["ip"])
+            self.target_urls.add(log["url"])
+            self.distinct_ips.add(log["ip"])
+    
+    def merge(self, other):
+        """다른 부분 집계를 합친 새 SketchStats 반환"""
+        merged = SketchStats()
+        merged.attack_counts = self.attack_counts + other.attack_counts
+        merged.time_distribution = self.time_distribution + other.time_distribution
+        merged.source_ips = self.source_ips.merge(other.source_ips)
+        merged.target_urls = self.target_urls.merge(other.target_urls)
+        merged.distinct_ips = self.distinct_ips.merge(other.distinct_ips)
+        return merged
+    
+    def estimation(self):
+        """추정 결과의 오차 범위 (상위 IP/URL 빈도는 최대 error_bound만큼 과소 추정)"""
+        return {
+            "top_source_ips_error_bound": self.source_ips.error_bound(),
+            "top_target_urls_error_bound": self.target_urls.error_bound(),
+            "distinct_source_ips": self.distinct_ips.count(),
+            "distinct_source_ips_relative_error": round(self.distinct_ips.relative_error(), 4)
+        }
+    
+    def build_result(self, top_n=5):
+        """build_result와 같은 구조의 결과에 "estimation" 항목을 추가하여 반환"""
+        result = build_result(self.attack_counts, self.time_distribution,
+                              Counter(dict(self.source_ips.most_common(top_n))),
+                              Counter(dict(self.target_urls.most_common(top_n))))
+        result["estimation"] = self.estimation()
+        return result
+
+def analyze_attack_logs_sketch(logs, output_file, capacity=1000):
+    """
+    analyze_attack_logs의 스케치 기반 근사 버전 (대용량 로그에서 IP/URL 수와 무관한 메모리 사용)
+    
+    Args:
+        logs: time/ip/url/request 딕셔너리 스트림
+        output_file (str): 결과 JSON 파일 경로
+        capacity (int): 상위 IP/URL 스케치의 카운터 수
+    """
+    stats = SketchStats(capacity)
+    for log in logs:
+        stats.add(log)
+    return save_result(stats.build_result(), output_file)
+
+if __name__ == "__main__":
+    # 예제 로그 데이터
+    logs = [
+        {"time": "12:34:56", "ip": "192.168.1.1", "url": "/login.php", "request": "' OR 1=1 --"},
+        {"time": "13:22:10", "ip": "10.0.0.2", "url": "/search.php", "request": "<script>alert(1)</script>"},
+        {"time": "14:55:32", "ip": "172.16.0.3", "url": "/admin.php", "request": "../../etc/passwd"},
+    ]
+    
+    output_file = "attack_analysis.json"
+    print(analyze_attack_logs(logs, output_file))
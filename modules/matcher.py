@@ -0,0 +1,566 @@
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional, FrozenSet, Tuple
+
+try:  # Python 3.11 이상
+    from re import _parser as sre_parse
+    from re import _constants as sre_constants
+except ImportError:  # Python 3.10 이하
+    import sre_parse
+    import sre_constants
+
+# 필수 리터럴: (문자열, 대소문자 무시 여부)
+Literal = Tuple[str, bool]
+
+# 대상 필드 판정 결과를 기억할 최대 요청 수 (스캐너가 같은 요청을 반복하는 로그에서 정규식 검사를 한 번만 수행)
+DEFAULT_MEMO_SIZE = 4096
+
+# 이보다 긴 필드 조합은 반복될 가능성이 낮고 캐시 메모리만 차지하므로 기억하지 않음
+_MEMO_MAX_KEY_LENGTH = 4096
+
+_REPEATS = tuple(
+    getattr(sre_constants, name)
+    for name in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT")
+    if hasattr(sre_constants, name)
+)
+_GROUPS = tuple(
+    getattr(sre_constants, name)
+    for name in ("ATOMIC_GROUP",)
+    if hasattr(sre_constants, name)
+)
+
+
+def _score(literals: FrozenSet[Literal]) -> Tuple[int, int]:
+    """필수 리터럴 집합의 선택도 점수 (가장 짧은 리터럴이 길수록, 후보 수가 적을수록 우수)"""
+    return (min(len(text) for text, _ in literals), -len(literals))
+
+
+def _required_literals(subpattern, ignorecase: bool) -> Optional[FrozenSet[Literal]]:
+    """
+    파싱된 정규식에서 매칭 시 반드시 하나 이상 포함되는 리터럴 집합 추출
+
+    Args:
+        subpattern: sre_parse로 파싱된 (하위) 패턴
+        ignorecase (bool): 대소문자 무시 플래그 적용 여부
+
+    Returns:
+        Optional[FrozenSet[Literal]]: 필수 리터럴 집합 (추출할 수 없으면 None)
+    """
+    candidates = []
+    run = []
+
+    def flush():
+        if run:
+            candidates.append(frozenset([("".join(run), ignorecase)]))
+            run.clear()
+
+    for op, av in subpattern:
+        if op is sre_constants.LITERAL:
+            ch = chr(av)
+            # 대소문자 무시 모드에서는 ASCII 문자만 안전하게 소문자로 비교할 수 있음
+            if ignorecase and not ch.isascii():
+                flush()
+                continue
+            run.append(ch.lower() if ignorecase else ch)
+            continue
+
+        flush()
+        found = None
+        if op is sre_constants.SUBPATTERN:
+            _, add_flags, del_flags, sub = av
+            sub_ignorecase = bool((ignorecase or add_flags & re.IGNORECASE) and not del_flags & re.IGNORECASE)
+            found = _required_literals(sub, sub_ignorecase)
+        elif op in _GROUPS:
+            found = _required_literals(av, ignorecase)
+        elif op is sre_constants.BRANCH:
+            branches = [_required_literals(branch, ignorecase) for branch in av[1]]
+            if all(branches):
+                found = frozenset().union(*branches)
+        elif op in _REPEATS and av[0] >= 1:
+            found = _required_literals(av[2], ignorecase)
+
+        if found:
+            candidates.append(found)
+
+    flush()
+
+    if not candidates:
+        return None
+    return max(candidates, key=_score)
+
+
+class _VerdictMemo:
+    """필드 조합 -> 판정 결과 LRU 캐시 (스레드 간 공유, 조회 결과로 적중 여부를 바로 알 수 있음)"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple[Optional[str], ...], Tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[Optional[str], ...]) -> Optional[Tuple]:
+        """기억한 판정 조회 (없으면 None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: Tuple[Optional[str], ...], entry: Tuple) -> None:
+        """판정 기억 (가득 차면 가장 오래 사용되지 않은 항목 제거)"""
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+def extract_required_literals(pattern: str) -> Optional[FrozenSet[Literal]]:
+    """
+    정규식 문자열에서 필수 리터럴 집합 추출
+
+    Args:
+        pattern (str): 정규식 문자열
+
+    Returns:
+        Optional[FrozenSet[Literal]]: 필수 리터럴 집합 (추출할 수 없으면 None)
+    """
+    parsed = sre_parse.parse(pattern)
+    return _required_literals(parsed, bool(parsed.state.flags & re.IGNORECASE))
+
+
+class PatternMatcher:
+    """필수 리터럴 사전 검사(prefilter)로 후보 패턴만 정규식으로 확인하는 매칭 엔진"""
+
+    def __init__(self, patterns: List[str], targets: Optional[List[Tuple[str, ...]]] = None,
+                 max_length: Optional[int] = None, literals: Optional[List[Optional[Tuple[str, ...]]]] = None,
+                 memo_size: int = DEFAULT_MEMO_SIZE):
+        """
+        초기화 함수
+
+        Args:
+            patterns (List[str]): 우선순위 순서의 정규식 목록
+            targets (Optional[List[Tuple[str, ...]]]): 패턴별 탐지 대상 필드명 (first_match_fields에서 사용)
+            max_length (Optional[int]): 정규식에 전달할 라인/필드 최대 길이 (초과분은 잘라서 검사, None이면 제한 없음)
+                역추적이 많은 패턴은 입력 길이의 제곱에 비례해 느려지고 실행 중인 re 검사는 중단할 수 없으므로,
+                길이 상한으로 라인 하나의 최악 검사 시간을 제한합니다.
+            literals (Optional[List[Optional[Tuple[str, ...]]]]): 패턴별 필수 리터럴 지정 (규칙 팩에서 지정한 값,
+                None인 항목은 정규식에서 자동 추출, 대소문자 무시 패턴은 소문자로 비교)
+            memo_size (int): 대상 필드 조합별 판정 결과를 기억할 최대 개수 (0이면 기억하지 않음)
+                IP/시각/상태 코드만 다르고 요청, User-Agent, Referer가 같은 라인은 같은 판정을 받으므로
+                필드 조합을 키로 한 LRU 캐시에서 이전 판정을 재사용합니다.
+        """
+        self.patterns = list(patterns)
+        self.max_length = max_length
+        self.targets = [tuple(fields) for fields in targets] if targets is not None else [("request",)] * len(self.patterns)
+        self.compiled = [re.compile(pattern) for pattern in self.patterns]
+        self.literals = [
+            extract_required_literals(pattern) if not texts else
+            frozenset((text.lower(), True) if compiled.flags & re.IGNORECASE else (text, False) for text in texts)
+            for pattern, compiled, texts in zip(self.patterns, self.compiled, literals or [None] * len(self.patterns))
+        ]
+
+        # 패턴별 사전 검사 인덱스: (대소문자 구분 리터럴, 소문자 비교 리터럴)
+        # 리터럴을 추출할 수 없는 패턴은 None으로 두고 항상 정규식으로 검사
+        self._prefilter = []
+        for literals in self.literals:
+            if literals is None:
+                self._prefilter.append(None)
+            else:
+                exact = tuple(sorted(text for text, icase in literals if not icase))
+                lower = tuple(sorted(text for text, icase in literals if icase))
+                self._prefilter.append((exact, lower))
+
+        # 전체 패턴 일괄 사전 검사용 리터럴 표: 리터럴 -> 그 리터럴을 필수로 갖는 패턴 비트마스크
+        # 여러 패턴이 공유하는 리터럴은 한 번만 검사하고, 한 번의 순회로 모든 후보 패턴을 비트마스크로 구함
+        self._exact_bits: Dict[str, int] = {}
+        self._lower_bits: Dict[str, int] = {}
+        self._always_mask = 0   # 리터럴을 추출할 수 없어 항상 정규식으로 확인하는 패턴
+        self._lower_mask = 0    # 소문자 비교 리터럴을 가진 패턴 (비 ASCII 라인에서는 항상 후보)
+        for i, prefilter in enumerate(self._prefilter):
+            bit = 1 << i
+            if prefilter is None:
+                self._always_mask |= bit
+                continue
+            exact, lower = prefilter
+            for text in exact:
+                self._exact_bits[text] = self._exact_bits.get(text, 0) | bit
+            for text in lower:
+                self._lower_bits[text] = self._lower_bits.get(text, 0) | bit
+            if lower:
+                self._lower_mask |= bit
+        self._exact_table = tuple(self._exact_bits.items())
+        self._lower_table = tuple(self._lower_bits.items())
+
+        # 필드명 -> 그 필드를 대상으로 하는 패턴 비트마스크 (match_mask_fields에서 사용)
+        self._field_masks: Dict[str, int] = {}
+        for i, fields in enumerate(self.targets):
+            for field in fields:
+                self._field_masks[field] = self._field_masks.get(field, 0) | (1 << i)
+
+        # 대상 필드 조합 -> (판정 결과, 순차 검사 시 정규식 호출 수, 잘린 필드 수) LRU 캐시
+        self._memo_fields = tuple(sorted(self._field_masks))
+        self._fields_memo = _VerdictMemo(memo_size) if memo_size else None
+        self._mask_memo = _VerdictMemo(memo_size) if memo_size else None
+
+        # 공유 인스턴스(get_matcher)는 여러 스레드가 동시에 사용하므로 통계 갱신은 잠금 안에서 한 번에 반영
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        """사전 검사 통계 초기화"""
+        with self._lock:
+            self.stats = {
+                "lines": 0,           # 검사한 라인 수
+                "regex_calls": 0,     # 실제로 실행된 정규식 검사 수
+                "regex_skipped": 0,   # 순차 검사 대비 생략된 정규식 검사 수
+                "truncated": 0,       # max_length를 넘어 잘라서 검사한 라인/필드 수
+                "memo_hits": 0,       # 같은 필드 조합의 이전 판정을 재사용하여 검사하지 않은 라인 수
+            }
+            # 패턴별 정규식 실행 수와 탐지 수 (CPU만 쓰고 탐지하지 못하는 규칙 확인용)
+            # 탐지 수는 first_match에서는 가장 먼저 매칭된 패턴만, match_mask에서는 매칭된 모든 패턴을 셈
+            self.pattern_calls = [0] * len(self.compiled)
+            self.pattern_hits = [0] * len(self.compiled)
+
+    def _record(self, called: List[int], hits: int, sequential_calls: int, truncated: int,
+                memo_hit: bool = False) -> None:
+        """
+        라인 하나의 검사 결과를 통계에 반영 (검사 중에는 지역 변수에만 기록하고 잠금 안에서 한 번에 합산)
+
+        Args:
+            called (List[int]): 정규식을 실행한 패턴 인덱스 (필드별로 실행하면 중복 포함)
+            hits (int): 탐지한 패턴 비트마스크
+            sequential_calls (int): 순차 검사였다면 실행했을 정규식 호출 수
+            truncated (int): max_length를 넘어 잘라서 검사한 라인/필드 수
+            memo_hit (bool): 판정 캐시를 재사용했는지 여부
+        """
+        with self._lock:
+            stats = self.stats
+            stats["lines"] += 1
+            stats["regex_calls"] += len(called)
+            stats["regex_skipped"] += sequential_calls - len(called)
+            stats["truncated"] += truncated
+            stats["memo_hits"] += memo_hit
+            pattern_calls = self.pattern_calls
+            for i in called:
+                pattern_calls[i] += 1
+            pattern_hits = self.pattern_hits
+            while hits:
+                bit = hits & -hits
+                hits ^= bit
+                pattern_hits[bit.bit_length() - 1] += 1
+
+    def _clip(self, text: str) -> str:
+        """max_length를 넘는 텍스트는 앞부분만 남김"""
+        if self.max_length is not None and len(text) > self.max_length:
+            return text[:self.max_length]
+        return text
+
+    def _search(self, index: int, text: str) -> bool:
+        """패턴 하나로 텍스트 검사 (프로파일러가 재정의하여 패턴별 시간 측정)"""
+        return self.compiled[index].search(text) is not None
+
+    def _is_candidate(self, index: int, line: str, lowered: Optional[str]) -> bool:
+        """필수 리터럴이 포함되어 있어 정규식 확인이 필요한 패턴인지 검사"""
+        prefilter = self._prefilter[index]
+        if prefilter is None:
+            return True
+        exact, lower = prefilter
+        if any(text in line for text in exact):
+            return True
+        if lower:
+            # 비 ASCII 라인은 소문자 변환 결과가 정규식의 대소문자 무시 규칙과 다를 수 있음
+            if lowered is None:
+                return True
+            return any(text in lowered for text in lower)
+        return False
+
+    def candidate_mask(self, text: str, lowered: Optional[str]) -> int:
+        """
+        리터럴 표 한 번 순회로 정규식 확인이 필요한 패턴 전체를 비트마스크로 반환 (비트 i = 패턴 i)
+
+        Args:
+            text (str): 검사할 텍스트
+            lowered (Optional[str]): 소문자 변환한 텍스트 (비 ASCII 텍스트면 None)
+
+        Returns:
+            int: 후보 패턴 비트마스크
+        """
+        mask = self._always_mask
+        for literal, bits in self._exact_table:
+            if literal in text:
+                mask |= bits
+        if lowered is None:
+            return mask | self._lower_mask
+        for literal, bits in self._lower_table:
+            if literal in lowered:
+                mask |= bits
+        return mask
+
+    def candidates(self, line: str) -> List[int]:
+        """
+        사전 검사를 통과한 후보 패턴 인덱스 목록 반환
+
+        Args:
+            line (str): 검사할 로그 라인
+
+        Returns:
+            List[int]: 정규식 확인이 필요한 패턴 인덱스 리스트
+        """
+        lowered = line.lower() if line.isascii() else None
+        return [i for i in range(len(self.compiled)) if self._is_candidate(i, line, lowered)]
+
+    def first_match(self, line: str) -> Optional[int]:
+        """
+        가장 먼저 매칭되는 패턴의 인덱스 반환 (패턴별 순차 검사와 동일한 결과)
+
+        Args:
+            line (str): 검사할 로그 라인
+
+        Returns:
+            Optional[int]: 매칭된 패턴 인덱스 (없으면 None)
+        """
+        clipped = self._clip(line)
+        truncated = len(clipped) < len(line)
+        line = clipped
+        lowered = line.lower() if line.isascii() else None
+        result = None
+        called = []
+
+        for i in range(len(self.compiled)):
+            if not self._is_candidate(i, line, lowered):
+                continue
+            called.append(i)
+            if self._search(i, line):
+                result = i
+                break
+
+        # 순차 검사였다면 실행했을 정규식 호출 수와 비교하여 통계 기록
+        sequential_calls = len(self.compiled) if result is None else result + 1
+        self._record(called, 0 if result is None else 1 << result, sequential_calls, truncated)
+        return result
+
+    def _memo_key(self, fields: Dict[str, str]) -> Optional[Tuple[Optional[str], ...]]:
+        """판정 캐시 키 (대상 필드 텍스트 조합, 캐시를 쓰지 않거나 필드가 너무 길면 None)"""
+        if self._fields_memo is None:
+            return None
+        key = tuple(fields.get(field) for field in self._memo_fields)
+        if sum(len(text) for text in key if text) > _MEMO_MAX_KEY_LENGTH:
+            return None
+        return key
+
+    def first_match_fields(self, fields: Dict[str, str]) -> Optional[int]:
+        """
+        패턴별 대상 필드에만 정규식을 적용하여 가장 먼저 매칭되는 패턴 인덱스 반환
+
+        같은 필드 조합은 LRU 캐시에 기억한 이전 판정을 재사용합니다.
+
+        Args:
+            fields (Dict[str, str]): 필드명 -> 텍스트 (예: "request", "user_agent", "referer")
+
+        Returns:
+            Optional[int]: 매칭된 패턴 인덱스 (없으면 None)
+        """
+        key = self._memo_key(fields)
+        if key is None:
+            return self._first_match_fields(fields)[0]
+        entry = self._fields_memo.get(key)
+        if entry is not None:
+            # 이전 판정 재사용: 정규식은 실행하지 않았으므로 순차 검사 호출 수 전체가 생략된 것으로 집계
+            result, sequential_calls, truncated = entry
+            self._record([], 0 if result is None else 1 << result, sequential_calls, truncated, memo_hit=True)
+            return result
+        entry = self._first_match_fields(fields)
+        self._fields_memo.put(key, entry)
+        return entry[0]
+
+    def _first_match_fields(self, fields: Dict[str, str]) -> Tuple[Optional[int], int, int]:
+        """판정 캐시 없이 대상 필드 검사 (first_match_fields 참고, (결과, 순차 검사 호출 수, 잘린 필드 수) 반환)"""
+        prepared = {}  # 필드명 -> (길이 제한을 적용한 텍스트, 소문자 텍스트)
+        result = None
+        called = []
+        sequential_calls = 0
+        truncated = 0
+
+        for i in range(len(self.compiled)):
+            for field in self.targets[i]:
+                if field not in prepared:
+                    text = fields.get(field)
+                    if text:
+                        clipped = self._clip(text)
+                        truncated += len(clipped) < len(text)
+                        prepared[field] = (clipped, clipped.lower() if clipped.isascii() else None)
+                    else:
+                        prepared[field] = None
+                if prepared[field] is None:
+                    continue
+                sequential_calls += 1
+                text, lowered = prepared[field]
+                if not self._is_candidate(i, text, lowered):
+                    continue
+                called.append(i)
+                if self._search(i, text):
+                    result = i
+                    break
+            if result is not None:
+                break
+
+        self._record(called, 0 if result is None else 1 << result, sequential_calls, truncated)
+        return result, sequential_calls, truncated
+
+    def match_mask(self, line: str) -> int:
+        """
+        라인에 매칭되는 모든 패턴을 비트마스크로 반환 (다중 라벨 탐지, 비트 i = 패턴 i)
+
+        first_match는 가장 먼저 매칭된 패턴에서 멈추므로 디렉토리 탐색이면서 명령어 인젝션인 라인은
+        우선순위가 높은 유형 하나로만 집계됩니다. 이 함수는 일괄 사전 검사로 후보 패턴을 한 번에 구한 뒤
+        후보만 정규식으로 확인하므로, 대부분의 라인(후보 없음)에서는 first_match와 비용이 같습니다.
+
+        Args:
+            line (str): 검사할 로그 라인
+
+        Returns:
+            int: 매칭된 패턴 비트마스크 (0이면 탐지 없음, 가장 낮은 비트가 first_match 결과)
+        """
+        clipped = self._clip(line)
+        truncated = len(clipped) < len(line)
+        line = clipped
+        candidates = self.candidate_mask(line, line.lower() if line.isascii() else None)
+        result = 0
+        called = []
+
+        while candidates:
+            bit = candidates & -candidates
+            candidates ^= bit
+            i = bit.bit_length() - 1
+            called.append(i)
+            if self._search(i, line):
+                result |= bit
+
+        self._record(called, result, len(self.compiled), truncated)
+        return result
+
+    def match_mask_fields(self, fields: Dict[str, str]) -> int:
+        """
+        패턴별 대상 필드에만 정규식을 적용하여 매칭되는 모든 패턴을 비트마스크로 반환 (다중 라벨 탐지)
+
+        같은 필드 조합은 LRU 캐시에 기억한 이전 판정을 재사용합니다.
+
+        Args:
+            fields (Dict[str, str]): 필드명 -> 텍스트 (예: "request", "user_agent", "referer")
+
+        Returns:
+            int: 매칭된 패턴 비트마스크 (0이면 탐지 없음, 가장 낮은 비트가 first_match_fields 결과)
+        """
+        key = self._memo_key(fields)
+        if key is None:
+            return self._match_mask_fields(fields)[0]
+        entry = self._mask_memo.get(key)
+        if entry is not None:
+            result, sequential_calls, truncated = entry
+            self._record([], result, sequential_calls, truncated, memo_hit=True)
+            return result
+        entry = self._match_mask_fields(fields)
+        self._mask_memo.put(key, entry)
+        return entry[0]
+
+    def _match_mask_fields(self, fields: Dict[str, str]) -> Tuple[int, int, int]:
+        """판정 캐시 없이 대상 필드 검사 (match_mask_fields 참고, (결과, 순차 검사 호출 수, 잘린 필드 수) 반환)"""
+        # 필드별로 한 번만 일괄 사전 검사하고, 그 필드를 대상으로 하는 패턴만 후보로 남김
+        prepared = {}  # 필드명 -> (길이 제한을 적용한 텍스트, 후보 패턴 비트마스크)
+        candidates = 0
+        sequential_calls = 0
+        truncated = 0
+        for field, field_mask in self._field_masks.items():
+            text = fields.get(field)
+            if not text:
+                continue
+            clipped = self._clip(text)
+            truncated += len(clipped) < len(text)
+            text = clipped
+            field_candidates = self.candidate_mask(text, text.lower() if text.isascii() else None) & field_mask
+            prepared[field] = (text, field_candidates)
+            candidates |= field_candidates
+            sequential_calls += bin(field_mask).count("1")
+
+        result = 0
+        called = []
+        while candidates:
+            bit = candidates & -candidates
+            candidates ^= bit
+            i = bit.bit_length() - 1
+            for field in self.targets[i]:
+                entry = prepared.get(field)
+                if entry is None or not entry[1] & bit:
+                    continue
+                called.append(i)
+                if self._search(i, entry[0]):
+                    result |= bit
+                    break
+
+        self._record(called, result, sequential_calls, truncated)
+        return result, sequential_calls, truncated
+
+    def skip_report(self) -> str:
+        """
+        사전 검사로 생략된 정규식 호출 수 보고서 생성
+
+        Returns:
+            str: 통계 요약 문자열
+        """
+        stats = self.stats
+        total = stats["regex_calls"] + stats["regex_skipped"]
+        ratio = (stats["regex_skipped"] / total * 100) if total else 0.0
+        report = (f"검사 라인 {stats['lines']:,}개, 정규식 호출 {stats['regex_calls']:,}회 실행, "
+                  f"{stats['regex_skipped']:,}회 생략 ({ratio:.1f}%)")
+        if stats["memo_hits"]:
+            report += f", 같은 요청의 이전 판정 재사용 {stats['memo_hits']:,}개"
+        return report
+
+
+def mask_indices(mask: int) -> List[int]:
+    """
+    match_mask 비트마스크에 포함된 패턴 인덱스 목록
+
+    Args:
+        mask (int): 패턴 비트마스크 (비트 i = 패턴 i)
+
+    Returns:
+        List[int]: 패턴 인덱스 리스트 (오름차순, 즉 우선순위 순서)
+    """
+    indices = []
+    while mask:
+        bit = mask & -mask
+        mask ^= bit
+        indices.append(bit.bit_length() - 1)
+    return indices
+
+
+@lru_cache(maxsize=8)
+def _get_matcher(patterns: Tuple[str, ...], targets: Optional[Tuple[Tuple[str, ...], ...]],
+                 max_length: Optional[int], literals: Optional[Tuple[Optional[Tuple[str, ...]], ...]]) -> PatternMatcher:
+    return PatternMatcher(list(patterns), list(targets) if targets is not None else None, max_length,
+                          list(literals) if literals is not None else None)
+
+
+def get_matcher(patterns: List[str], targets: Optional[List[Tuple[str, ...]]] = None,
+                max_length: Optional[int] = None,
+                literals: Optional[List[Optional[Tuple[str, ...]]]] = None) -> PatternMatcher:
+    """
+    프로세스 전역 레지스트리에서 패턴 목록에 해당하는 매칭 엔진 조회 (없으면 컴파일 후 등록)
+
+    컴파일된 정규식은 스레드 간에 안전하게 공유되며, 통계 카운터는 공유 인스턴스 전체의 누적값입니다.
+
+    Args:
+        patterns (List[str]): 우선순위 순서의 정규식 목록
+        targets (Optional[List[Tuple[str, ...]]]): 패턴별 탐지 대상 필드명
+        max_length (Optional[int]): 정규식에 전달할 라인/필드 최대 길이 (None이면 제한 없음)
+        literals (Optional[List[Optional[Tuple[str, ...]]]]): 패턴별 필수 리터럴 지정 (None이면 자동 추출)
+
+    Returns:
+        PatternMatcher: 공유 매칭 엔진
+    """
+    return _get_matcher(tuple(patterns), tuple(tuple(fields) for fields in targets) if targets is not None else None,
+                        max_length,
+                        tuple(tuple(texts) if texts else None for texts in literals) if literals is not None else None)
@@ -0,0 +1,331 @@
+import os
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Dict, Tuple, Optional
+
+from modules.audit import detect_audit_records, detect_audit_record_masks
+from modules.ingest import is_gzip_file, iter_chunk_lines, iter_lines
+from modules.matcher import PatternMatcher, get_matcher, mask_indices
+from modules.burst import BurstDetector
+from modules.parser import LogRecord, detect_log_format, match_log_record, match_log_record_mask
+from modules.regexprof import PatternProfiler
+
+# 작업자 프로세스에 한 번 할당하는 바이트 범위 크기
+DEFAULT_RANGE_SIZE = 16 * 1024 * 1024
+
+# 작업자 프로세스별 매칭 엔진 (초기화 시 한 번만 컴파일)
+_worker_matcher: Optional[PatternMatcher] = None
+
+# 작업자 프로세스별 IP 빈도 탐지 설정 (None이면 사용 안 함, 파일 단위 탐지는 파일마다 새 탐지기 생성,
+# 바이트 범위 탐지는 레코드별 입력만 모아 부모 프로세스의 탐지기 하나로 전달)
+_worker_burst_config: Optional[Dict[str, float]] = None
+
+# 작업자 프로세스별 다중 라벨 탐지 여부 (True면 패턴 인덱스 대신 매칭된 패턴 비트마스크 기록)
+_worker_multi_label = False
+
+
+def split_byte_ranges(path: str, range_size: int = DEFAULT_RANGE_SIZE) -> List[Tuple[int, int]]:
+    """
+    파일을 줄 경계에 맞춘 바이트 범위로 분할
+
+    Args:
+        path (str): 로그 파일 경로
+        range_size (int): 범위당 목표 바이트 수
+
+    Returns:
+        List[Tuple[int, int]]: (시작, 끝) 바이트 오프셋 리스트 (파일 순서)
+    """
+    file_size = os.path.getsize(path)
+    ranges = []
+    start = 0
+
+    with open(path, 'rb') as file:
+        while start < file_size:
+            end = start + range_size
+            if end >= file_size:
+                end = file_size
+            else:
+                # 다음 개행 문자 직후까지 범위를 확장하여 줄이 잘리지 않도록 함
+                file.seek(end)
+                file.readline()
+                end = file.tell()
+            ranges.append((start, end))
+            start = end
+
+    return ranges
+
+
+def _init_worker(patterns: List[str], targets: Optional[List[Tuple[str, ...]]],
+                 burst_config: Optional[Dict[str, float]] = None, max_length: Optional[int] = None,
+                 profile: bool = False, literals: Optional[List[Optional[Tuple[str, ...]]]] = None,
+                 multi_label: bool = False) -> None:
+    """작업자 프로세스 초기화: 패턴을 한 번만 컴파일 (profile이면 패턴별 검사 시간을 기록하는 매칭 엔진 사용)"""
+    global _worker_matcher, _worker_burst_config, _worker_multi_label
+    if profile:
+        _worker_matcher = PatternProfiler(patterns, targets, max_length, literals)
+    else:
+        _worker_matcher = get_matcher(patterns, targets, max_length, literals)
+    _worker_burst_config = burst_config
+    _worker_multi_label = multi_label
+
+
+def _iter_range_chunks(path: str, start: int, end: int, chunk_size: int = 1024 * 1024):
+    """파일의 [start, end) 바이트 범위를 청크 단위로 읽기"""
+    with open(path, 'rb') as file:
+        file.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            chunk = file.read(min(chunk_size, remaining))
+            if not chunk:
+                return
+            remaining -= len(chunk)
+            yield chunk
+
+
+class RangeDetection:
+    """바이트 범위 하나의 탐지 결과와 IP 빈도 탐지 입력 (작업자 프로세스가 반환)"""
+
+    __slots__ = ("detected", "ips", "timestamps", "statuses", "paths", "line_numbers")
+
+    def __init__(self, detected: List[Tuple[int, str]]):
+        self.detected = detected        # (패턴 인덱스 또는 비트마스크, 로그 라인) 리스트 (원본 순서)
+        # 파싱된 접근 로그 레코드별 빈도 탐지 입력 (IP 빈도 탐지를 사용할 때만 기록, 범위 내 줄 번호 순서)
+        self.ips: List[str] = []
+        self.timestamps = array("q")
+        self.statuses = array("H")
+        self.paths: List[str] = []
+        self.line_numbers = array("q")  # 범위 내 줄 번호 (빈도 규칙 위반 라인을 다시 읽을 때 사용)
+
+
+def _iter_range_lines(path: str, start: int, end: int) -> Iterator[str]:
+    """파일의 [start, end) 바이트 범위를 줄 단위로 순회"""
+    return iter_chunk_lines(_iter_range_chunks(path, start, end))
+
+
+def _detect_range(path: str, start: int, end: int) -> RangeDetection:
+    """
+    바이트 범위 내 로그에서 공격 패턴 탐지 (작업자 프로세스에서 실행)
+
+    IP 빈도 탐지 윈도우는 범위 경계를 넘나들기 때문에 작업자는 레코드별 입력(IP, 시각, 상태 코드, 경로)만 모으고,
+    탐지기는 부모 프로세스에서 범위 순서대로 하나만 실행합니다.
+
+    Returns:
+        RangeDetection: 패턴 탐지 결과 (다중 라벨이면 패턴 비트마스크)와 빈도 탐지 입력
+    """
+    result = RangeDetection([])
+    detected = result.detected
+    collect = _worker_burst_config is not None
+    for number, line in enumerate(_iter_range_lines(path, start, end)):
+        if not line.strip():
+            continue
+        if _worker_multi_label:
+            value, record = match_log_record_mask(_worker_matcher, line)
+            if value:
+                detected.append((value, line.strip()))
+        else:
+            value, record = match_log_record(_worker_matcher, line)
+            if value is not None:
+                detected.append((value, line.strip()))
+        if collect and record is not None:
+            result.ips.append(record.ip)
+            result.timestamps.append(record.timestamp)
+            result.statuses.append(record.status)
+            result.paths.append(record.path)
+            result.line_numbers.append(number)
+    return result
+
+
+def _observe_range(burst_detector: BurstDetector, result: RangeDetection) -> List[Tuple[int, int]]:
+    """범위의 빈도 탐지 입력을 탐지기에 순서대로 반영하고 (규칙 인덱스, 범위 내 줄 번호) 위반 목록 반환"""
+    flagged = []
+    record = LogRecord()
+    for ip, timestamp, status, path, number in zip(result.ips, result.timestamps, result.statuses, result.paths,
+                                                   result.line_numbers):
+        record.ip, record.timestamp, record.status, record.path = ip, timestamp, status, path
+        for rule in burst_detector.observe(record):
+            flagged.append((rule, number))
+    return flagged
+
+
+def _iter_ordered(executor: ProcessPoolExecutor, func, args: List[Tuple], prefetch: int) -> Iterator:
+    """작업을 최대 prefetch개까지만 미리 제출하고 결과를 제출 순서대로 반환 (소비가 느려도 결과가 쌓이지 않음)"""
+    pending = deque()
+    for item in args:
+        pending.append(executor.submit(func, *item))
+        if len(pending) >= prefetch:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def detect_file_parallel(path: str, patterns: List[str], attack_types: List[str], workers: Optional[int] = None,
+                         range_size: int = DEFAULT_RANGE_SIZE,
+                         targets: Optional[List[Tuple[str, ...]]] = None,
+                         max_length: Optional[int] = None,
+                         literals: Optional[List[Optional[Tuple[str, ...]]]] = None,
+                         multi_label: bool = False,
+                         burst_config: Optional[Dict[str, float]] = None) -> Dict[str, List[str]]:
+    """
+    로그 파일을 여러 프로세스에서 병렬로 탐지하고 공격 유형별로 병합
+
+    Args:
+        path (str): 로그 파일 경로 (압축되지 않은 파일, gzip 파일은 순차 탐지 사용)
+        patterns (List[str]): 우선순위 순서의 정규식 목록
+        attack_types (List[str]): 패턴 인덱스에 대응하는 공격 유형 라벨
+        workers (Optional[int]): 작업자 프로세스 수 (None이면 CPU 코어 수)
+        range_size (int): 작업 단위 바이트 범위 크기
+        targets (Optional[List[Tuple[str, ...]]]): 패턴별 탐지 대상 필드명
+        max_length (Optional[int]): 정규식에 전달할 라인 최대 길이 (None이면 제한 없음)
+        literals (Optional[List[Optional[Tuple[str, ...]]]]): 패턴별 필수 리터럴 지정 (None이면 자동 추출)
+        multi_label (bool): 매칭되는 모든 패턴의 유형에 로그 추가 (False면 가장 먼저 매칭된 유형에만)
+        burst_config (Optional[Dict[str, float]]): BurstDetector 생성 인자 (None이면 IP 빈도 탐지 안 함)
+
+    Returns:
+        Dict[str, List[str]]: 공격 유형별 로그 리스트 (원본 라인 순서 유지)
+    """
+    if is_gzip_file(path):
+        # 압축된 바이트는 줄 경계로 나눌 수 없음 (압축을 풀며 순차 탐지해야 함)
+        raise ValueError(f"gzip 파일은 바이트 범위로 나누어 탐지할 수 없습니다: {path}")
+
+    attack_logs_by_type = {}
+    ranges = split_byte_ranges(path, range_size)
+    burst_detector = BurstDetector.from_config(burst_config)
+    workers = workers or os.cpu_count() or 1
+
+    def label(index):
+        return attack_types[index] if index < len(attack_types) else f"Unknown_{index}"
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(list(patterns), targets, burst_config, max_length, False, literals,
+                                       multi_label)) as executor:
+        # 결과를 제출 순서대로 받으므로 범위 순서 = 원본 라인 순서
+        for (start, end), result in zip(ranges, _iter_ordered(executor, _detect_range,
+                                                              [(path, s, e) for s, e in ranges], workers * 2)):
+            for value, line in result.detected:
+                labels = dict.fromkeys(label(index) for index in mask_indices(value)) if multi_label else (label(value),)
+                for attack_type in labels:
+                    attack_logs_by_type.setdefault(attack_type, []).append(line)
+
+            if burst_detector is None:
+                continue
+            flagged = _observe_range(burst_detector, result)
+            if flagged:
+                # 위반 라인은 드물기 때문에 작업자가 모든 라인을 반환하는 대신 해당 범위만 다시 읽음
+                wanted = {number for _, number in flagged}
+                lines = {number: line.strip() for number, line in enumerate(_iter_range_lines(path, start, end))
+                         if number in wanted}
+                for rule, number in flagged:
+                    attack_logs_by_type.setdefault(burst_detector.rule_type(rule), []).append(lines[number])
+
+    return attack_logs_by_type
+
+
+class FileDetection:
+    """파일 하나의 탐지 결과와 처리 통계"""
+
+    __slots__ = ("path", "detected", "lines", "bytes", "elapsed", "profile", "masks")
+
+    def __init__(self, path: str, detected: List[Tuple[int, str]], lines: int, bytes: int, elapsed: float,
+                 profile: Optional[Dict] = None, masks: Optional[List[Tuple[int, str]]] = None):
+        self.path = path
+        self.detected = detected  # (패턴 인덱스, 로그 라인) 리스트 (원본 순서)
+        self.lines = lines
+        self.bytes = bytes
+        self.elapsed = elapsed
+        self.profile = profile    # 패턴별 검사 통계 (PatternProfiler.snapshot, 프로파일링하지 않으면 None)
+        # 다중 라벨 탐지 시 (매칭된 패턴 비트마스크, 로그 라인) 리스트 (이때 detected에는 빈도 규칙 위반만 기록)
+        self.masks = masks
+
+    @property
+    def lines_per_sec(self) -> float:
+        """초당 처리 라인 수"""
+        return self.lines / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def _detect_file(path: str) -> FileDetection:
+    """
+    로그 파일 하나 전체에서 공격 패턴 탐지 (작업자 프로세스에서 실행, .gz 파일 지원)
+
+    IP 빈도 탐지가 설정된 경우 규칙 위반은 (패턴 수 + 규칙 인덱스, 로그 라인)으로 기록합니다.
+    다중 라벨 탐지이면 패턴 탐지 결과는 detected 대신 masks에 (패턴 비트마스크, 로그 라인)으로 기록합니다.
+
+    Returns:
+        FileDetection: 탐지 결과와 처리 통계
+    """
+    started = time.perf_counter()
+    profiling = isinstance(_worker_matcher, PatternProfiler)
+    if profiling:
+        _worker_matcher.reset_stats()  # 작업자가 여러 파일을 처리하므로 파일별 통계만 반환
+    log_format = detect_log_format(path)
+    detected = []
+    masks = [] if _worker_multi_label else None
+    lines = 0
+    if log_format == "audit":
+        # audit_log는 여러 줄 레코드 단위로 탐지
+        def count(stream):
+            nonlocal lines
+            for line in stream:
+                lines += 1
+                yield line
+        if masks is not None:
+            masks.extend(detect_audit_record_masks(_worker_matcher, count(iter_lines(path))))
+        else:
+            detected.extend(detect_audit_records(_worker_matcher, count(iter_lines(path))))
+    else:
+        burst_detector = BurstDetector.from_config(_worker_burst_config) if log_format == "access" else None
+        rule_offset = len(_worker_matcher.patterns)
+        for line in iter_lines(path):
+            if not line.strip():
+                continue
+            lines += 1
+            if masks is not None:
+                mask, record = match_log_record_mask(_worker_matcher, line, log_format)
+                if mask:
+                    masks.append((mask, line.strip()))
+            else:
+                index, record = match_log_record(_worker_matcher, line, log_format)
+                if index is not None:
+                    detected.append((index, line.strip()))
+            if burst_detector is not None and record is not None:
+                for rule in burst_detector.observe(record):
+                    detected.append((rule_offset + rule, line.strip()))
+    return FileDetection(path, detected, lines, os.path.getsize(path), time.perf_counter() - started,
+                         _worker_matcher.snapshot() if profiling else None, masks)
+
+
+def detect_files_parallel(paths: List[str], patterns: List[str], workers: Optional[int] = None,
+                          targets: Optional[List[Tuple[str, ...]]] = None,
+                          burst_config: Optional[Dict[str, float]] = None, max_length: Optional[int] = None,
+                          profile: bool = False,
+                          literals: Optional[List[Optional[Tuple[str, ...]]]] = None,
+                          multi_label: bool = False) -> Iterator[FileDetection]:
+    """
+    여러 로그 파일을 파일 단위로 동시에 탐지 (순환된 로그 디렉토리 일괄 처리용)
+
+    Args:
+        paths (List[str]): 로그 파일 경로 목록 (.gz 압축 파일 포함 가능)
+        patterns (List[str]): 우선순위 순서의 정규식 목록
+        workers (Optional[int]): 작업자 프로세스 수 (None이면 CPU 코어 수, 1이면 현재 프로세스에서 처리)
+        targets (Optional[List[Tuple[str, ...]]]): 패턴별 탐지 대상 필드명
+        burst_config (Optional[Dict[str, float]]): BurstDetector 생성 인자 (None이면 IP 빈도 탐지 안 함)
+        max_length (Optional[int]): 정규식에 전달할 라인/필드 최대 길이 (None이면 제한 없음)
+        profile (bool): 파일별 패턴 검사 통계를 FileDetection.profile에 기록
+        literals (Optional[List[Optional[Tuple[str, ...]]]]): 패턴별 필수 리터럴 지정 (None이면 자동 추출)
+        multi_label (bool): 매칭되는 모든 패턴을 비트마스크로 FileDetection.masks에 기록
+
+    Yields:
+        FileDetection: 파일별 탐지 결과 (paths 순서)
+    """
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    if workers <= 1:
+        _init_worker(list(patterns), targets, burst_config, max_length, profile, literals, multi_label)
+        for path in paths:
+            yield _detect_file(path)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(list(patterns), targets, burst_config, max_length, profile, literals,
+                                       multi_label)) as executor:
+        yield from executor.map(_detect_file, paths)
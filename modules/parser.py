@@ -0,0 +1,296 @@
+import calendar
+import re
+import sys
+import time
+import itertools
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+# Apache common/combined 로그 형식
+# 127.0.0.1 - - [17/Jul/2005:04:10:23 -0400] "GET / HTTP/1.1" 403 3931 "-" "Mozilla/4.0 ..."
+_ACCESS_PATTERN = re.compile(
+    r'^(\S+) \S+ \S+ \[([^\]]*)\] "([^"]*)" (\d{3}|-) (\d+|-)(?: "([^"]*)" "([^"]*)")?'
+)
+
+_MONTHS = {name: i for i, name in enumerate(
+    ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"], 1)}
+
+# 종류가 적은 정수 필드(상태 코드, 시간대 오프셋, 응답 크기)를 레코드 간에 공유하기 위한 캐시
+# CPython은 -5~256만 공유하므로 403, -14400 같은 값은 레코드마다 28바이트 객체가 새로 생김
+_SHARED_INTS: Dict[int, int] = {}
+_MAX_SHARED_INTS = 4096
+
+
+def parse_apache_time(value: str) -> Tuple[int, int]:
+    """
+    Apache 타임스탬프를 (UTC epoch 초, 시간대 오프셋 초)로 변환
+
+    Args:
+        value (str): "17/Jul/2005:04:10:23 -0400" 형식 문자열
+
+    Returns:
+        Tuple[int, int]: (UTC epoch 초, 시간대 오프셋 초), 형식이 다르면 (0, 0)
+    """
+    try:
+        # strptime보다 빠른 고정 위치 파싱
+        local = calendar.timegm((int(value[7:11]), _MONTHS[value[3:6]], int(value[0:2]),
+                                 int(value[12:14]), int(value[15:17]), int(value[18:20])))
+    except (KeyError, ValueError):
+        return 0, 0
+
+    # 시간대 오프셋 (audit_log의 "--0400"처럼 부호가 중복된 경우도 허용)
+    zone = value[21:].lstrip()
+    sign = -1 if zone.startswith('-') else 1
+    digits = zone.lstrip('+-')
+    try:
+        offset = sign * (int(digits[0:2]) * 3600 + int(digits[2:4]) * 60)
+    except ValueError:
+        offset = 0
+    return local - offset, offset
+
+
+class LogRecord:
+    """Apache 접근 로그 한 줄을 필드 단위로 저장하는 경량 레코드"""
+
+    __slots__ = ("ip", "timestamp", "tz_offset", "method", "path", "query", "protocol",
+                 "status", "bytes", "referer", "user_agent")
+
+    def __init__(self, ip: str = "", timestamp: int = 0, tz_offset: int = 0, method: str = "", path: str = "",
+                 query: str = "", protocol: str = "", status: int = 0, bytes: int = 0, referer: str = "",
+                 user_agent: str = ""):
+        self.ip = ip
+        self.timestamp = timestamp        # UTC epoch 초
+        self.tz_offset = tz_offset        # 로그에 기록된 시간대 오프셋(초)
+        self.method = method
+        self.path = path
+        self.query = query
+        self.protocol = protocol
+        self.status = status
+        self.bytes = bytes
+        self.referer = referer
+        self.user_agent = user_agent
+
+    @property
+    def url(self) -> str:
+        """경로와 쿼리 문자열을 합친 URL"""
+        return f"{self.path}?{self.query}" if self.query else self.path
+
+    @property
+    def request(self) -> str:
+        """원본 요청 라인 ("GET /path?query HTTP/1.1")"""
+        return " ".join(part for part in (self.method, self.url, self.protocol) if part)
+
+    @property
+    def local_time(self) -> str:
+        """로그에 기록된 시간대 기준 시각 ("HH:MM:SS")"""
+        return time.strftime("%H:%M:%S", time.gmtime(self.timestamp + self.tz_offset))
+
+    def fields(self) -> Dict[str, str]:
+        """
+        탐지 대상 필드 텍스트
+
+        Returns:
+            Dict[str, str]: 필드명 -> 텍스트 ("request", "user_agent", "referer")
+        """
+        return {"request": self.request, "user_agent": self.user_agent, "referer": self.referer}
+
+    def to_dict(self) -> Dict[str, str]:
+        """modules/json.py 통계 함수가 사용하는 딕셔너리 형식으로 변환"""
+        return {"time": self.local_time, "ip": self.ip, "url": self.path, "request": self.request}
+
+    def __repr__(self) -> str:
+        return f"LogRecord({self.ip!r}, {self.request!r}, {self.status})"
+
+
+def _shared_int(value: int) -> int:
+    """같은 값의 정수 객체를 재사용 (캐시가 가득 차면 새 값은 그대로 반환)"""
+    shared = _SHARED_INTS.get(value)
+    if shared is not None:
+        return shared
+    if len(_SHARED_INTS) < _MAX_SHARED_INTS:
+        _SHARED_INTS[value] = value
+    return value
+
+
+def parse_access_line(line: str) -> Optional[LogRecord]:
+    """
+    Apache common/combined 형식 로그 한 줄 파싱
+
+    Args:
+        line (str): 로그 라인
+
+    Returns:
+        Optional[LogRecord]: 파싱된 레코드 (형식이 다르면 None)
+    """
+    match = _ACCESS_PATTERN.match(line)
+    if match is None:
+        return None
+
+    ip, stamp, request, status, size, referer, user_agent = match.groups()
+    timestamp, tz_offset = parse_apache_time(stamp)
+
+    # 요청 라인: "METHOD URL PROTOCOL" (잘못된 요청은 URL만 있을 수 있음)
+    parts = request.split(' ')
+    if len(parts) >= 3:
+        method, url, protocol = parts[0], " ".join(parts[1:-1]), parts[-1]
+    elif len(parts) == 2:
+        method, url, protocol = parts[0], parts[1], ""
+    else:
+        method, url, protocol = "", request, ""
+    path, _, query = url.partition('?')
+
+    # 반복이 많은 값(메서드, 경로, 프로토콜, IP, 리퍼러, User-Agent)은 인터닝하여 레코드 간에 공유
+    return LogRecord(
+        ip=sys.intern(ip),
+        timestamp=timestamp,
+        tz_offset=_shared_int(tz_offset),
+        method=sys.intern(method),
+        path=sys.intern(path),
+        query=query,
+        protocol=sys.intern(protocol),
+        status=_shared_int(int(status)) if status != '-' else 0,
+        bytes=_shared_int(int(size)) if size != '-' else 0,
+        referer=sys.intern(referer) if referer and referer != '-' else "",
+        user_agent=sys.intern(user_agent) if user_agent and user_agent != '-' else "",
+    )
+
+
+def parse_agent_line(line: str) -> Optional[LogRecord]:
+    """agent_log 형식 (User-Agent만 기록) 한 줄 파싱"""
+    line = line.strip()
+    return LogRecord(user_agent=line) if line else None
+
+
+def parse_referer_line(line: str) -> Optional[LogRecord]:
+    """referer_log 형식 ("리퍼러 -> 경로") 한 줄 파싱"""
+    referer, separator, url = line.strip().partition(' -> ')
+    if not separator:
+        return None
+    path, _, query = url.partition('?')
+    return LogRecord(path=path, query=query, referer=referer if referer != '-' else "")
+
+
+_PARSERS = {
+    "access": parse_access_line,
+    "agent": parse_agent_line,
+    "referer": parse_referer_line,
+}
+
+# 필드 단위 탐지에 사용하는 파서 (요청 라인이 있는 접근 로그만)
+# agent_log/referer_log 라인에는 User-Agent나 리퍼러/경로만 있어 대상 필드가 비는 규칙이 실행되지 않으므로,
+# 필드 단위 탐지 이전과 같이 전체 라인에 모든 규칙을 적용
+_FIELD_PARSERS = {
+    "access": parse_access_line,
+}
+
+
+def detect_log_format(filename: str) -> str:
+    """
+    파일 이름으로 로그 형식 판별
+
+    Args:
+        filename (str): 로그 파일 이름 또는 경로
+
+    Returns:
+        str: "access", "agent", "referer", "audit" 중 하나
+    """
+    name = filename.replace('\\', '/').rsplit('/', 1)[-1]
+    if name.startswith("audit_log"):
+        return "audit"
+    if name.startswith("agent_log"):
+        return "agent"
+    if name.startswith("referer_log"):
+        return "referer"
+    return "access"
+
+
+def sniff_log_format(lines: Iterable[str]) -> Tuple[str, Iterator[str]]:
+    """
+    첫 번째 내용 있는 줄로 로그 형식 판별 (파일 이름을 알 수 없는 업로드/입력용)
+
+    Args:
+        lines (Iterable[str]): 로그 라인 스트림
+
+    Returns:
+        Tuple[str, Iterator[str]]: ("audit" 또는 "access", 판별에 읽은 줄을 포함한 원래 라인 스트림)
+    """
+    lines = iter(lines)
+    head = []
+    for line in lines:
+        head.append(line)
+        if line.strip():
+            break
+    log_format = "audit" if head and head[-1].startswith("====") else "access"
+    return log_format, itertools.chain(head, lines)
+
+
+def iter_records(lines: Iterable[str], log_format: str = "access") -> Iterator[LogRecord]:
+    """
+    로그 라인 스트림을 레코드 스트림으로 변환 (형식이 맞지 않는 라인은 건너뜀)
+
+    Args:
+        lines (Iterable[str]): 로그 라인 스트림
+        log_format (str): "access", "agent", "referer" 중 하나
+
+    Yields:
+        LogRecord: 파싱된 레코드
+    """
+    parse = _PARSERS[log_format]
+    for line in lines:
+        record = parse(line)
+        if record is not None:
+            yield record
+
+
+def match_log_record(matcher, line: str, log_format: str = "access") -> Tuple[Optional[int], Optional[LogRecord]]:
+    """
+    로그 라인을 파싱하여 패턴별 대상 필드에만 정규식 적용하고 파싱된 레코드도 함께 반환
+
+    접근 로그만 필드 단위로 검사하고, 그 외 형식과 파싱할 수 없는 라인은 전체 라인에 모든 규칙을 적용합니다.
+
+    Args:
+        matcher (PatternMatcher): 대상 필드(targets)가 설정된 매칭 엔진
+        line (str): 로그 라인
+        log_format (str): "access", "agent", "referer" 중 하나
+
+    Returns:
+        Tuple[Optional[int], Optional[LogRecord]]: (가장 먼저 매칭된 패턴 인덱스, 파싱된 레코드 (전체 라인 검사 시 None))
+    """
+    parse = _FIELD_PARSERS.get(log_format)
+    record = parse(line) if parse is not None else None
+    if record is None:
+        return matcher.first_match(line), None
+    return matcher.first_match_fields(record.fields()), record
+
+
+def match_log_line(matcher, line: str, log_format: str = "access") -> Optional[int]:
+    """
+    로그 라인을 파싱하여 패턴별 대상 필드에만 정규식 적용 (접근 로그가 아닌 형식과 파싱할 수 없는 라인은 전체 라인 검사)
+
+    Args:
+        matcher (PatternMatcher): 대상 필드(targets)가 설정된 매칭 엔진
+        line (str): 로그 라인
+        log_format (str): "access", "agent", "referer" 중 하나
+
+    Returns:
+        Optional[int]: 가장 먼저 매칭된 패턴 인덱스 (없으면 None)
+    """
+    return match_log_record(matcher, line, log_format)[0]
+
+
+def match_log_record_mask(matcher, line: str, log_format: str = "access") -> Tuple[int, Optional[LogRecord]]:
+    """
+    match_log_record의 다중 라벨 버전: 매칭되는 모든 패턴을 비트마스크로 반환
+
+    Args:
+        matcher (PatternMatcher): 대상 필드(targets)가 설정된 매칭 엔진
+        line (str): 로그 라인
+        log_format (str): "access", "agent", "referer" 중 하나
+
+    Returns:
+        Tuple[int, Optional[LogRecord]]: (매칭된 패턴 비트마스크 (0이면 탐지 없음), 파싱된 레코드 (전체 라인 검사 시 None))
+    """
+    parse = _FIELD_PARSERS.get(log_format)
+    record = parse(line) if parse is not None else None
+    if record is None:
+        return matcher.match_mask(line), None
+    return matcher.match_mask_fields(record.fields()), record
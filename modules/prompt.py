@@ -0,0 +1,141 @@
+import re
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+try:
+    import tiktoken  # 선택 의존성: 설치되어 있으면 정확한 토큰 수 사용
+except ImportError:
+    tiktoken = None
+
+# 모든 요청에서 동일하게 사용하는 분석 지침 (시스템 메시지에 한 번만 포함하여 요청 간 공통 접두부로 유지)
+ANALYSIS_INSTRUCTIONS = """다음 웹 로그에서 발견된 보안 공격 패턴을 상세히 분석해주세요. 
+각 로그에 대해 다음 정보를 포함하는 JSON 형식으로 응답해주세요:
+
+1. payload_info: HTTP 요청 정보 요약 (공격 패턴이 무엇인지 명확히 표시)
+2. attack_type: 공격의 유형 (SQL 인젝션, XSS, 디렉토리 탐색 등)
+3. risk_level: "낮음", "중간", "높음" 중 하나
+4. mitigation: 이 공격을 방어하기 위한 간단한 권장 조치 요약
+5. attack_description: 공격 유형에 대한 상세 설명과 공격 목적, 원리, 영향 등
+6. risk_assessment: 위험도 평가 상세 설명 (취약점이 악용될 경우 어떤 위험이 있는지)
+7. immediate_actions: 즉시 취해야 할 비상 대응 조치 (3-5개 구체적인 단계 설명)
+8. technical_mitigation: 기술적 대응 방안 (웹 애플리케이션 수정, 보안 설정 등 구체적인 방법)
+9. mitigation_examples: 이 공격을 방어하기 위한 코드 예시나 명령어 (실제 구현에 도움되는 예시)
+10. security_config: 서버, WAF, 방화벽 등 보안 구성 예시 (구체적인 설정 방법)
+11. long_term_actions: 장기적인 보안 강화 방안 (정책, 프로세스, 모니터링 등)
+
+구체적인 예시와 함께 실제 시스템에 바로 적용할 수 있는 대응 방안을 제시해주세요.
+대응 방안은 예제 코드와 설정 코드를 포함하여 실무자가 바로 활용할 수 있도록 자세히 작성해주세요.
+
+응답은 다음 JSON 형식을 따라주세요:
+```
+{
+  "analyses": [
+    {
+      "payload_info": "HTTP 요청 정보",
+      "attack_type": "XSS",
+      "risk_level": "중간",
+      "mitigation": "해당 페이로드 차단",
+      "attack_description": "XSS란...",
+      "risk_assessment": "위험도는...",
+      "immediate_actions": "1. 해당 IP 차단, 2. 세션 종료, 3. 로그 분석...",
+      "technical_mitigation": "입력값 검증 및 이스케이핑 처리...",
+      "mitigation_examples": "# 입력 검증 예시 코드\ndef validate_input(input_str):\n    ...",
+      "security_config": "# WAF 규칙 예시\nSecRule REQUEST_COOKIES|REQUEST_COOKIES_NAMES|...",
+      "long_term_actions": "1. 보안 인식 교육 강화, 2. 정기적인 취약점 스캔..."
+    },
+    ...
+  ]
+}
+```"""
+
+# 토큰 추정용 조각: 영문 단어, 최대 3자리 숫자, 비ASCII 문자 1개, 공백이 아닌 기호 1개
+_TOKEN_PIECE_PATTERN = re.compile(r"[A-Za-z]+|\d{1,3}|[^\x00-\x7f]|[^\sA-Za-z\d]")
+
+# 잘린 위치 끝에 남은 불완전한 %XX 인코딩
+_PARTIAL_ESCAPE_END = re.compile(r"%[0-9A-Fa-f]?$")
+
+
+@lru_cache(maxsize=None)
+def _get_encoding():
+    """tiktoken 인코딩 로드 (미설치이거나 인코딩 파일을 받을 수 없는 환경이면 None)"""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    텍스트의 토큰 수 계산
+
+    tiktoken을 사용할 수 있으면 gpt-4o 계열 인코딩으로 정확히 세고, 아니면 보수적으로 추정합니다.
+    (영문 단어는 4글자당 1토큰, 숫자는 3자리당 1토큰, 기호와 한글 등 비ASCII 문자는 글자당 1토큰)
+
+    Args:
+        text (str): 토큰 수를 셀 텍스트
+
+    Returns:
+        int: 토큰 수
+    """
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return sum((len(piece) + 3) // 4 for piece in _TOKEN_PIECE_PATTERN.findall(text))
+
+
+def truncate_log(line: str, max_tokens: int) -> str:
+    """
+    토큰 수가 max_tokens를 넘는 로그(버퍼 오버플로우 페이로드 등)를 앞뒤만 남기고 줄임
+
+    요청 시작 부분과 상태 코드/User-Agent가 있는 끝부분을 남기고 가운데를 생략 표시로 바꾸며,
+    %XX 인코딩이 잘린 위치에서 반쪽으로 남지 않도록 경계를 조정합니다.
+
+    Args:
+        line (str): 로그 라인
+        max_tokens (int): 허용 최대 토큰 수
+
+    Returns:
+        str: 원본 또는 줄인 로그
+    """
+    tokens = estimate_tokens(line)
+    if tokens <= max_tokens:
+        return line
+
+    keep = len(line) * max_tokens // tokens
+    while True:
+        head = _PARTIAL_ESCAPE_END.sub("", line[:keep * 2 // 3])
+        tail_start = len(line) - (keep - keep * 2 // 3)
+        percent = line.rfind("%", max(tail_start - 2, 0), tail_start)
+        if percent >= 0:
+            tail_start = min(percent + 3, len(line))
+        tail = line[tail_start:]
+        truncated = f"{head} ...[{len(line) - len(head) - len(tail)}자 생략]... {tail}"
+        if keep == 0 or estimate_tokens(truncated) <= max_tokens:
+            return truncated
+        keep = keep * 3 // 4
+
+
+def pack_batches(log_tokens: List[int], token_budget: int, max_logs: Optional[int] = None) -> List[Tuple[int, int]]:
+    """
+    로그 순서를 유지하며 배치별 토큰 합이 token_budget 이하가 되도록 분할
+
+    Args:
+        log_tokens (List[int]): 로그별 토큰 수
+        token_budget (int): 배치 하나에 넣을 수 있는 로그 토큰 합 (로그 하나가 이보다 크면 단독 배치)
+        max_logs (Optional[int]): 배치당 최대 로그 수 (None이면 제한 없음)
+
+    Returns:
+        List[Tuple[int, int]]: 배치별 (시작, 끝) 인덱스 범위
+    """
+    ranges = []
+    start, used = 0, 0
+    for i, tokens in enumerate(log_tokens):
+        if i > start and (used + tokens > token_budget or (max_logs and i - start >= max_logs)):
+            ranges.append((start, i))
+            start, used = i, 0
+        used += tokens
+    if start < len(log_tokens):
+        ranges.append((start, len(log_tokens)))
+    return ranges
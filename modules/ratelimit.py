@@ -0,0 +1,70 @@
+import threading
+import time
+from typing import Optional
+
+
+class RateLimiter:
+    """분당 요청 수와 분당 토큰 수를 함께 제한하는 스레드 안전 토큰 버킷"""
+
+    def __init__(self, requests_per_minute: Optional[float] = None, tokens_per_minute: Optional[float] = None):
+        """
+        초기화 함수
+
+        Args:
+            requests_per_minute (Optional[float]): 분당 최대 요청 수 (None이면 제한 없음)
+            tokens_per_minute (Optional[float]): 분당 최대 토큰 수 (None이면 제한 없음)
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+
+        # 버킷은 가득 찬 상태로 시작
+        self._request_allowance = float(requests_per_minute or 0)
+        self._token_allowance = float(tokens_per_minute or 0)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        """경과 시간만큼 버킷 충전"""
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        if self.requests_per_minute:
+            self._request_allowance = min(float(self.requests_per_minute),
+                                          self._request_allowance + elapsed * self.requests_per_minute / 60.0)
+        if self.tokens_per_minute:
+            self._token_allowance = min(float(self.tokens_per_minute),
+                                        self._token_allowance + elapsed * self.tokens_per_minute / 60.0)
+
+    def acquire(self, tokens: int = 0) -> float:
+        """
+        요청 1건과 지정한 토큰 수를 사용할 수 있을 때까지 대기
+
+        Args:
+            tokens (int): 이번 요청에서 사용할 예상 토큰 수
+
+        Returns:
+            float: 대기한 시간(초)
+        """
+        waited = 0.0
+        if self.tokens_per_minute:
+            # 버킷 용량보다 큰 요청은 용량만큼만 요구 (영원히 대기하지 않도록)
+            tokens = min(tokens, self.tokens_per_minute)
+
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+
+                wait = 0.0
+                if self.requests_per_minute and self._request_allowance < 1:
+                    wait = max(wait, (1 - self._request_allowance) * 60.0 / self.requests_per_minute)
+                if self.tokens_per_minute and self._token_allowance < tokens:
+                    wait = max(wait, (tokens - self._token_allowance) * 60.0 / self.tokens_per_minute)
+
+                if wait <= 0:
+                    if self.requests_per_minute:
+                        self._request_allowance -= 1
+                    if self.tokens_per_minute:
+                        self._token_allowance -= tokens
+                    return waited
+
+            time.sleep(wait)
+            waited += wait
@@ -0,0 +1,202 @@
+import math
+import re
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from modules.matcher import PatternMatcher, _GROUPS, _REPEATS, sre_constants, sre_parse
+
+# 퍼즈 입력 길이 (길이를 두 배로 늘릴 때 검사 시간 증가율로 역추적 위험 판단)
+DEFAULT_FUZZ_LENGTHS = (1024, 2048, 4096, 8192)
+
+# 이보다 빠른 검사는 측정 오차가 커서 증가율을 계산하지 않음
+_MIN_MEASURABLE_SECONDS = 1e-4
+
+
+class PatternProfiler(PatternMatcher):
+    """
+    패턴별 정규식 검사 시간, 매칭 수, 가장 오래 걸린 검사의 입력 길이를 기록하는 매칭 엔진
+
+    PatternMatcher와 같은 결과를 반환하며, 모든 정규식 호출마다 시간을 측정하므로 프로파일링 실행에만 사용합니다.
+    """
+
+    def reset_stats(self) -> None:
+        """사전 검사 통계와 패턴별 통계 초기화"""
+        super().reset_stats()
+        self.pattern_stats = [
+            {"calls": 0, "matches": 0, "seconds": 0.0, "worst_seconds": 0.0, "worst_length": 0}
+            for _ in self.compiled
+        ]
+
+    def _search(self, index: int, text: str) -> bool:
+        """패턴 하나로 텍스트 검사하며 시간 측정"""
+        started = time.perf_counter()
+        matched = self.compiled[index].search(text) is not None
+        elapsed = time.perf_counter() - started
+
+        with self._lock:
+            stat = self.pattern_stats[index]
+            stat["calls"] += 1
+            stat["seconds"] += elapsed
+            if matched:
+                stat["matches"] += 1
+            if elapsed > stat["worst_seconds"]:
+                stat["worst_seconds"] = elapsed
+                stat["worst_length"] = len(text)
+        return matched
+
+    def snapshot(self) -> Dict[str, Any]:
+        """작업자 프로세스에서 반환할 수 있는 통계 사본 (merge로 합산)"""
+        return {"stats": dict(self.stats), "patterns": [dict(stat) for stat in self.pattern_stats]}
+
+    def merge(self, snapshot: Dict[str, Any]) -> None:
+        """
+        다른 프로파일러의 통계 사본 합산 (파일별/작업자별 결과 병합용)
+
+        Args:
+            snapshot (Dict[str, Any]): snapshot()이 반환한 통계
+        """
+        for key, value in snapshot["stats"].items():
+            self.stats[key] = self.stats.get(key, 0) + value
+        for stat, other in zip(self.pattern_stats, snapshot["patterns"]):
+            stat["calls"] += other["calls"]
+            stat["matches"] += other["matches"]
+            stat["seconds"] += other["seconds"]
+            if other["worst_seconds"] > stat["worst_seconds"]:
+                stat["worst_seconds"] = other["worst_seconds"]
+                stat["worst_length"] = other["worst_length"]
+
+    def profile_report(self, labels: Optional[List[str]] = None) -> str:
+        """
+        패턴별 검사 비용 보고서 생성 (총 검사 시간 내림차순)
+
+        Args:
+            labels (Optional[List[str]]): 패턴 인덱스에 대응하는 라벨 (예: 공격 유형)
+
+        Returns:
+            str: 보고서 문자열
+        """
+        lines = [self.skip_report()]
+        if self.stats["truncated"]:
+            lines.append(f"길이 제한({self.max_length:,}자)으로 잘라서 검사한 라인/필드 {self.stats['truncated']:,}개")
+        order = sorted(range(len(self.pattern_stats)), key=lambda i: self.pattern_stats[i]["seconds"], reverse=True)
+        for i in order:
+            stat = self.pattern_stats[i]
+            if not stat["calls"]:
+                continue
+            label = labels[i] if labels is not None and i < len(labels) else f"패턴 {i}"
+            lines.append(f"  [{i:2d}] {label}: 호출 {stat['calls']:,}회, 매칭 {stat['matches']:,}회, "
+                         f"총 {stat['seconds']:.3f}초, 최악 {stat['worst_seconds'] * 1000:.2f}ms "
+                         f"(입력 {stat['worst_length']:,}자)")
+        return "\n".join(lines)
+
+
+def _collect_literals(subpattern, ignorecase: bool, found: List[str]) -> None:
+    """파싱된 정규식의 모든 위치(선택지, 반복 포함)에서 연속된 리터럴 문자열 수집"""
+    run = []
+    for op, av in subpattern:
+        if op is sre_constants.LITERAL:
+            ch = chr(av)
+            run.append(ch.lower() if ignorecase else ch)
+            continue
+        if run:
+            found.append("".join(run))
+            run = []
+        if op is sre_constants.SUBPATTERN:
+            _, add_flags, del_flags, sub = av
+            sub_ignorecase = bool((ignorecase or add_flags & re.IGNORECASE) and not del_flags & re.IGNORECASE)
+            _collect_literals(sub, sub_ignorecase, found)
+        elif op is sre_constants.BRANCH:
+            for branch in av[1]:
+                _collect_literals(branch, ignorecase, found)
+        elif op in _GROUPS:
+            _collect_literals(av, ignorecase, found)
+        elif op in _REPEATS:
+            _collect_literals(av[2], ignorecase, found)
+    if run:
+        found.append("".join(run))
+
+
+def pattern_literals(pattern: str) -> List[str]:
+    """
+    정규식에 나오는 리터럴 문자열 목록 (퍼즈 입력의 재료, 중복 제거, 등장 순서)
+
+    Args:
+        pattern (str): 정규식 문자열
+
+    Returns:
+        List[str]: 리터럴 문자열 리스트
+    """
+    parsed = sre_parse.parse(pattern)
+    found = []
+    _collect_literals(parsed, bool(parsed.state.flags & re.IGNORECASE), found)
+    return list(dict.fromkeys(found))
+
+
+def adversarial_inputs(pattern: str, length: int) -> List[Tuple[str, str]]:
+    """
+    패턴의 리터럴을 반복한 역추적 유발 후보 입력 생성
+
+    리터럴이 길이 내내 반복되면 매칭 시작 위치마다 .*나 [^x]* 같은 반복이 줄 끝까지 확장했다가 되돌아가므로,
+    매칭에 실패하는 경우 검사 시간이 길이의 제곱 이상으로 늘어나는 패턴을 찾을 수 있습니다.
+
+    Args:
+        pattern (str): 정규식 문자열
+        length (int): 입력 길이
+
+    Returns:
+        List[Tuple[str, str]]: (입력 종류 설명, 입력 문자열) 리스트
+    """
+    inputs = []
+    for literal in pattern_literals(pattern):
+        for unit in (literal, literal + " ", literal + "a"):
+            inputs.append((repr(unit) + " 반복", (unit * (length // len(unit) + 1))[:length]))
+        inputs.append((repr(literal) + " + 채움 문자", (literal + " " + "a" * length)[:length]))
+    return inputs
+
+
+def _time_search(compiled, text: str, repeat: int) -> float:
+    """정규식 검사 시간 측정 (repeat회 중 최소값)"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        compiled.search(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def fuzz_pattern(pattern: str, lengths: Tuple[int, ...] = DEFAULT_FUZZ_LENGTHS, repeat: int = 3) -> Dict[str, Any]:
+    """
+    패턴 하나에 역추적 유발 입력을 넣어 최악 검사 시간과 길이에 따른 증가율 측정
+
+    가장 긴 길이에서 가장 느린 입력을 고른 뒤 같은 종류의 입력을 길이별로 측정합니다.
+    증가율(growth)은 검사 시간이 입력 길이의 몇 제곱에 비례하는지를 나타내며, 1 근처면 선형, 2 이상이면 제곱 이상입니다.
+
+    Args:
+        pattern (str): 정규식 문자열
+        lengths (Tuple[int, ...]): 측정할 입력 길이 (오름차순)
+        repeat (int): 길이별 반복 측정 횟수
+
+    Returns:
+        Dict[str, Any]: 최악 입력 종류(input), 길이별 시간(seconds), 증가율(growth, 측정 불가면 None)
+    """
+    compiled = re.compile(pattern)
+    candidates = adversarial_inputs(pattern, lengths[-1])
+    if not candidates:
+        candidates = [("채움 문자", "a" * lengths[-1])]
+    worst = max(candidates, key=lambda item: _time_search(compiled, item[1], 1))[0]
+
+    seconds = []
+    for length in lengths:
+        text = dict(adversarial_inputs(pattern, length)).get(worst, "a" * length)
+        seconds.append(_time_search(compiled, text, repeat))
+
+    growth = None
+    if len(lengths) >= 2 and seconds[-2] >= _MIN_MEASURABLE_SECONDS:
+        growth = math.log(seconds[-1] / seconds[-2]) / math.log(lengths[-1] / lengths[-2])
+    return {"pattern": pattern, "input": worst, "lengths": list(lengths), "seconds": seconds, "growth": growth}
+
+
+def fuzz_patterns(patterns: List[str], lengths: Tuple[int, ...] = DEFAULT_FUZZ_LENGTHS,
+                  repeat: int = 3) -> List[Dict[str, Any]]:
+    """패턴 목록 전체의 퍼즈 측정 결과 (패턴 순서)"""
+    return [fuzz_pattern(pattern, lengths, repeat) for pattern in patterns]
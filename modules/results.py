@@ -0,0 +1,274 @@
+import hashlib
+import os
+import re
+import sqlite3
+import time
+import uuid
+from array import array
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# 한 번에 기록할 탐지 로그 수
+_INSERT_BATCH = 5000
+
+# 접근 로그를 (출발지 IP, ident/사용자, 타임스탬프, 나머지) 로 분리 (정확히 원래 라인으로 복원 가능한 경우만 매칭)
+# 나머지(요청, 상태 코드, 크기, Referer, User-Agent)는 스캐너가 반복하는 요청에서 동일하므로 한 번만 저장
+_LINE_PARTS_PATTERN = re.compile(r'(\S+) (\S+ \S+) \[([^\]]*)\] (.*)\Z', re.S)
+
+# 나머지 부분에서 상태 코드만 추출
+_STATUS_PATTERN = re.compile(r'"(?:[^"\\]|\\.)*" (\d{3}) ')
+
+# 기록 중 기억할 페이로드 -> ID 최대 개수 (넘으면 오래 쓰지 않은 항목부터 잊고 필요하면 해시 인덱스로 다시 조회)
+_PAYLOAD_CACHE_SIZE = 65536
+
+# 저장된 부분으로 원래 로그 라인을 복원하는 SQL 식 (detections d, payloads p 조인 기준)
+_LINE_SQL = "CASE WHEN d.ts IS NULL THEN p.text ELSE d.ip || ' ' || d.head || ' [' || d.ts || '] ' || p.text END"
+
+
+def _payload_digest(text: str) -> int:
+    """페이로드 조회용 64비트 해시 (SQLite INTEGER 범위의 부호 있는 정수)"""
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(),
+                          "big", signed=True)
+
+
+class DetectionStore:
+    """
+    분석 한 건의 탐지 로그를 보관하는 SQLite 파일 저장소
+
+    탐지 로그를 세션 메모리 대신 디스크에 두고, 세션에는 파일 경로(path)만 보관한 뒤
+    화면 표시와 GPT 샘플링 시 필요한 만큼만 읽습니다. IP와 상태 코드는 기록할 때 한 번만 추출합니다.
+    접근 로그는 IP/타임스탬프를 제외한 나머지(페이로드)를 해시로 중복 제거하여 한 번만 저장하고,
+    탐지 건마다 (IP, 타임스탬프, 페이로드 ID)만 기록합니다.
+    """
+
+    def __init__(self, path: str):
+        """
+        초기화 함수 (파일이 없으면 새로 생성)
+
+        Args:
+            path (str): SQLite 데이터베이스 파일 경로
+        """
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS attack_types ("
+            " id INTEGER PRIMARY KEY,"
+            " name TEXT NOT NULL UNIQUE)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS payloads ("
+            " id INTEGER PRIMARY KEY,"
+            " digest INTEGER NOT NULL,"
+            " text TEXT NOT NULL)"
+        )
+        # 페이로드 본문 대신 64비트 해시만 인덱싱 (본문은 조회 후 비교하여 해시 충돌 처리)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_payloads_digest ON payloads (digest)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS detections ("
+            " id INTEGER PRIMARY KEY,"
+            " type_id INTEGER NOT NULL,"
+            " ip TEXT NOT NULL,"
+            " status TEXT NOT NULL,"
+            " head TEXT,"                     # ident/사용자 필드 (접근 로그 형식이 아니면 NULL)
+            " ts TEXT,"                       # 원본 타임스탬프 문자열 (접근 로그 형식이 아니면 NULL)
+            " payload_id INTEGER NOT NULL)"   # 나머지 부분 (접근 로그 형식이 아니면 라인 전체)
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_detections_type ON detections (type_id, id)")
+        self._conn.commit()
+        self._type_ids = {name: type_id for type_id, name in self._conn.execute("SELECT id, name FROM attack_types")}
+        self._payload_ids: "OrderedDict[str, int]" = OrderedDict()
+
+    @classmethod
+    def create(cls, directory: str, max_age_seconds: Optional[float] = 24 * 3600) -> "DetectionStore":
+        """
+        디렉토리에 새 저장소 파일 생성 (오래된 저장소 파일은 함께 정리)
+
+        Args:
+            directory (str): 저장소 파일을 둘 디렉토리
+            max_age_seconds (Optional[float]): 이보다 오래 수정되지 않은 저장소 파일 삭제 (None이면 정리 안 함)
+        """
+        os.makedirs(directory, exist_ok=True)
+        if max_age_seconds is not None:
+            cls.cleanup(directory, max_age_seconds)
+        return cls(os.path.join(directory, f"detections-{uuid.uuid4().hex}.db"))
+
+    @staticmethod
+    def cleanup(directory: str, max_age_seconds: float) -> int:
+        """종료된 세션이 남긴 오래된 저장소 파일 삭제 후 삭제한 파일 수 반환"""
+        removed = 0
+        cutoff = time.time() - max_age_seconds
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            if name.startswith("detections-") and name.endswith(".db"):
+                try:
+                    if os.path.getmtime(path) < cutoff:
+                        os.remove(path)
+                        removed += 1
+                except OSError:
+                    pass  # 다른 프로세스가 먼저 삭제한 경우
+        return removed
+
+    def _type_id(self, name: str) -> int:
+        """공격 유형 ID 조회 (처음 보는 유형이면 등록)"""
+        type_id = self._type_ids.get(name)
+        if type_id is None:
+            type_id = self._conn.execute("INSERT INTO attack_types (name) VALUES (?)", (name,)).lastrowid
+            self._type_ids[name] = type_id
+        return type_id
+
+    def _payload_id(self, text: str) -> int:
+        """페이로드 ID 조회 (같은 본문이 이미 저장되어 있으면 재사용, 없으면 등록)"""
+        cache = self._payload_ids
+        payload_id = cache.get(text)
+        if payload_id is not None:
+            cache.move_to_end(text)
+            return payload_id
+
+        digest = _payload_digest(text)
+        for row_id, stored in self._conn.execute("SELECT id, text FROM payloads WHERE digest = ?", (digest,)):
+            if stored == text:
+                payload_id = row_id
+                break
+        if payload_id is None:
+            payload_id = self._conn.execute("INSERT INTO payloads (digest, text) VALUES (?, ?)", (digest, text)).lastrowid
+
+        cache[text] = payload_id
+        if len(cache) > _PAYLOAD_CACHE_SIZE:
+            cache.popitem(last=False)
+        return payload_id
+
+    def write(self, detections: Iterable[Tuple[str, str]]) -> int:
+        """
+        (공격 유형, 로그) 스트림을 일정 개수씩 묶어 기록
+
+        Returns:
+            int: 기록한 로그 수
+        """
+        written = 0
+        batch = []
+        insert = "INSERT INTO detections (type_id, ip, status, head, ts, payload_id) VALUES (?, ?, ?, ?, ?, ?)"
+        for attack_type, line in detections:
+            parts = _LINE_PARTS_PATTERN.match(line)
+            if parts is not None:
+                ip, head, ts, payload = parts.groups()
+                status = _STATUS_PATTERN.match(payload)
+                batch.append((self._type_id(attack_type), ip, status.group(1) if status else "", head, ts,
+                              self._payload_id(payload)))
+            else:
+                batch.append((self._type_id(attack_type), "", "", None, None, self._payload_id(line)))
+            if len(batch) >= _INSERT_BATCH:
+                self._conn.executemany(insert, batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            self._conn.executemany(insert, batch)
+            written += len(batch)
+        self._conn.commit()
+        return written
+
+    def write_grouped(self, attack_logs_by_type: Dict[str, List[str]]) -> int:
+        """공격 유형별 로그 딕셔너리 기록 (병렬 탐지 결과 등)"""
+        return self.write((attack_type, line) for attack_type, logs in attack_logs_by_type.items() for line in logs)
+
+    def counts(self) -> Dict[str, int]:
+        """공격 유형별 로그 수 (처음 탐지된 유형 순서)"""
+        rows = self._conn.execute(
+            "SELECT t.name, COUNT(d.id) FROM attack_types t JOIN detections d ON d.type_id = t.id"
+            " GROUP BY t.id ORDER BY t.id"
+        )
+        return dict(rows)
+
+    def iter_lines(self, attack_type: str) -> Iterator[str]:
+        """공격 유형 하나의 로그를 탐지 순서대로 순회"""
+        type_id = self._type_ids.get(attack_type)
+        if type_id is None:
+            return
+        for (line,) in self._conn.execute(
+                f"SELECT {_LINE_SQL} FROM detections d JOIN payloads p ON p.id = d.payload_id"
+                " WHERE d.type_id = ? ORDER BY d.id", (type_id,)):
+            yield line
+
+    def sample(self, attack_type: str, limit: int = 5) -> List[str]:
+        """공격 유형 하나의 처음 limit개 로그"""
+        type_id = self._type_ids.get(attack_type)
+        if type_id is None:
+            return []
+        rows = self._conn.execute(f"SELECT {_LINE_SQL} FROM detections d JOIN payloads p ON p.id = d.payload_id"
+                                  " WHERE d.type_id = ? ORDER BY d.id LIMIT ?", (type_id, limit))
+        return [line for (line,) in rows]
+
+    def filter(self, attack_type: Optional[str] = None, ip: str = "", status: str = "", query: str = "") -> array:
+        """
+        조건에 맞는 로그의 ID만 추출 (로그 문자열은 읽지 않음)
+
+        Args:
+            attack_type (Optional[str]): 공격 유형 (None이면 전체)
+            ip (str): 출발지 IP 접두사 (예: "10.0.", 빈 문자열이면 조건 없음)
+            status (str): 상태 코드 접두사 (예: "404", "4"는 4xx 전체)
+            query (str): 로그에 포함된 문자열 (ASCII 대소문자 구분 없음)
+
+        Returns:
+            array: 탐지 순서대로 정렬된 로그 ID 배열
+        """
+        conditions, params = [], []
+        if attack_type is not None:
+            conditions.append("d.type_id = ?")
+            params.append(self._type_ids.get(attack_type, -1))
+        if ip:
+            conditions.append("substr(d.ip, 1, ?) = ?")
+            params.extend([len(ip), ip])
+        if status:
+            conditions.append("substr(d.status, 1, ?) = ?")
+            params.extend([len(status), status])
+        join = ""
+        if query and " " in query:
+            # 공백이 있으면 IP/타임스탬프와 페이로드 경계에 걸쳐 매칭될 수 있으므로 복원한 라인 전체 검사
+            join = " JOIN payloads p ON p.id = d.payload_id"
+            conditions.append(f"instr(lower({_LINE_SQL}), ?) > 0")
+            params.append(query.lower())
+        elif query:
+            # 중복 제거된 페이로드를 한 번씩만 검사하고, IP/타임스탬프 부분은 탐지 건마다 검사
+            conditions.append("(d.payload_id IN (SELECT id FROM payloads WHERE instr(lower(text), ?) > 0)"
+                              " OR instr(lower(d.ip || ' ' || d.head || ' [' || d.ts || ']'), ?) > 0)")
+            params.extend([query.lower(), query.lower()])
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        ids = array("q")
+        ids.extend(row[0] for row in self._conn.execute(f"SELECT d.id FROM detections d{join}{where} ORDER BY d.id",
+                                                        params))
+        return ids
+
+    def rows(self, ids: Iterable[int]) -> List[Tuple[str, str]]:
+        """로그 ID 목록에 해당하는 (공격 유형, 로그)를 ID 순서대로 조회 (한 페이지 분량 조회용)"""
+        ids = list(ids)
+        if not ids:
+            return []
+        names = {type_id: name for name, type_id in self._type_ids.items()}
+        placeholders = ",".join("?" * len(ids))
+        found = {row_id: (names[type_id], line) for row_id, type_id, line in self._conn.execute(
+            f"SELECT d.id, d.type_id, {_LINE_SQL} FROM detections d JOIN payloads p ON p.id = d.payload_id"
+            f" WHERE d.id IN ({placeholders})", ids)}
+        return [found[row_id] for row_id in ids if row_id in found]
+
+    def close(self) -> None:
+        """데이터베이스 연결 종료"""
+        self._conn.close()
+
+    def delete(self) -> None:
+        """연결을 닫고 저장소 파일 삭제"""
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+def page_ids(ids: array, page: int, page_size: int) -> array:
+    """
+    필터링된 로그 ID 배열에서 한 페이지 분량만 선택
+
+    Args:
+        page (int): 1부터 시작하는 페이지 번호
+        page_size (int): 페이지당 로그 수
+    """
+    start = (page - 1) * page_size
+    return ids[start:start + page_size]
@@ -0,0 +1,303 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from modules.matcher import PatternMatcher, mask_indices
+
+try:
+    import yaml  # 선택 의존성: 설치되어 있으면 YAML 규칙 팩 사용 가능
+except ImportError:
+    yaml = None
+
+# 기본 규칙 팩 (저장소의 rules/default.json)
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "rules", "default.json")
+
+# 규칙 위험도 (GPT 분석 결과의 risk_level과 같은 값)
+SEVERITIES = ("높음", "중간", "낮음")
+
+# 규칙이 검사할 수 있는 필드 (LogRecord.fields / AuditRecord.fields의 필드명)
+TARGET_FIELDS = ("request", "user_agent", "referer")
+
+
+class Rule:
+    """탐지 규칙 하나 (규칙 팩의 항목)"""
+
+    __slots__ = ("id", "type", "severity", "pattern", "targets", "literals")
+
+    def __init__(self, id: str, type: str, pattern: str, severity: str = "중간",
+                 targets: Tuple[str, ...] = ("request",), literals: Optional[Tuple[str, ...]] = None):
+        """
+        초기화 함수
+
+        Args:
+            id (str): 규칙 ID (팩 안에서 고유, 적중 통계의 키)
+            type (str): 공격 유형 라벨 (여러 규칙이 같은 라벨을 쓸 수 있음)
+            pattern (str): 정규식
+            severity (str): 위험도 ("높음", "중간", "낮음")
+            targets (Tuple[str, ...]): 접근 로그에서 정규식을 적용할 필드
+            literals (Optional[Tuple[str, ...]]): 매칭 시 반드시 하나 이상 포함되는 문자열 (None이면 정규식에서 자동 추출)
+        """
+        self.id = id
+        self.type = type
+        self.pattern = pattern
+        self.severity = severity
+        self.targets = tuple(targets)
+        self.literals = tuple(literals) if literals else None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Rule":
+        """
+        규칙 팩 항목으로 규칙 생성 (필수 항목 누락, 잘못된 값, 컴파일되지 않는 정규식은 ValueError)
+
+        Args:
+            data (Dict[str, Any]): id, type, pattern, severity, targets, literals 키를 가진 딕셔너리
+        """
+        rule_id = data.get("id")
+        if not isinstance(rule_id, str) or not rule_id:
+            raise ValueError(f"규칙 id가 없습니다: {data!r}")
+        for key in ("type", "pattern"):
+            if not isinstance(data.get(key), str) or not data[key]:
+                raise ValueError(f"규칙 {rule_id}: {key} 항목이 없습니다.")
+
+        severity = data.get("severity", "중간")
+        if severity not in SEVERITIES:
+            raise ValueError(f"규칙 {rule_id}: severity는 {', '.join(SEVERITIES)} 중 하나여야 합니다: {severity!r}")
+
+        targets = data.get("targets", ["request"])
+        if isinstance(targets, str):
+            targets = [targets]
+        unknown = [field for field in targets if field not in TARGET_FIELDS]
+        if not targets or unknown:
+            raise ValueError(f"규칙 {rule_id}: targets는 {', '.join(TARGET_FIELDS)} 중에서 지정해야 합니다: {targets!r}")
+
+        literals = data.get("literals")
+        if literals is not None and (not isinstance(literals, list)
+                                     or not all(isinstance(text, str) and text for text in literals)):
+            raise ValueError(f"규칙 {rule_id}: literals는 비어 있지 않은 문자열 목록이어야 합니다.")
+
+        try:
+            re.compile(data["pattern"])
+        except re.error as e:
+            raise ValueError(f"규칙 {rule_id}: 정규식 오류: {e}") from e
+
+        return cls(rule_id, data["type"], data["pattern"], severity, tuple(targets), literals)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """규칙 팩 항목 형식으로 변환"""
+        data = {"id": self.id, "type": self.type, "severity": self.severity, "pattern": self.pattern,
+                "targets": list(self.targets)}
+        if self.literals:
+            data["literals"] = list(self.literals)
+        return data
+
+
+class RulePack:
+    """
+    우선순위 순서의 탐지 규칙 묶음
+
+    규칙 순서가 곧 패턴 인덱스이며, 패턴/라벨/대상 필드 목록을 한곳에서 만들어 순서가 어긋나지 않도록 합니다.
+    매칭 엔진은 팩마다 한 번만 컴파일하고, 규칙별 실행/적중 횟수는 팩의 매칭 엔진에 누적됩니다.
+    """
+
+    def __init__(self, rules: List[Rule], name: str = "rules", source: Optional[str] = None):
+        """
+        초기화 함수
+
+        Args:
+            rules (List[Rule]): 우선순위 순서의 규칙 목록
+            name (str): 규칙 팩 이름
+            source (Optional[str]): 규칙 팩 파일 경로
+        """
+        if not rules:
+            raise ValueError("규칙 팩에 규칙이 없습니다.")
+        ids = [rule.id for rule in rules]
+        duplicated = sorted({rule_id for rule_id in ids if ids.count(rule_id) > 1})
+        if duplicated:
+            raise ValueError(f"규칙 id가 중복되었습니다: {', '.join(duplicated)}")
+
+        self.rules = list(rules)
+        self.name = name
+        self.source = source
+        self.patterns = [rule.pattern for rule in self.rules]
+        self.types = [rule.type for rule in self.rules]
+        self.targets = [rule.targets for rule in self.rules]
+        self.literals = [rule.literals for rule in self.rules]
+        canonical = json.dumps([rule.to_dict() for rule in self.rules], ensure_ascii=False, sort_keys=True)
+        self.version = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:12]
+
+        self._matchers: Dict[Optional[int], PatternMatcher] = {}
+        self._lock = threading.Lock()
+        self._inherited: Dict[str, Tuple[int, int]] = {}  # 이전 팩에서 이어받은 규칙별 (실행 수, 적중 수)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], source: Optional[str] = None) -> "RulePack":
+        """{"name": ..., "rules": [...]} 형식의 딕셔너리로 규칙 팩 생성"""
+        if not isinstance(data, dict) or not isinstance(data.get("rules"), list):
+            raise ValueError("규칙 팩은 rules 목록을 가진 객체여야 합니다.")
+        return cls([Rule.from_dict(item) for item in data["rules"]], data.get("name", "rules"), source)
+
+    def matcher(self, max_length: Optional[int] = None) -> PatternMatcher:
+        """
+        규칙 팩의 매칭 엔진 (길이 제한별로 한 번만 컴파일하여 스레드 간 공유)
+
+        Args:
+            max_length (Optional[int]): 정규식에 전달할 라인/필드 최대 길이 (None이면 제한 없음)
+        """
+        matcher = self._matchers.get(max_length)
+        if matcher is None:
+            with self._lock:
+                matcher = self._matchers.get(max_length)
+                if matcher is None:
+                    matcher = PatternMatcher(self.patterns, self.targets, max_length, self.literals)
+                    self._matchers[max_length] = matcher
+        return matcher
+
+    def attack_type(self, index: int) -> str:
+        """패턴 인덱스에 해당하는 공격 유형 라벨"""
+        return self.types[index] if 0 <= index < len(self.types) else f"Unknown_{index}"
+
+    def mask_types(self, mask: int) -> List[str]:
+        """다중 라벨 탐지 비트마스크에 해당하는 공격 유형 라벨 (우선순위 순서, 같은 라벨은 한 번만)"""
+        return list(dict.fromkeys(self.attack_type(index) for index in mask_indices(mask)))
+
+    def severity_of(self, attack_type: str) -> Optional[str]:
+        """공격 유형 라벨의 위험도 (같은 라벨의 규칙이 여럿이면 가장 높은 위험도, 규칙에 없는 라벨이면 None)"""
+        levels = [SEVERITIES.index(rule.severity) for rule in self.rules if rule.type == attack_type]
+        return SEVERITIES[min(levels)] if levels else None
+
+    def inherit_counters(self, previous: "RulePack") -> None:
+        """
+        이전 팩에서 id와 정규식이 같은 규칙의 실행/적중 횟수 이어받기 (핫 리로드 후에도 누적 통계 유지)
+
+        Args:
+            previous (RulePack): 교체되는 이전 규칙 팩
+        """
+        old = {stat["id"]: stat for stat in previous.rule_stats()}
+        old_patterns = {rule.id: rule.pattern for rule in previous.rules}
+        for rule in self.rules:
+            stat = old.get(rule.id)
+            if stat is not None and old_patterns[rule.id] == rule.pattern:
+                self._inherited[rule.id] = (stat["calls"], stat["hits"])
+
+    def rule_stats(self) -> List[Dict[str, Any]]:
+        """
+        규칙별 정규식 실행 수와 적중(탐지) 수 (팩 순서)
+
+        Returns:
+            List[Dict[str, Any]]: id, type, severity, calls, hits 키를 가진 딕셔너리 리스트
+        """
+        matchers = list(self._matchers.values())
+        stats = []
+        for i, rule in enumerate(self.rules):
+            calls, hits = self._inherited.get(rule.id, (0, 0))
+            for matcher in matchers:
+                calls += matcher.pattern_calls[i]
+                hits += matcher.pattern_hits[i]
+            stats.append({"id": rule.id, "type": rule.type, "severity": rule.severity, "calls": calls, "hits": hits})
+        return stats
+
+    def rule_report(self) -> str:
+        """
+        규칙별 적중 보고서 (실행만 되고 한 번도 탐지하지 못한 규칙 표시)
+
+        Returns:
+            str: 보고서 문자열
+        """
+        lines = [f"규칙 팩 {self.name} (버전 {self.version}, 규칙 {len(self.rules)}개)"]
+        for stat in self.rule_stats():
+            note = " - 탐지 없음" if stat["calls"] and not stat["hits"] else ""
+            lines.append(f"  {stat['id']} [{stat['type']}]: 정규식 실행 {stat['calls']:,}회, "
+                         f"탐지 {stat['hits']:,}건{note}")
+        return "\n".join(lines)
+
+
+def load_rule_pack(path: str = DEFAULT_RULES_PATH) -> RulePack:
+    """
+    JSON 또는 YAML(.yaml/.yml, PyYAML 필요) 규칙 팩 파일 불러오기
+
+    Args:
+        path (str): 규칙 팩 파일 경로
+
+    Returns:
+        RulePack: 검증과 정규식 컴파일 확인을 마친 규칙 팩 (형식 오류는 ValueError)
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        text = file.read()
+    if path.endswith((".yaml", ".yml")):
+        if yaml is None:
+            raise ValueError("YAML 규칙 팩을 읽으려면 PyYAML이 필요합니다 (pip install pyyaml).")
+        try:
+            data = yaml.safe_load(text)
+        except yaml.YAMLError as e:
+            raise ValueError(f"YAML 형식 오류: {e}") from e
+    else:
+        data = json.loads(text)
+    return RulePack.from_dict(data, source=path)
+
+
+class RuleRegistry:
+    """
+    규칙 팩 파일을 감시하여 변경되면 다시 불러오는 레지스트리
+
+    current()가 반환한 팩은 바뀌지 않으므로, 분석 하나가 시작할 때 받은 팩을 끝까지 사용하면
+    도중에 파일이 바뀌어도 진행 중인 분석은 이전 규칙으로 마무리되고 다음 분석부터 새 규칙이 적용됩니다.
+    새 파일에 오류가 있으면 기존 팩을 유지하고 오류 내용을 last_error에 기록합니다.
+    """
+
+    def __init__(self, path: str = DEFAULT_RULES_PATH, check_interval: float = 2.0):
+        """
+        초기화 함수 (처음 불러올 때의 오류는 그대로 발생)
+
+        Args:
+            path (str): 규칙 팩 파일 경로
+            check_interval (float): 파일 변경 확인 최소 간격(초)
+        """
+        self.path = path
+        self.check_interval = check_interval
+        self.last_error: Optional[str] = None
+        self.reloads = 0
+        self._lock = threading.Lock()
+        self._mtime = os.stat(path).st_mtime_ns
+        self._pack = load_rule_pack(path)
+        self._checked = time.monotonic()
+
+    def current(self) -> RulePack:
+        """현재 규칙 팩 (check_interval마다 파일 수정 시각을 확인하여 바뀌었으면 다시 불러옴)"""
+        if time.monotonic() - self._checked >= self.check_interval:
+            self.reload()
+        return self._pack
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        파일이 바뀌었으면 규칙 팩 다시 불러오기
+
+        Args:
+            force (bool): 수정 시각과 무관하게 다시 불러올지 여부
+
+        Returns:
+            bool: 규칙 팩이 교체되었는지 여부
+        """
+        with self._lock:
+            self._checked = time.monotonic()
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+            except OSError as e:
+                self.last_error = f"규칙 팩 파일을 확인할 수 없습니다: {e}"
+                return False
+            if mtime == self._mtime and not force:
+                return False
+            self._mtime = mtime  # 오류가 난 파일을 매번 다시 읽지 않도록 수정 시각은 먼저 기록
+            try:
+                pack = load_rule_pack(self.path)
+            except (OSError, ValueError) as e:
+                self.last_error = f"규칙 팩을 불러오지 못해 이전 규칙을 계속 사용합니다: {e}"
+                return False
+            pack.inherit_counters(self._pack)
+            self._pack = pack
+            self.last_error = None
+            self.reloads += 1
+            return True
@@ -0,0 +1,112 @@
+import hashlib
+import math
+from collections import Counter
+from typing import Dict, Hashable, List, Optional, Tuple
+
+
+def _hash64(value: str) -> int:
+    """프로세스와 무관하게 같은 값을 돌려주는 64비트 해시 (작업자별 스케치 병합용, 내장 hash()는 프로세스마다 달라짐)"""
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8", "surrogatepass"), digest_size=8).digest(), "big")
+
+
+class MisraGries:
+    """
+    Misra-Gries 빈발 항목 요약: 최대 capacity개의 카운터로 상위 항목과 빈도를 추정
+
+    추정값은 실제 빈도보다 크지 않으며, 실제 빈도와의 차이는 error_bound() 이하입니다.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        """
+        초기화 함수
+
+        Args:
+            capacity (int): 보관할 최대 카운터 수 (오차 상한은 전체 개수 / (capacity + 1))
+        """
+        self.capacity = capacity
+        self.total = 0                        # 관찰한 전체 항목 수
+        self.counters: Dict[Hashable, int] = {}
+
+    def add(self, key: Hashable) -> None:
+        """항목 하나 추가 (카운터가 가득 차면 모든 카운터를 1씩 감소)"""
+        self.total += 1
+        counters = self.counters
+        if key in counters:
+            counters[key] += 1
+        elif len(counters) < self.capacity:
+            counters[key] = 1
+        else:
+            # 새 항목과 기존 카운터 capacity개를 함께 1씩 제거 (감소 1회는 capacity + 1개 항목을 소모하므로 분할 상환 O(1))
+            self.counters = {k: c - 1 for k, c in counters.items() if c > 1}
+
+    def merge(self, other: "MisraGries") -> "MisraGries":
+        """
+        다른 요약을 합친 새 요약 반환 (파일별/작업자별 부분 결과 병합용)
+
+        카운터를 더한 뒤 (capacity + 1)번째로 큰 값을 모든 카운터에서 빼서 capacity개 이하로 유지합니다.
+        """
+        merged = MisraGries(max(self.capacity, other.capacity))
+        merged.total = self.total + other.total
+        counters = Counter(self.counters)
+        counters.update(other.counters)
+        if len(counters) > merged.capacity:
+            cut = sorted(counters.values(), reverse=True)[merged.capacity]
+            counters = {k: c - cut for k, c in counters.items() if c > cut}
+        merged.counters = dict(counters)
+        return merged
+
+    def error_bound(self) -> int:
+        """추정 빈도의 최대 과소 추정량 (관찰 후 제거된 항목 수 / (capacity + 1))"""
+        return (self.total - sum(self.counters.values())) // (self.capacity + 1)
+
+    def most_common(self, n: Optional[int] = None) -> List[Tuple[Hashable, int]]:
+        """추정 빈도 내림차순 상위 n개 (n이 None이면 전체)"""
+        return Counter(self.counters).most_common(n)
+
+
+class HyperLogLog:
+    """HyperLogLog 고유 값 개수 추정 (2^precision 바이트 레지스터, 상대 표준 오차 1.04 / sqrt(2^precision))"""
+
+    def __init__(self, precision: int = 14):
+        """
+        초기화 함수
+
+        Args:
+            precision (int): 레지스터 인덱스 비트 수 (4~16, 기본 14 = 16KB, 표준 오차 약 0.81%)
+        """
+        if not 4 <= precision <= 16:
+            raise ValueError("precision은 4 이상 16 이하여야 합니다.")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value: str) -> None:
+        """값 하나 추가"""
+        h = _hash64(value)
+        p = self.precision
+        index = h >> (64 - p)
+        rest = h & ((1 << (64 - p)) - 1)
+        rank = (64 - p) - rest.bit_length() + 1  # 남은 비트에서 첫 1 비트의 위치
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """다른 추정기를 합친 새 추정기 반환 (레지스터별 최댓값, 두 추정기의 precision이 같아야 함)"""
+        if self.precision != other.precision:
+            raise ValueError("precision이 다른 HyperLogLog는 병합할 수 없습니다.")
+        merged = HyperLogLog(self.precision)
+        merged.registers = bytearray(map(max, self.registers, other.registers))
+        return merged
+
+    def count(self) -> int:
+        """고유 값 개수 추정 (값이 적을 때는 선형 계수법으로 보정)"""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return round(estimate)
+
+    def relative_error(self) -> float:
+        """상대 표준 오차"""
+        return 1.04 / math.sqrt(len(self.registers))
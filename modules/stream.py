@@ -0,0 +1,68 @@
+import json
+from typing import Any, Dict, List, Optional
+
+
+class AnalysisStreamParser:
+    """
+    {"analyses": [...]} 형식의 스트리밍 응답에서 완성된 분석 항목을 도착 순서대로 추출하는 증분 JSON 파서
+
+    새로 받은 조각만 한 번씩 훑으며 문자열/이스케이프와 중첩 깊이를 추적하고,
+    analyses 배열 안의 객체가 닫히는 즉시 그 객체만 파싱합니다.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self._pos = 0                      # 다음에 검사할 위치
+        self._depth = 0                    # 현재 객체/배열 중첩 깊이
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._key: Optional[str] = None    # 최상위 객체에서 마지막으로 읽은 문자열 (키 후보)
+        self._in_analyses = False
+        self._item_start: Optional[int] = None
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """
+        응답 조각 추가
+
+        Args:
+            chunk (str): 스트리밍으로 받은 텍스트 조각
+
+        Returns:
+            List[Dict[str, Any]]: 이번 조각으로 완성된 분석 항목 리스트
+        """
+        self.text += chunk
+        text = self.text
+        items = []
+        for i in range(self._pos, len(text)):
+            ch = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._key = text[self._string_start:i + 1]
+            elif ch == '"':
+                self._in_string = True
+                self._string_start = i
+            elif ch == "{" or ch == "[":
+                self._depth += 1
+                if ch == "[" and self._depth == 2 and self._key == '"analyses"':
+                    self._in_analyses = True
+                elif ch == "{" and self._in_analyses and self._depth == 3:
+                    self._item_start = i
+            elif ch == "}" or ch == "]":
+                if ch == "}" and self._in_analyses and self._depth == 3 and self._item_start is not None:
+                    try:
+                        items.append(json.loads(text[self._item_start:i + 1]))
+                    except ValueError:
+                        pass  # 항목 하나가 깨져도 나머지 항목은 계속 추출 (최종 응답에서 다시 확인)
+                    self._item_start = None
+                elif ch == "]" and self._in_analyses and self._depth == 2:
+                    self._in_analyses = False
+                self._depth -= 1
+        self._pos = len(text)
+        return items
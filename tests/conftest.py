@@ -0,0 +1,15 @@
+import os
+import sys
+
+import pytest
+
+# 저장소 루트에서 modules 패키지를 가져올 수 있도록 경로 추가 (pytest를 어느 디렉토리에서 실행해도 동작)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(scope="session")
+def log_dir():
+    """저장소에 포함된 샘플 로그 디렉토리"""
+    return os.path.join(ROOT, "logfile")
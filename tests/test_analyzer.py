@@ -0,0 +1,198 @@
+import json
+import re
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import modules.analyzer as analyzer_module
+from modules.analyzer import WebAttackAnalyzer
+
+# 프롬프트의 "1. <로그>" 줄
+_PROMPT_LOG = re.compile(r'^\d+\. (.*)$', re.M)
+
+# 재시도 대기를 기록하려고 time.sleep을 바꾸므로 스텁의 응답 지연은 원래 함수 사용
+_sleep = time.sleep
+
+
+class RateLimitError(Exception):
+    """openai.RateLimitError처럼 status_code와 response.headers를 가진 오류"""
+
+    def __init__(self, retry_after=None):
+        super().__init__("429 Too Many Requests")
+        self.status_code = 429
+        headers = {"retry-after": str(retry_after)} if retry_after is not None else {}
+        self.response = SimpleNamespace(headers=headers)
+
+
+class StubClient:
+    """배치의 로그를 그대로 돌려주는 OpenAI 호환 스텁 (동시 요청 수와 호출 수 기록)"""
+
+    def __init__(self, delays=None, failures=None):
+        self.chat = self.completions = self
+        self.delays = delays or {}        # 첫 로그 -> 응답 지연(초)
+        self.failures = failures or {}    # 첫 로그 -> 연속으로 발생시킬 오류 리스트
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.calls = []
+
+    def create(self, **kwargs):
+        logs = _PROMPT_LOG.findall(kwargs["messages"][1]["content"])
+        with self.lock:
+            self.calls.append(logs[0])
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            failures = self.failures.get(logs[0])
+            error = failures.pop(0) if failures else None
+        try:
+            _sleep(self.delays.get(logs[0], 0.02))
+            if error is not None:
+                raise error
+            content = json.dumps({"analyses": [{"attack_type": "test", "log": log} for log in logs]})
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+def make_analyzer(client, **kwargs):
+    kwargs.setdefault("requests_per_minute", None)
+    kwargs.setdefault("tokens_per_minute", None)
+    return WebAttackAnalyzer("test-key", client=client, **kwargs)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """재시도 대기 시간 기록 (실제로 대기하지 않음)"""
+    recorded = []
+    monkeypatch.setattr(analyzer_module.time, "sleep", recorded.append)
+    return recorded
+
+
+def test_results_keep_input_order_with_bounded_concurrency():
+    logs = [f"GET /page{i}?id=1' OR '1'='1" for i in range(12)]
+    # 앞쪽 배치가 늦게 끝나도 결과는 입력 순서
+    client = StubClient(delays={log: 0.2 - i * 0.015 for i, log in enumerate(logs)})
+    analyzer = make_analyzer(client, max_concurrency=3)
+
+    results = analyzer.analyze_attack_logs(logs, max_logs_per_batch=1)
+
+    assert [result["log"] for result in results] == logs
+    assert len(client.calls) == len(logs)
+    assert client.peak == 3
+
+
+def test_batches_share_requests_and_keep_order():
+    logs = [f"GET /search?q=<script>{i}</script>" for i in range(10)]
+    client = StubClient()
+    analyzer = make_analyzer(client, max_concurrency=2)
+
+    results = analyzer.analyze_attack_logs(logs, max_logs_per_batch=3)
+
+    assert [result["log"] for result in results] == logs
+    assert len(client.calls) == 4
+    assert client.peak <= 2
+
+
+def test_rate_limited_batch_is_retried_after_retry_after(sleeps):
+    logs = ["GET /../../etc/passwd", "GET /index.php?cmd=;id"]
+    client = StubClient(failures={logs[1]: [RateLimitError(retry_after=2), RateLimitError(retry_after=3)]})
+    analyzer = make_analyzer(client, max_retries=3)
+
+    results = analyzer.analyze_attack_logs(logs, max_logs_per_batch=1)
+
+    assert [result["log"] for result in results] == logs
+    assert client.calls.count(logs[1]) == 3
+    assert sleeps == [2.0, 3.0]
+
+
+def test_rate_limit_backoff_grows_exponentially_and_gives_up(sleeps):
+    log = "GET /../../etc/passwd"
+    client = StubClient(failures={log: [RateLimitError() for _ in range(5)]})
+    analyzer = make_analyzer(client, max_retries=3, retry_base_delay=1.0)
+
+    results = analyzer.analyze_attack_logs([log])
+
+    assert len(client.calls) == 4
+    assert len(sleeps) == 3
+    for attempt, delay in enumerate(sleeps):
+        # 지수 백오프 + 최대 50% 지터
+        assert 2 ** attempt <= delay <= 2 ** attempt * 1.5
+    assert results == [{"error": "429 Too Many Requests", "logs": [log]}]
+
+
+def test_non_retryable_error_is_not_retried(sleeps):
+    log = "GET /../../etc/passwd"
+    error = RateLimitError()
+    error.status_code = 400
+    client = StubClient(failures={log: [error]})
+
+    results = make_analyzer(client).analyze_attack_logs([log])
+
+    assert client.calls == [log]
+    assert sleeps == []
+    assert "error" in results[0]
+
+
+class StreamingStubClient:
+    """배치 첫 로그별로 정해 둔 시도 순서대로 항목을 스트리밍하는 OpenAI 호환 스텁 (오류가 있으면 항목 뒤에 발생)"""
+
+    def __init__(self, attempts):
+        self.chat = self.completions = self
+        self.attempts = attempts  # 첫 로그 -> [(항목 리스트, 오류 또는 None), ...]
+
+    def create(self, **kwargs):
+        assert kwargs["stream"]
+        logs = _PROMPT_LOG.findall(kwargs["messages"][1]["content"])
+        items, error = self.attempts[logs[0]].pop(0)
+
+        def chunks():
+            text = json.dumps({"analyses": items})
+            if error is not None:
+                text = text[:-2]  # 닫히지 않은 응답 도중에 연결이 끊긴 경우
+            for i in range(0, len(text), 7):
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text[i:i + 7]))])
+            if error is not None:
+                raise error
+
+        return chunks()
+
+
+def test_streamed_items_of_failed_attempt_are_replaced_on_retry(sleeps):
+    logs = ["GET /../../etc/passwd", "GET /search?q=<script>alert(1)</script>"]
+    failed = [{"attack_type": "failed", "log": logs[1]}]
+    retried = [{"attack_type": "retried", "log": logs[1]}, {"attack_type": "extra", "log": logs[1]}]
+    first = [{"attack_type": "first", "log": logs[0]}]
+    client = StreamingStubClient({
+        logs[0]: [(first, None)],
+        logs[1]: [(failed, RateLimitError(retry_after=0)), (retried, None)],
+    })
+    calls = []
+
+    results = make_analyzer(client, max_retries=2).analyze_attack_logs(
+        logs, max_logs_per_batch=1, on_result=lambda position, items: calls.append((position, items)))
+
+    # 두 번째 배치: 실패한 시도의 항목 -> 재시도 시작 시 비움 -> 새 시도의 항목만 처음부터 다시 전달
+    assert [items for position, items in calls if position == 1] == [failed, [], retried[:1], retried]
+    assert [items for position, items in calls if position == 0] == [first]
+    # 묶음별로 마지막 항목 리스트를 남기면 최종 결과와 같음
+    view = {}
+    for position, items in calls:
+        view[position] = items
+    assert [item for position in sorted(view) for item in view[position]] == results == first + retried
+    assert sleeps == [0.0]
+
+
+def test_streaming_replaces_items_with_error_when_retries_run_out(sleeps):
+    log = "GET /../../etc/passwd"
+    partial = [{"attack_type": "partial", "log": log}]
+    client = StreamingStubClient({log: [(partial, RateLimitError()), (partial, RateLimitError())]})
+    calls = []
+
+    results = make_analyzer(client, max_retries=1).analyze_attack_logs(
+        [log], on_result=lambda position, items: calls.append((position, items)))
+
+    assert results == [{"error": "429 Too Many Requests", "logs": [log]}]
+    assert calls == [(0, partial), (0, []), (0, partial), (0, results)]
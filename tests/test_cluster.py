@@ -0,0 +1,55 @@
+import os
+
+from modules.cluster import cluster_logs, normalize_payload
+
+LINE = '1.2.3.4 - - [28/Aug/2005:05:07:45 -0400] "GET {} HTTP/1.1" 404 300'
+
+SQLI = ["/index.php?id=1' OR 'a'='a", "/index.php?id=7' OR 'x'='x", "/index.php?id=1' OR 'a'='a"]
+XSS = ["/search?q=<script>alert(document.cookie)</script>", "/search?q=<script>alert(document.domain)</script>"]
+UNION = ["/index.php?id=1 UNION SELECT password FROM users"]
+TRAVERSAL = ["/../../etc/passwd"]
+
+
+def make_logs(paths):
+    return [LINE.format(path) for path in paths]
+
+
+def test_near_duplicate_variants_merge_and_distinct_attacks_stay_apart():
+    logs = make_logs(SQLI + XSS + UNION + TRAVERSAL)
+
+    clusters = cluster_logs(logs)
+
+    assert [(normalize_payload(c.representative), c.size, c.variants) for c in clusters] == [
+        (normalize_payload(logs[0]), 3, 2),  # 인용 값만 다른 SQL 인젝션
+        (normalize_payload(logs[3]), 2, 2),  # 함수 인자만 다른 XSS
+        (normalize_payload(logs[5]), 1, 1),  # 같은 경로의 다른 SQL 인젝션은 별도 클러스터
+        (normalize_payload(logs[6]), 1, 1),
+    ]
+    assert clusters[0].representative == logs[0]
+
+
+def test_exact_grouping_keeps_variants_apart():
+    logs = make_logs(SQLI + XSS)
+
+    clusters = cluster_logs(logs, similarity=None)
+
+    assert [cluster.size for cluster in clusters] == [2, 1, 1, 1]
+    assert all(cluster.variants == 1 for cluster in clusters)
+
+
+def test_merged_sizes_cover_every_line_and_max_clusters_keeps_largest(log_dir):
+    logs = []
+    for name in sorted(os.listdir(log_dir)):
+        with open(os.path.join(log_dir, name), encoding='utf-8', errors='ignore') as file:
+            logs.extend(line for line in file.read().split('\n')[:3000] if line.strip())
+
+    exact = cluster_logs(logs, similarity=None)
+    merged = cluster_logs(logs)
+
+    assert sum(cluster.size for cluster in merged) == len(logs)
+    assert sum(cluster.variants for cluster in merged) == len(exact)
+    assert len(merged) < len(exact)
+    sizes = [cluster.size for cluster in merged]
+    assert sizes == sorted(sizes, reverse=True)
+    assert [cluster.template for cluster in cluster_logs(logs, max_clusters=5)] == [
+        cluster.template for cluster in merged[:5]]
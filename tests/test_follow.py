@@ -0,0 +1,173 @@
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from modules.follow import LogFollower
+from modules.rules import load_rule_pack
+
+ROOT = Path(__file__).resolve().parent.parent
+SEPARATOR = "=" * 40
+
+
+def audit_record(ip: str, request: str) -> str:
+    return (f"{SEPARATOR}\n"
+            f'Request: {ip} - - [28/Aug/2005:05:07:45 --0400] "{request}" 404 300\n'
+            "Handler: (null)\n"
+            f"{'-' * 40}\n"
+            f"{request}\n"
+            "User-Agent: Mozilla/4.0 (compatible; MSIE 5.5; Windows 98)\n"
+            "Host: 63.126.79.110\n"
+            "\n"
+            "HTTP/1.1 404 Not Found\n"
+            "Content-Length: 300\n")
+
+
+@pytest.fixture(scope="module")
+def pack():
+    return load_rule_pack()
+
+
+def follow_once(pack, path, checkpoint):
+    follower = LogFollower([str(path)], pack.matcher(), pack.types,
+                           checkpoint_path=str(checkpoint), from_start=True)
+    try:
+        return follower.poll()
+    finally:
+        follower.close()
+
+
+def detected_lines(detected):
+    return sorted(line for lines in detected.values() for line in lines)
+
+
+def test_audit_record_split_across_restart_is_detected(tmp_path, pack):
+    path = tmp_path / "audit_log"
+    checkpoint = tmp_path / "checkpoint.json"
+    first = audit_record("10.0.0.1", "GET /index.html HTTP/1.1")
+    attack = audit_record("10.0.0.2", "GET /../../etc/passwd HTTP/1.1")
+    head, tail = attack[:attack.index("User-Agent")], attack[attack.index("User-Agent"):]
+
+    path.write_text(first + head)
+    assert follow_once(pack, path, checkpoint) == {}
+
+    # 재시작 전에 저장된 오프셋은 조립 중이던 레코드의 구분선 위치
+    path.write_text(first + head + tail + SEPARATOR + "\n")
+    detected = follow_once(pack, path, checkpoint)
+    assert detected_lines(detected) == [
+        '10.0.0.2 - - [28/Aug/2005:05:07:45 --0400] "GET /../../etc/passwd HTTP/1.1" 404 300']
+
+    # 완료된 레코드는 다시 탐지하지 않음
+    assert follow_once(pack, path, checkpoint) == {}
+
+
+def test_audit_checkpoint_matches_uninterrupted_follow(tmp_path, pack):
+    records = [audit_record(f"10.0.0.{i}", request) for i, request in enumerate([
+        "GET /../../etc/passwd HTTP/1.1",
+        "GET /search?q=<script>alert(1)</script> HTTP/1.1",
+        "GET /index.html HTTP/1.1",
+        "GET /page?id=1' OR '1'='1 HTTP/1.1",
+    ])]
+    data = "".join(records) + SEPARATOR + "\n"
+
+    full_path = tmp_path / "full" / "audit_log"
+    full_path.parent.mkdir()
+    full_path.write_text(data)
+    expected = detected_lines(follow_once(pack, full_path, tmp_path / "full.json"))
+    assert expected
+
+    path = tmp_path / "audit_log"
+    checkpoint = tmp_path / "checkpoint.json"
+    collected = []
+    for cut in range(0, len(data) + 1, 97):
+        path.write_text(data[:cut])
+        collected += detected_lines(follow_once(pack, path, checkpoint))
+    path.write_text(data)
+    collected += detected_lines(follow_once(pack, path, checkpoint))
+    assert sorted(collected) == expected
+
+
+def test_run_calls_on_poll_every_poll_and_stops_on_request(tmp_path, pack):
+    path = tmp_path / "access_log"
+    path.write_text('10.0.0.1 - - [28/Aug/2005:05:07:45 -0400] "GET /../../etc/passwd HTTP/1.1" 404 300\n')
+    follower = LogFollower([str(path)], pack.matcher(), pack.types, from_start=True)
+    polls, detections = [], []
+
+    follower.run(detections.append, interval=0, should_stop=lambda: len(polls) >= 3,
+                 on_poll=lambda: polls.append(len(detections)))
+
+    # 탐지가 없는 폴링에서도 on_poll이 호출되고, should_stop만으로 종료
+    assert polls == [1, 1, 1]
+    assert len(detections) == 1
+
+
+def test_cli_follow_exits_cleanly_on_sigterm(tmp_path):
+    path = tmp_path / "access_log"
+    path.write_text('10.0.0.1 - - [28/Aug/2005:05:07:45 -0400] "GET /../../etc/passwd HTTP/1.1" 404 300\n')
+    checkpoint = tmp_path / "checkpoint.json"
+    process = subprocess.Popen(
+        [sys.executable, str(ROOT / "cli.py"), str(path), "--follow", "--from-start",
+         "--interval", "0.05", "--checkpoint", str(checkpoint)],
+        cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    deadline = time.monotonic() + 30
+    while not checkpoint.exists() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    time.sleep(0.3)
+    process.send_signal(signal.SIGTERM)
+    stdout, stderr = process.communicate(timeout=30)
+
+    assert process.returncode == 0, stderr
+    assert "Traceback" not in stderr
+    assert "/etc/passwd" in stdout
+    assert json.loads(checkpoint.read_text())[str(path)]["offset"] == path.stat().st_size
+
+
+def test_cli_follow_keeps_results_of_every_analysis_interval(tmp_path, monkeypatch):
+    import cli
+    import modules.analyzer as analyzer_module
+
+    path = tmp_path / "access_log"
+    line = '10.0.0.{} - - [28/Aug/2005:05:07:45 -0400] "GET {} HTTP/1.1" 404 300\n'
+    path.write_text(line.format(1, "/../../etc/passwd"))
+    output = tmp_path / "results.json"
+    prompts = []
+
+    class StubOpenAI:
+        """분석 요청마다 결과 하나를 돌려주고, 첫 분석 뒤 로그를 추가하고 두 번째 분석 뒤 종료 요청"""
+
+        def __init__(self, **kwargs):
+            self.chat = self.completions = self
+
+        def create(self, **kwargs):
+            prompts.append(kwargs["messages"][1]["content"])
+            if len(prompts) == 1:
+                with open(path, "a") as file:
+                    file.write(line.format(2, "/search?q=<script>alert(document.cookie)</script>"))
+            else:
+                os.kill(os.getpid(), signal.SIGTERM)
+            content = json.dumps({"analyses": [{"attack_type": f"interval {len(prompts)}"}]})
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    monkeypatch.setattr(analyzer_module, "OpenAI", StubOpenAI)
+    # 두 번째 분석이 일어나지 않아도 테스트가 끝나도록 종료 요청 예약
+    watchdog = threading.Timer(30, os.kill, (os.getpid(), signal.SIGTERM))
+    watchdog.start()
+    try:
+        code = cli.main([str(path), "--follow", "--from-start", "--analyze", "--api-key", "test-key",
+                         "--analyze-interval", "0", "--interval", "0.01", "--cache", "",
+                         "--checkpoint", str(tmp_path / "checkpoint.json"), "--output", str(output)])
+    finally:
+        watchdog.cancel()
+
+    assert code == 0
+    assert len(prompts) == 2
+    saved = json.loads(output.read_text(encoding="utf-8"))
+    assert saved["total_attacks_found"] == 2
+    assert [analysis["attack_type"] for analysis in saved["analyses"]] == ["interval 1", "interval 2"]
@@ -0,0 +1,55 @@
+import json
+
+from modules import json as attack_stats
+from modules.parser import parse_access_line
+
+ATTACK_REQUEST = "GET /index.php?id=1 UNION SELECT password FROM users HTTP/1.1"
+
+
+def make_log(ip, request=ATTACK_REQUEST, hour=5, url="/index.php"):
+    return {"time": f"{hour:02d}:10:00", "ip": ip, "url": url, "request": request}
+
+
+def counter_result(logs, tmp_path):
+    path = tmp_path / "counter.json"
+    attack_stats.analyze_attack_logs(logs, str(path))
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def columnar_result(logs, tmp_path):
+    path = tmp_path / "columnar.json"
+    attack_stats.analyze_attack_logs_columnar(logs, str(path))
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def test_non_ipv4_addresses_do_not_collide_with_reserved_range(tmp_path):
+    # IPv4가 아닌 첫 주소의 코드가 240.0.0.0과 같으면 두 주소의 개수가 합쳐짐
+    logs = ([make_log("fe80::1")] * 3 + [make_log("240.0.0.0")] * 2 + [make_log("240.0.0.1")] +
+            [make_log("255.255.255.255")] * 4 + [make_log("1.2.3.04")] + [make_log("1.2.3.4")] * 2)
+    columns = attack_stats.LogColumns.from_dicts(logs)
+
+    assert len(set(columns.ips.tolist())) == 6
+    assert [columns.ip_string(code) for code in columns.ips] == [log["ip"] for log in logs]
+    assert columnar_result(logs, tmp_path) == counter_result(logs, tmp_path)
+
+
+def test_columnar_aggregation_matches_counter(tmp_path):
+    requests = [pattern for patterns in attack_stats.ATTACK_PATTERNS.values() for pattern in patterns]
+    requests += ["GET / HTTP/1.1", "POST /login HTTP/1.1"]
+    logs = [make_log(ip=f"10.0.{i % 7}.{i % 13}" if i % 11 else f"2001:db8::{i % 5:x}",
+                     request=requests[i % len(requests)], hour=i % 24, url=f"/page{i % 17}.php")
+            for i in range(5000)]
+
+    assert columnar_result(logs, tmp_path) == counter_result(logs, tmp_path)
+
+
+def test_records_and_dicts_build_the_same_columns(log_dir):
+    with open(f"{log_dir}/access_log", encoding="utf-8", errors="ignore") as file:
+        records = [record for record in map(parse_access_line, file) if record is not None]
+    from_records = attack_stats.LogColumns.from_records(records)
+    from_dicts = attack_stats.LogColumns.from_dicts([record.to_dict() for record in records])
+
+    assert from_records.hours.tolist() == from_dicts.hours.tolist()
+    assert ([from_records.ip_string(code) for code in from_records.ips] ==
+            [from_dicts.ip_string(code) for code in from_dicts.ips])
+    assert attack_stats.aggregate_columns(from_records) == attack_stats.aggregate_columns(from_dicts)
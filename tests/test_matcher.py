@@ -0,0 +1,152 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from modules.matcher import PatternMatcher, mask_indices
+from modules.parser import parse_access_line
+from modules.rules import load_rule_pack
+
+# 샘플 로그에 없는 경우를 보완하는 라인 (대소문자 변형, 비 ASCII, 여러 유형에 동시에 해당하는 요청)
+EXTRA_LINES = [
+    '1.2.3.4 - - [28/Aug/2005:05:07:45 -0400] "GET /index.php?id=1 UNION SELECT password FROM users HTTP/1.1" 200 10',
+    '1.2.3.4 - - [28/Aug/2005:05:07:45 -0400] "GET /index.php?id=1 union select password from users HTTP/1.1" 200 10',
+    '1.2.3.4 - - [28/Aug/2005:05:07:45 -0400] "GET /search?q=<SCRIPT>alert(1)</SCRIPT> HTTP/1.1" 200 10',
+    '1.2.3.4 - - [28/Aug/2005:05:07:45 -0400] "GET /../../etc/passwd;cat%20/etc/shadow HTTP/1.1" 404 10',
+    '1.2.3.4 - - [28/Aug/2005:05:07:45 -0400] "GET /cgi-bin/test.cgi?x=|id HTTP/1.1" 404 10 "-" "() { :; }; /bin/bash"',
+    '1.2.3.4 - - [28/Aug/2005:05:07:45 -0400] "GET /검색?q=<script>경고</script> HTTP/1.1" 200 10 "-" "sqlmap/1.0"',
+    '1.2.3.4 - - [28/Aug/2005:05:07:45 -0400] "GET / HTTP/1.1" 200 10 "http://evil/?q=../../etc/passwd" "Nikto"',
+    'GET /ſcript İ <ScRiPt> ..%2f..%2f',
+    "",
+]
+
+
+@pytest.fixture(scope="module")
+def pack():
+    return load_rule_pack()
+
+
+@pytest.fixture(scope="module")
+def lines(log_dir):
+    """샘플 로그 전체 라인 (원본, strip, 대문자 변형을 중복 없이)"""
+    collected = list(EXTRA_LINES)
+    for name in sorted(os.listdir(log_dir)):
+        with open(os.path.join(log_dir, name), 'rb') as file:
+            collected.extend(file.read().decode('utf-8', errors='ignore').split('\n'))
+    collected += [line.strip() for line in collected] + [line.upper() for line in collected[:2000]]
+    return list(dict.fromkeys(collected))
+
+
+def brute_force_mask(matcher: PatternMatcher, line: str) -> int:
+    """사전 검사 없이 모든 패턴을 re.search로 검사한 비트마스크"""
+    if matcher.max_length is not None:
+        line = line[:matcher.max_length]
+    return sum(1 << i for i, pattern in enumerate(matcher.compiled) if pattern.search(line))
+
+
+def brute_force_fields_mask(matcher: PatternMatcher, fields) -> int:
+    """사전 검사 없이 패턴별 대상 필드를 모두 re.search로 검사한 비트마스크"""
+    mask = 0
+    for i, pattern in enumerate(matcher.compiled):
+        for field in matcher.targets[i]:
+            text = fields.get(field)
+            if text and pattern.search(text if matcher.max_length is None else text[:matcher.max_length]):
+                mask |= 1 << i
+                break
+    return mask
+
+
+def lowest(mask: int):
+    return (mask & -mask).bit_length() - 1 if mask else None
+
+
+@pytest.fixture(params=[0, None, 64], ids=["no-memo", "memo", "memo-max-length"])
+def matcher(request, pack):
+    if request.param is None:
+        return PatternMatcher(pack.patterns, pack.targets)
+    if request.param == 0:
+        return PatternMatcher(pack.patterns, pack.targets, memo_size=0)
+    return PatternMatcher(pack.patterns, pack.targets, max_length=request.param)
+
+
+def test_first_match_and_mask_equal_brute_force(matcher, lines):
+    for line in lines:
+        expected = brute_force_mask(matcher, line)
+        assert matcher.match_mask(line) == expected, line
+        assert matcher.first_match(line) == lowest(expected), line
+
+
+def test_field_matching_equals_brute_force(matcher, lines):
+    # 캐시 적중 경로도 검사하도록 같은 라인을 두 번 검사
+    for _ in range(2):
+        for line in lines:
+            record = parse_access_line(line)
+            if record is None:
+                continue
+            fields = record.fields()
+            expected = brute_force_fields_mask(matcher, fields)
+            assert matcher.match_mask_fields(fields) == expected, line
+            assert matcher.first_match_fields(fields) == lowest(expected), line
+
+
+def test_memo_reuses_verdicts_without_changing_counts(pack, lines):
+    records = [parse_access_line(line) for line in lines]
+    fields = [record.fields() for record in records if record is not None]
+    cached = PatternMatcher(pack.patterns, pack.targets)
+    uncached = PatternMatcher(pack.patterns, pack.targets, memo_size=0)
+
+    assert [cached.first_match_fields(f) for f in fields] == [uncached.first_match_fields(f) for f in fields]
+    assert cached.stats["memo_hits"] > 0
+    assert cached.stats["lines"] == uncached.stats["lines"]
+    assert cached.pattern_hits == uncached.pattern_hits
+
+
+@pytest.mark.parametrize("multi_label", [False, True])
+def test_memo_hits_account_skipped_and_truncated(pack, lines, multi_label):
+    fields = [record.fields() for record in map(parse_access_line, lines) if record is not None]
+    cached = PatternMatcher(pack.patterns, pack.targets, max_length=32)
+    uncached = PatternMatcher(pack.patterns, pack.targets, max_length=32, memo_size=0)
+    for matcher in (cached, uncached):
+        scan = matcher.match_mask_fields if multi_label else matcher.first_match_fields
+        for f in fields:
+            scan(f)
+
+    # 판정을 재사용한 라인도 순차 검사 호출 수(실행 + 생략)와 잘린 필드 수는 캐시가 없을 때와 같음
+    assert cached.stats["memo_hits"] > 0
+    assert cached.stats["regex_calls"] < uncached.stats["regex_calls"]
+    for key in ("lines", "truncated"):
+        assert cached.stats[key] == uncached.stats[key]
+    assert (cached.stats["regex_calls"] + cached.stats["regex_skipped"] ==
+            uncached.stats["regex_calls"] + uncached.stats["regex_skipped"])
+
+
+@pytest.mark.parametrize("memo_size", [0, 64])
+def test_shared_matcher_counts_are_exact_across_threads(pack, lines, memo_size):
+    lines = [line for line in lines[:1500] if parse_access_line(line) is not None]
+    fields = [parse_access_line(line).fields() for line in lines]
+    shared = PatternMatcher(pack.patterns, pack.targets, memo_size=memo_size)
+    single = PatternMatcher(pack.patterns, pack.targets, memo_size=0)
+
+    def scan(matcher):
+        return [(matcher.first_match_fields(f), matcher.match_mask_fields(f), matcher.first_match(line))
+                for f, line in zip(fields, lines)]
+
+    expected = scan(single)
+    for _ in range(3):
+        scan(single)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(scan, [shared] * 4))
+
+    assert all(result == expected for result in results)
+    assert shared.stats["lines"] == single.stats["lines"]
+    assert shared.pattern_hits == single.pattern_hits
+    assert (shared.stats["regex_calls"] + shared.stats["regex_skipped"] ==
+            single.stats["regex_calls"] + single.stats["regex_skipped"])
+    if not memo_size:
+        assert shared.stats == single.stats
+        assert shared.pattern_calls == single.pattern_calls
+
+
+def test_mask_indices_lists_set_bits():
+    assert mask_indices(0) == []
+    assert mask_indices(0b100101) == [0, 2, 5]
@@ -0,0 +1,69 @@
+import gzip
+import os
+
+import pytest
+
+from modules.analyzer import WebAttackAnalyzer
+from modules.burst import BurstDetector
+from modules.parallel import detect_file_parallel
+
+
+@pytest.fixture(scope="module")
+def analyzer():
+    return WebAttackAnalyzer("test-key")
+
+
+@pytest.fixture(scope="module")
+def access_log(tmp_path_factory, log_dir):
+    """logfile/access_log* 전체를 이어 붙인 접근 로그 (IP 빈도 규칙 위반이 포함됨)"""
+    path = tmp_path_factory.mktemp("logs") / "access_log"
+    with open(path, "wb") as out:
+        for name in sorted(os.listdir(log_dir)):
+            if name.startswith("access_log"):
+                with open(os.path.join(log_dir, name), "rb") as file:
+                    out.write(file.read())
+    return str(path)
+
+
+@pytest.mark.parametrize("multi_label", [False, True])
+def test_parallel_matches_sequential_with_burst(analyzer, access_log, multi_label):
+    with open(access_log, encoding="utf-8", errors="ignore") as file:
+        expected = analyzer.group_attack_logs(file.read(), burst_detector=BurstDetector(), multi_label=multi_label)
+    pack = analyzer.rule_pack
+
+    # 작은 범위로 나누어 IP 빈도 윈도우가 범위 경계를 넘도록 함
+    actual = detect_file_parallel(access_log, pack.patterns, pack.types, workers=2, range_size=20000,
+                                  targets=pack.targets, literals=pack.literals, multi_label=multi_label,
+                                  burst_config={})
+
+    assert actual == expected
+    assert any(attack_type in actual for attack_type in BurstDetector.RULE_TYPES)
+
+
+def test_parallel_without_burst_config_skips_burst_rules(analyzer, access_log):
+    pack = analyzer.rule_pack
+    actual = detect_file_parallel(access_log, pack.patterns, pack.types, workers=2, targets=pack.targets,
+                                  literals=pack.literals)
+    assert not any(attack_type in actual for attack_type in BurstDetector.RULE_TYPES)
+
+
+def test_gzip_upload_uses_sequential_detection(analyzer, access_log, tmp_path):
+    # app.py는 업로드 파일을 확장자와 무관하게 ".log" 임시 파일로 옮긴 뒤 병렬 탐지 경로로 전달
+    spooled = tmp_path / "upload.log"
+    with open(access_log, "rb") as file, gzip.open(spooled, "wb") as out:
+        out.write(file.read())
+
+    with open(access_log, encoding="utf-8", errors="ignore") as file:
+        expected = analyzer.group_attack_logs(file.read(), burst_detector=BurstDetector())
+
+    assert analyzer.group_attack_logs_parallel(str(spooled), workers=2, burst_config={}) == expected
+
+
+def test_parallel_range_detection_rejects_gzip(analyzer, tmp_path):
+    path = tmp_path / "access_log.gz"
+    with gzip.open(path, "wb") as out:
+        out.write(b'1.2.3.4 - - [17/Jul/2005:04:10:23 -0400] "GET /cmd.exe?/c+dir HTTP/1.1" 404 0\n')
+
+    pack = analyzer.rule_pack
+    with pytest.raises(ValueError):
+        detect_file_parallel(str(path), pack.patterns, pack.types, workers=2, targets=pack.targets)
@@ -0,0 +1,33 @@
+import os
+
+import pytest
+
+from modules.parser import match_log_line, match_log_record_mask, parse_access_line
+from modules.rules import load_rule_pack
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    pack = load_rule_pack()
+    return pack.matcher()
+
+
+@pytest.mark.parametrize("name, log_format", [("agent_log.1", "agent"), ("referer_log.1", "referer")])
+def test_agent_and_referer_lines_are_matched_as_whole_lines(log_dir, matcher, name, log_format):
+    with open(os.path.join(log_dir, name), encoding="utf-8", errors="ignore") as file:
+        lines = [line for line in file.read().split("\n") if line.strip()]
+
+    verdicts = [match_log_line(matcher, line, log_format) for line in lines]
+    assert verdicts == [matcher.first_match(line) for line in lines]
+    assert any(verdict is not None for verdict in verdicts)
+    assert all(match_log_record_mask(matcher, line, log_format) == (matcher.match_mask(line), None)
+               for line in lines)
+
+
+def test_repeated_field_values_are_shared_between_records():
+    line = '10.0.0.{} - - [28/Aug/2005:05:07:45 -0400] "GET /index.php HTTP/1.1" 403 3931 "-" "Mozilla/4.0"'
+    first, second = parse_access_line(line.format(1)), parse_access_line(line.format(2))
+
+    for field in ("path", "method", "protocol", "user_agent", "status", "bytes", "tz_offset"):
+        assert getattr(first, field) is getattr(second, field), field
+    assert (first.status, first.bytes, first.tz_offset) == (403, 3931, -14400)